@@ -1,35 +1,53 @@
 # app.py
 from flask import Flask, render_template, jsonify, request, Response, abort, redirect, session, url_for, send_from_directory
 from flask_sqlalchemy import SQLAlchemy
+from flask_sqlalchemy.session import Session as FlaskSQLAlchemySession
 from datetime import datetime, date, timedelta
 from dotenv import load_dotenv
 from sqlalchemy.dialects.mysql import LONGTEXT
 from sqlalchemy.orm import load_only
-from sqlalchemy import inspect
+from sqlalchemy import and_, create_engine, event, inspect, or_
 from sqlalchemy.exc import OperationalError, InterfaceError
 from collections import OrderedDict
-from functools import lru_cache
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from dataclasses import dataclass
+from functools import lru_cache, wraps
+import bisect
+import contextvars
+import itertools
+import io
 import os
 import json
 import glob
 import re
+import random
 import time
+import atexit
+import zlib
 import hashlib
 import hmac
 import secrets
+import tempfile
+import threading
 import urllib.error
 import urllib.parse
 import urllib.request
-from typing import List, Dict, Any, Optional, Tuple
+from typing import List, Dict, Any, Callable, Iterable, Iterator, Optional, Tuple
 from zoneinfo import ZoneInfo
 
 import numpy as np
 
+import fast_json
+from fast_json import FastJSONProvider
+
 # ── ENV / конфіг ───────────────────────────────────────────────────────────────
 load_dotenv()
 
 app = Flask(__name__)
-app.config["JSON_AS_ASCII"] = False  # коректна UTF-8 відповідь
+# UTF-8 без \u-екранування; orjson, якщо встановлено (JSON_PROVIDER=stdlib — лише stdlib json).
+app.json = FastJSONProvider(app)
+if (os.getenv("JSON_PROVIDER") or "").strip().lower() == "stdlib":
+    app.json.use_orjson = False
 app.config["SECRET_KEY"] = (
     os.getenv("FLASK_SECRET_KEY")
     or os.getenv("SECRET_KEY")
@@ -66,25 +84,79 @@ db_uri = os.getenv("DATABASE_URL")
 if not db_uri:
     db_uri = "sqlite:///" + os.path.join(instance_path, "games.db")
 
+# Необов'язкові окремі бази: архів (великі незмінні рейтинги, майже лише читання)
+# і Twitch-таблиці (дрібні записи на кожне повідомлення чату). Без них усе живе в db_uri.
+ARCHIVE_DATABASE_URL = (os.getenv("ARCHIVE_DATABASE_URL") or "").strip()
+TWITCH_DATABASE_URL = (os.getenv("TWITCH_DATABASE_URL") or "").strip()
+# SQLite-архів лише для читання (PRAGMA query_only): dev-збереження та імпорт JSON тоді не працюють.
+ARCHIVE_DATABASE_READONLY = _env_flag("ARCHIVE_DATABASE_READONLY")
+SQLITE_ARCHIVE_MMAP_MB = _env_int("SQLITE_ARCHIVE_MMAP_MB", 256)
+SQLITE_ARCHIVE_CACHE_MB = _env_int("SQLITE_ARCHIVE_CACHE_MB", 16)
+SQLITE_WAL_AUTOCHECKPOINT_PAGES = _env_int("SQLITE_WAL_AUTOCHECKPOINT_PAGES", 1000)
+SQLITE_JOURNAL_SIZE_LIMIT_MB = _env_int("SQLITE_JOURNAL_SIZE_LIMIT_MB", 64)
+# Репліки для читання (через кому) для основної бази та окремих bind.
+DATABASE_REPLICA_URLS: Dict[Optional[str], List[str]] = {
+    bind_key: [url.strip() for url in (os.getenv(env_name) or "").split(",") if url.strip()]
+    for bind_key, env_name in (
+        (None, "DATABASE_REPLICA_URLS"),
+        ("archive", "ARCHIVE_DATABASE_REPLICA_URLS"),
+        ("twitch", "TWITCH_DATABASE_REPLICA_URLS"),
+    )
+}
+# Скільки секунд після запису читання тієї ж теми йдуть на primary (затримка реплікації).
+DATABASE_REPLICA_STICKY_SECONDS = _env_int("DATABASE_REPLICA_STICKY_SECONDS", 10)
+
+
+def _engine_options_for(uri: str) -> Dict[str, Any]:
+    if uri.startswith("sqlite"):
+        return {
+            "connect_args": {
+                "timeout": _env_int("SQLITE_BUSY_TIMEOUT_SECONDS", 30, minimum=1),
+            },
+        }
+    if uri.startswith("mysql"):
+        return {
+            "pool_pre_ping": True,
+            "pool_recycle": int(os.getenv("DB_POOL_RECYCLE_SECONDS", "280"))
+        }
+    return {}
+
+
 app.config["SQLALCHEMY_DATABASE_URI"] = db_uri
 app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
-if db_uri.startswith("sqlite"):
-    app.config["SQLALCHEMY_ENGINE_OPTIONS"] = {
-        "connect_args": {
-            "timeout": _env_int("SQLITE_BUSY_TIMEOUT_SECONDS", 30, minimum=1),
-        },
-    }
-elif db_uri.startswith("mysql"):
-    app.config["SQLALCHEMY_ENGINE_OPTIONS"] = {
-        "pool_pre_ping": True,
-        "pool_recycle": int(os.getenv("DB_POOL_RECYCLE_SECONDS", "280"))
-    }
+app.config["SQLALCHEMY_ENGINE_OPTIONS"] = _engine_options_for(db_uri)
+app.config["SQLALCHEMY_BINDS"] = {
+    bind_key: {"url": bind_uri, **_engine_options_for(bind_uri)}
+    for bind_key, bind_uri in (("archive", ARCHIVE_DATABASE_URL), ("twitch", TWITCH_DATABASE_URL))
+    if bind_uri
+}
+ARCHIVE_BIND_KEY = "archive" if ARCHIVE_DATABASE_URL else None
+TWITCH_BIND_KEY = "twitch" if TWITCH_DATABASE_URL else None
+
+# primary engine -> репліки; заповнюється при ініціалізації БД.
+DATABASE_REPLICA_ENGINES: Dict[Any, List[Any]] = {}
+# Номер репліки для поточного читання; None — усе йде на primary.
+DB_REPLICA_SLOT: "contextvars.ContextVar[Optional[int]]" = contextvars.ContextVar("db_replica_slot", default=None)
+
 
-db = SQLAlchemy(app)
+class ReplicaRoutingSession(FlaskSQLAlchemySession):
+    """Запити всередині _reads_from_replica ідуть на репліку свого bind; решта й flush — на primary."""
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        engine = super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+        replica_slot = DB_REPLICA_SLOT.get()
+        if replica_slot is None or bind is not None or self._flushing:
+            return engine
+        replicas = DATABASE_REPLICA_ENGINES.get(engine)
+        return replicas[replica_slot % len(replicas)] if replicas else engine
+
+
+db = SQLAlchemy(app, session_options={"class_": ReplicaRoutingSession})
 
 # ── Модель ─────────────────────────────────────────────────────────────────────
 class ArchivedGame(db.Model):
     __tablename__ = "archived_game"
+    __bind_key__ = ARCHIVE_BIND_KEY
 
     id = db.Column(db.Integer, primary_key=True)
     game_date = db.Column(db.Date, unique=True, nullable=False, index=True)
@@ -95,6 +167,13 @@ class ArchivedGame(db.Model):
 
 class TwitchChatEvent(db.Model):
     __tablename__ = "twitch_chat_event"
+    __bind_key__ = TWITCH_BIND_KEY
+    __table_args__ = (
+        # Keyset-запити черги: WHERE channel AND game_scope ORDER BY id.
+        db.Index("ix_twitch_chat_event_channel_scope_id", "channel", "game_scope", "id"),
+        # Перевірка дубля за message_id від Twitch.
+        db.Index("ix_twitch_chat_event_channel_source_message", "channel", "source_message_id"),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     channel = db.Column(db.String(100), nullable=False, index=True)
@@ -109,6 +188,7 @@ class TwitchChatEvent(db.Model):
 
 class TwitchChatActiveTarget(db.Model):
     __tablename__ = "twitch_chat_active_target"
+    __bind_key__ = TWITCH_BIND_KEY
 
     id = db.Column(db.Integer, primary_key=True)
     channel = db.Column(db.String(100), nullable=False, unique=True, index=True)
@@ -126,6 +206,7 @@ class TwitchChatActiveTarget(db.Model):
 
 class TwitchConnection(db.Model):
     __tablename__ = "twitch_connection"
+    __bind_key__ = TWITCH_BIND_KEY
 
     id = db.Column(db.Integer, primary_key=True)
     twitch_user_id = db.Column(db.String(100), nullable=False, unique=True, index=True)
@@ -175,6 +256,47 @@ LIVE_VECTORS_PATH = os.getenv(
     os.path.join("data", "word_vectors_ubercorpus_wordlist_fp16.npz"),
 )
 CUSTOM_RANKING_CACHE_SIZE = max(1, int(os.getenv("CUSTOM_RANKING_CACHE_SIZE", "2")))
+LIVE_VECTORS_RELOAD_CHECK_SECONDS = _env_int("LIVE_VECTORS_RELOAD_CHECK_SECONDS", 30, minimum=1)
+# Архівні рейтинги як готові файли (export_static_rankings.py); з RANKING_X_ACCEL_REDIRECT їх віддає nginx.
+RANKING_STATIC_EXPORT_DIR = os.getenv(
+    "RANKING_STATIC_EXPORT_DIR",
+    os.path.join(instance_path, "static_rankings"),
+)
+RANKING_X_ACCEL_REDIRECT = _env_flag("RANKING_X_ACCEL_REDIRECT")
+RANKING_X_ACCEL_PREFIX = "/" + (os.getenv("RANKING_X_ACCEL_PREFIX") or "/_static_rankings/").strip("/") + "/"
+RANKING_STATIC_MANIFEST_CHECK_SECONDS = _env_int("RANKING_STATIC_MANIFEST_CHECK_SECONDS", 30, minimum=1)
+# Версія архіву для URL (?v=): збереження гри міняє її, тож nginx proxy_cache і браузери йдуть по свіжі ключі.
+ARCHIVE_CACHE_VERSION_PATH = os.getenv(
+    "ARCHIVE_CACHE_VERSION_PATH",
+    os.path.join(instance_path, "archive_cache_version"),
+)
+ARCHIVE_CACHE_VERSION_CHECK_SECONDS = _env_int("ARCHIVE_CACHE_VERSION_CHECK_SECONDS", 5, minimum=1)
+# Другий рівень кешу live-рейтингів: файли на диску, спільні для всіх воркерів; 0 вимикає.
+LIVE_RANKING_DISK_CACHE_DIR = os.getenv(
+    "LIVE_RANKING_DISK_CACHE_DIR",
+    os.path.join(instance_path, "live_ranking_cache"),
+)
+LIVE_RANKING_DISK_CACHE_MAX_MB = _env_int("LIVE_RANKING_DISK_CACHE_MAX_MB", 512, minimum=0)
+# Змінюйте, коли змінюється побудова live-рейтингу (сортування, винятки): інвалідуює ETag у клієнтів.
+LIVE_RANKING_ALGORITHM_VERSION = "1"
+LIVE_RANKING_PUBLIC_MAX_AGE_SECONDS = _env_int("LIVE_RANKING_PUBLIC_MAX_AGE_SECONDS", 3600, minimum=0)
+# Побудова live-рейтингів — в окремому пулі: розмір, черга, таймаут очікування, BLAS-потоки на процес.
+LIVE_RANKING_POOL_SIZE = _env_int("LIVE_RANKING_POOL_SIZE", 2, minimum=1)
+LIVE_RANKING_QUEUE_MAX = _env_int("LIVE_RANKING_QUEUE_MAX", 8, minimum=0)
+LIVE_RANKING_TIMEOUT_SECONDS = _env_int("LIVE_RANKING_TIMEOUT_SECONDS", 15, minimum=1)
+LIVE_RANKING_RETRY_AFTER_SECONDS = _env_int("LIVE_RANKING_RETRY_AFTER_SECONDS", 3, minimum=1)
+LIVE_RANKING_BLAS_THREADS = _env_int("LIVE_RANKING_BLAS_THREADS", 1, minimum=0)
+# Рейтинги віддаються потоком: стільки записів кодується за один шматок відповіді.
+RANKING_STREAM_CHUNK_ENTRIES = _env_int("RANKING_STREAM_CHUNK_ENTRIES", 2000, minimum=100)
+# За nginx із gzip on стискати в додатку не треба; вмикайте, коли проксі не стискає.
+RANKING_STREAM_GZIP = _env_flag("RANKING_STREAM_GZIP")
+RANKING_STREAM_GZIP_LEVEL = min(9, _env_int("RANKING_STREAM_GZIP_LEVEL", 5, minimum=1))
+# Знаків після коми для similarity у рейтингах (UI показує 4); 0 — без округлення.
+JSON_FLOAT_PRECISION = _env_int("JSON_FLOAT_PRECISION", 6)
+# >0: dev-збереження пише в archived_game лише перші N записів рейтингу (hybrid-v1),
+# а хвіст відновлюється з live-векторів під час читання. 0 — повний рейтинг, як раніше.
+ARCHIVE_RANKING_HEAD_ENTRIES = _env_int("ARCHIVE_RANKING_HEAD_ENTRIES", 0)
+HYBRID_RANKING_FORMAT = "hybrid-v1"
 CUSTOM_GAME_TOKEN_SECRET = (
     os.getenv("CUSTOM_GAME_TOKEN_SECRET")
     or os.getenv("FLASK_SECRET_KEY")
@@ -205,7 +327,28 @@ TWITCH_CHAT_PRUNE_INTERVAL_SECONDS = _env_int(
     minimum=30,
 )
 TWITCH_CHAT_MAX_STORED_EVENTS = _env_int("TWITCH_CHAT_MAX_STORED_EVENTS", 5000, minimum=100)
+TWITCH_CHAT_PRUNE_BATCH_SIZE = _env_int("TWITCH_CHAT_PRUNE_BATCH_SIZE", 500, minimum=10)
+TWITCH_CHAT_PRUNE_BATCH_PAUSE_MS = _env_int("TWITCH_CHAT_PRUNE_BATCH_PAUSE_MS", 20, minimum=0)
+# Write-behind для SQLite: лише для одного процесу-писача (id видаються в пам'яті).
+TWITCH_CHAT_WRITE_BEHIND_REQUESTED = _env_flag("TWITCH_CHAT_WRITE_BEHIND")
+TWITCH_CHAT_WRITE_BEHIND_FLUSH_MS = _env_int("TWITCH_CHAT_WRITE_BEHIND_FLUSH_MS", 25, minimum=1)
+TWITCH_CHAT_WRITE_BEHIND_MAX_BATCH = _env_int("TWITCH_CHAT_WRITE_BEHIND_MAX_BATCH", 500, minimum=1)
+# Скільки незаписаних подій тримати в пам'яті, поки БД недоступна; далі publish отримує 503.
+TWITCH_CHAT_WRITE_BEHIND_MAX_PENDING = _env_int("TWITCH_CHAT_WRITE_BEHIND_MAX_PENDING", 20000, minimum=1)
+TWITCH_CHAT_WRITE_BEHIND_DURABILITY = (
+    (os.getenv("TWITCH_CHAT_WRITE_BEHIND_DURABILITY") or "buffered").strip().lower()
+)
 TWITCH_CHAT_MAX_FETCH_LIMIT = 100
+TWITCH_WORKER_CONNECTIONS_CACHE_SECONDS = _env_int("TWITCH_WORKER_CONNECTIONS_CACHE_SECONDS", 15, minimum=1)
+TWITCH_TOKEN_REFRESH_AHEAD_SECONDS = _env_int("TWITCH_TOKEN_REFRESH_AHEAD_SECONDS", 1800, minimum=60)
+TWITCH_WORKER_CHANGES_MAX_WAIT_SECONDS = _env_int("TWITCH_WORKER_CHANGES_MAX_WAIT_SECONDS", 25, minimum=1)
+TWITCH_TOKEN_REFRESH_CHECK_SECONDS = _env_int("TWITCH_TOKEN_REFRESH_CHECK_SECONDS", 60, minimum=10)
+TWITCH_CHAT_LATEST_ID_TTL_SECONDS = _env_int("TWITCH_CHAT_LATEST_ID_TTL_SECONDS", 10, minimum=1)
+TWITCH_CHAT_PUBLISH_BATCH_MAX = _env_int("TWITCH_CHAT_PUBLISH_BATCH_MAX", 50, minimum=1)
+TWITCH_CHAT_GUESS_SYNC_MS = _env_int("TWITCH_CHAT_GUESS_SYNC_MS", 1000, minimum=100)
+TWITCH_CHAT_GUESS_AGGREGATES_MAX = _env_int("TWITCH_CHAT_GUESS_AGGREGATES_MAX", 64, minimum=4)
+TWITCH_CHAT_GUESS_FEED_LIMIT = 200
+TWITCH_CHAT_GUESS_FEED_MAX_LIMIT = 1000
 DEV_MODE_ENABLED = _env_flag("DEV_MODE_ENABLED")
 DEV_MODE_PASSWORD = (os.getenv("DEV_MODE_PASSWORD") or "").strip()
 DEV_MODE_PATH = (os.getenv("DEV_MODE_PATH") or "").strip()
@@ -295,7 +438,7 @@ def extract_secret_word(value: Any, game_date: Optional[date]) -> str:
 def import_json_into_sqlite_if_needed():
     """Якщо локальний SQLite і таблиця порожня — імпортувати з JSON файлів."""
     with app.app_context():
-        engine = db.engine
+        engine = db.engines[ARCHIVE_BIND_KEY]
         is_sqlite = engine.url.drivername.startswith("sqlite")
         insp = inspect(engine)
 
@@ -305,8 +448,8 @@ def import_json_into_sqlite_if_needed():
             # оновити інспектор після створення
             insp = inspect(engine)
 
-        if not is_sqlite:
-            # На проді (MySQL) — нічого не імпортуємо автоматом
+        if not is_sqlite or ARCHIVE_DATABASE_READONLY:
+            # На проді (MySQL) і в архів лише для читання — нічого не імпортуємо автоматом
             return
 
         # Перевірити, чи таблиця вже заповнена
@@ -322,8 +465,8 @@ def import_json_into_sqlite_if_needed():
         added = 0
         for path in json_files:
             try:
-                with open(path, "r", encoding="utf-8") as f:
-                    payload = json.load(f)
+                with open(path, "rb") as f:
+                    payload = fast_json.loads(f.read())
             except Exception as e:
                 print(f"[DB INIT] Пропускаю '{path}': не вдалося прочитати JSON ({e})")
                 continue
@@ -348,7 +491,7 @@ def import_json_into_sqlite_if_needed():
             row = ArchivedGame(
                 game_date=gdate,
                 secret_word=secret_word,
-                ranking_json=json.dumps(ranking, ensure_ascii=False)
+                ranking_json=fast_json.dumps(ranking)
             )
             db.session.add(row)
             added += 1
@@ -365,9 +508,10 @@ def import_json_into_sqlite_if_needed():
 
 
 def ensure_twitch_chat_event_schema() -> None:
-    """Додає службові колонки для Twitch-черги, якщо таблиця вже існувала раніше."""
+    """Додає службові колонки та складені індекси для Twitch-черги, якщо таблиця вже існувала раніше."""
     with app.app_context():
-        insp = inspect(db.engine)
+        twitch_engine = db.engines[TWITCH_BIND_KEY]
+        insp = inspect(twitch_engine)
         if "twitch_chat_event" not in insp.get_table_names():
             return
 
@@ -386,29 +530,91 @@ def ensure_twitch_chat_event_schema() -> None:
                 "ADD COLUMN source_message_id VARCHAR(120) DEFAULT NULL"
             )
 
-        if not alter_sqls:
+        existing_indexes = {index["name"] for index in insp.get_indexes("twitch_chat_event")}
+        missing_indexes = [
+            index
+            for index in TwitchChatEvent.__table__.indexes
+            if index.name not in existing_indexes
+        ]
+
+        if not alter_sqls and not missing_indexes:
             return
 
-        with db.engine.begin() as connection:
+        with twitch_engine.begin() as connection:
             for alter_sql in alter_sqls:
                 connection.exec_driver_sql(alter_sql)
+            for index in missing_indexes:
+                print(f"[DB INIT] Створюю індекс {index.name} для twitch_chat_event...")
+                index.create(connection)
+
+
+def _sqlite_connection_pragmas(bind_key: Optional[str]) -> List[str]:
+    """PRAGMA для кожного нового з'єднання: архів — під читання, Twitch — під часті записи."""
+    pragmas: List[str] = []
+    if bind_key != "twitch":
+        pragmas += [
+            f"PRAGMA mmap_size={SQLITE_ARCHIVE_MMAP_MB * 1024 * 1024}",
+            f"PRAGMA cache_size={-SQLITE_ARCHIVE_CACHE_MB * 1024}",
+            "PRAGMA temp_store=MEMORY",
+        ]
+    if bind_key != "archive":
+        pragmas += [
+            "PRAGMA synchronous=NORMAL",
+            f"PRAGMA wal_autocheckpoint={SQLITE_WAL_AUTOCHECKPOINT_PAGES}",
+            f"PRAGMA journal_size_limit={SQLITE_JOURNAL_SIZE_LIMIT_MB * 1024 * 1024}",
+        ]
+    if bind_key == "archive" and ARCHIVE_DATABASE_READONLY:
+        pragmas.append("PRAGMA query_only=ON")
+    return pragmas
+
+
+def _listen_sqlite_pragmas(engine, pragmas: List[str]) -> None:
+    def apply_pragmas(dbapi_connection, _connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for pragma in pragmas:
+                cursor.execute(pragma)
+        finally:
+            cursor.close()
+
+    event.listen(engine, "connect", apply_pragmas)
+
+
+def configure_database_replicas() -> None:
+    for bind_key, urls in DATABASE_REPLICA_URLS.items():
+        primary_engine = db.engines.get(bind_key)
+        if primary_engine is None or not urls:
+            continue
+        replicas = []
+        for url in urls:
+            replica_engine = create_engine(url, **_engine_options_for(url))
+            if replica_engine.url.drivername.startswith("sqlite"):
+                _listen_sqlite_pragmas(replica_engine, _sqlite_connection_pragmas(bind_key) + ["PRAGMA query_only=ON"])
+            replicas.append(replica_engine)
+        DATABASE_REPLICA_ENGINES[primary_engine] = replicas
+        print(f"[DB INIT] Реплік для читання ({bind_key or 'default'}): {len(replicas)}.")
 
 
 def configure_sqlite_runtime() -> None:
     """Use WAL mode on SQLite deployments so reads are not blocked by short writes."""
-    if not db.engine.url.drivername.startswith("sqlite"):
-        return
+    for bind_key, engine in db.engines.items():
+        if not engine.url.drivername.startswith("sqlite"):
+            continue
 
-    try:
-        with db.engine.connect() as connection:
-            connection.exec_driver_sql("PRAGMA journal_mode=WAL")
-            connection.exec_driver_sql("PRAGMA synchronous=NORMAL")
-    except Exception as exc:
-        print(f"[DB INIT] Не вдалося налаштувати SQLite WAL: {exc}")
+        _listen_sqlite_pragmas(engine, _sqlite_connection_pragmas(bind_key))
+        if bind_key == "archive" and ARCHIVE_DATABASE_READONLY:
+            continue
+
+        try:
+            with engine.connect() as connection:
+                connection.exec_driver_sql("PRAGMA journal_mode=WAL")
+        except Exception as exc:
+            print(f"[DB INIT] Не вдалося налаштувати SQLite WAL ({bind_key or 'default'}): {exc}")
 
 # ──  Ініціалізація БД при імпорті (працює і для `flask run`)  ──────────────────
 with app.app_context():
     configure_sqlite_runtime()
+    configure_database_replicas()
     # Гарантуємо наявність усіх таблиць, включно з новими службовими.
     db.create_all()
     ensure_twitch_chat_event_schema()
@@ -420,43 +626,326 @@ RANKING_CACHE: dict[date, list] = {}
 ARCHIVE_DATES_CACHE: Optional[List[str]] = None
 ARCHIVE_DATES_CACHE_EXPIRES_AT = 0.0
 ARCHIVE_DATES_CACHE_TTL_SECONDS = max(30, int(os.getenv("ARCHIVE_DATES_CACHE_TTL_SECONDS", "300")))
-CUSTOM_RANKING_CACHE: "OrderedDict[str, List[Dict[str, Any]]]" = OrderedDict()
-LIVE_WORDS: Optional[List[str]] = None
-LIVE_WORD_TO_INDEX: Optional[Dict[str, int]] = None
-LIVE_MATRIX: Optional[np.ndarray] = None
-LIVE_NORMS: Optional[np.ndarray] = None
+# Останні вдало прочитані рейтинги (ті самі списки, що й у RANKING_CACHE) — віддаються, поки БД недоступна.
+RANKING_LAST_GOOD: "OrderedDict[date, list]" = OrderedDict()
+RANKING_LAST_GOOD_LOCK = threading.Lock()
+DB_STALE_RANKINGS_MAX = _env_int("DB_STALE_RANKINGS_MAX", 16, minimum=0)
+# Повтори запиту з backoff; після DB_BREAKER_FAILURE_THRESHOLD невдалих запитів поспіль
+# база DB_BREAKER_OPEN_SECONDS не смикається зовсім, далі один пробний запит.
+DB_RETRY_ATTEMPTS = _env_int("DB_RETRY_ATTEMPTS", 3, minimum=1)
+DB_RETRY_BACKOFF_MS = _env_int("DB_RETRY_BACKOFF_MS", 50, minimum=0)
+DB_BREAKER_FAILURE_THRESHOLD = _env_int("DB_BREAKER_FAILURE_THRESHOLD", 5, minimum=1)
+DB_BREAKER_OPEN_SECONDS = _env_int("DB_BREAKER_OPEN_SECONDS", 10, minimum=1)
+DB_ACCESS_STATS: Dict[str, int] = {
+    "retries": 0,
+    "failures": 0,
+    "breaker_trips": 0,
+    "breaker_rejections": 0,
+    "stale_responses": 0,
+    "replica_reads": 0,
+    "replica_fallbacks": 0,
+}
+DB_ACCESS_STATS_LOCK = threading.Lock()
+# тема ("archive", "twitch:<channel>") -> до якого моменту читати з primary після запису
+DB_PRIMARY_STICKY_UNTIL: Dict[str, float] = {}
+DB_PRIMARY_STICKY_LOCK = threading.Lock()
+DB_REPLICA_COUNTER = itertools.count()
+# word -> (версія live-векторів, рейтинг)
+CUSTOM_RANKING_CACHE: "OrderedDict[str, Tuple[str, List[Dict[str, Any]]]]" = OrderedDict()
+CUSTOM_RANKING_CACHE_LOCK = threading.Lock()
+LIVE_VECTOR_STORE: Optional["LiveVectorStore"] = None
+LIVE_VECTOR_STORE_LOCK = threading.Lock()
+LIVE_VECTORS_LAST_CHECK_AT = 0.0
+LIVE_VECTORS_RELOAD_IN_PROGRESS = False
+LIVE_VECTORS_REJECTED_SIGNATURE: Optional[Tuple[int, int]] = None
+LIVE_RANKING_DISK_CACHE_EVICT_LOCK = threading.Lock()
+# дата -> {"ranked": відносний шлях, "archive": відносний шлях} з manifest.json експорту
+STATIC_RANKING_MANIFEST: Dict[str, Dict[str, str]] = {}
+STATIC_RANKING_MANIFEST_SIGNATURE: Optional[Tuple[int, int]] = None
+STATIC_RANKING_MANIFEST_CHECKED_AT = 0.0
+STATIC_RANKING_MANIFEST_LOCK = threading.Lock()
+ARCHIVE_CACHE_VERSION = "0"
+ARCHIVE_CACHE_VERSION_SIGNATURE: Optional[Tuple[int, int]] = None
+ARCHIVE_CACHE_VERSION_CHECKED_AT = 0.0
+ARCHIVE_CACHE_VERSION_LOCK = threading.Lock()
+LIVE_RANKING_EXECUTOR: Optional[ThreadPoolExecutor] = None
+LIVE_RANKING_EXECUTOR_LOCK = threading.Lock()
+LIVE_RANKING_BLAS_LIMITER: Any | None = None
+# (версія векторів, слово) -> Future побудови; однакові запити чекають на ту саму побудову.
+LIVE_RANKING_INFLIGHT: Dict[Tuple[str, str], Future] = {}
 CUSTOM_GAME_ID_TO_WORD: Optional[Dict[str, str]] = None
 UK_MORPH_ANALYZER: Any | None = None
 UK_MORPH_ANALYZER_INIT_ATTEMPTED = False
-LAST_TWITCH_CHAT_PRUNE_AT = 0.0
+TWITCH_GUESS_VOCABULARY_SNAPSHOT: Optional[Dict[str, Any]] = None
+TWITCH_GUESS_VOCABULARY_LOCK = threading.Lock()
+# (діє до, ETag, тіло) для /api/twitch-worker/connections
+TWITCH_WORKER_CONNECTIONS_MEMO: Optional[Tuple[float, str, Dict[str, Any]]] = None
+# Будить long-poll /api/twitch-worker/connections/changes при записах у цьому процесі.
+TWITCH_WORKER_CHANGES_CONDITION = threading.Condition()
+TWITCH_TOKEN_REFRESH_THREAD: Optional[threading.Thread] = None
+TWITCH_TOKEN_REFRESH_LOCK = threading.Lock()
+TWITCH_TOKEN_REFRESH_WAKE = threading.Event()
+# connection id -> (коли пробувати знову, текст помилки)
+TWITCH_TOKEN_REFRESH_FAILURES: Dict[int, Tuple[float, str]] = {}
+TWITCH_CHAT_MAINTENANCE_THREAD: Optional[threading.Thread] = None
+TWITCH_CHAT_MAINTENANCE_LOCK = threading.Lock()
+# (channel, game_scope) -> (останній id події, коли звірено з БД)
+TWITCH_CHAT_LATEST_EVENT_IDS: Dict[Tuple[str, str], Tuple[int, float]] = {}
+TWITCH_CHAT_LATEST_EVENT_IDS_LOCK = threading.Lock()
+# (channel, instance_key) -> агреговані різні слова гри для /api/twitch-chat/guesses
+TWITCH_CHAT_GUESS_AGGREGATES: "OrderedDict[Tuple[str, str], TwitchChatGuessAggregate]" = OrderedDict()
+TWITCH_CHAT_GUESS_AGGREGATES_LOCK = threading.Lock()
+# instance_key -> (рейтинг, з якого побудовано індекс, word -> rank)
+TWITCH_GAME_RANK_INDEX_CACHE: "OrderedDict[str, Tuple[List[Dict[str, Any]], Dict[str, int]]]" = OrderedDict()
+TWITCH_GAME_RANK_INDEX_LOCK = threading.Lock()
+
+def _count_db_event(name: str) -> None:
+    with DB_ACCESS_STATS_LOCK:
+        DB_ACCESS_STATS[name] += 1
+
+
+class DbCircuitBreaker:
+    """Стан доступності БД у процесі: closed -> open (після порогу збоїв) -> одна проба -> closed."""
+
+    def __init__(self, failure_threshold: int, open_seconds: float) -> None:
+        self.failure_threshold = failure_threshold
+        self.open_seconds = open_seconds
+        self._lock = threading.Lock()
+        self._consecutive_failures = 0
+        self._opened_until = 0.0
+        self._probe_in_flight = False
+
+    def allow(self) -> bool:
+        with self._lock:
+            if not self._opened_until:
+                return True
+            if time.monotonic() < self._opened_until or self._probe_in_flight:
+                return False
+            self._probe_in_flight = True
+            return True
+
+    def record_success(self) -> None:
+        with self._lock:
+            was_open = bool(self._opened_until)
+            self._consecutive_failures = 0
+            self._opened_until = 0.0
+            self._probe_in_flight = False
+        if was_open:
+            print("[DB] Базу знову доступно, circuit breaker закрито.")
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._consecutive_failures += 1
+            self._probe_in_flight = False
+            if not self._opened_until and self._consecutive_failures < self.failure_threshold:
+                return
+            tripped = not self._opened_until
+            self._opened_until = time.monotonic() + self.open_seconds
+        if tripped:
+            _count_db_event("breaker_trips")
+            print(
+                f"[DB] {self._consecutive_failures} збоїв поспіль: circuit breaker відкрито "
+                f"на {self.open_seconds} с."
+            )
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            if not self._opened_until:
+                state = "closed"
+            elif self._probe_in_flight or time.monotonic() >= self._opened_until:
+                state = "half-open"
+            else:
+                state = "open"
+            return {
+                "state": state,
+                "consecutive_failures": self._consecutive_failures,
+                "open_for_seconds": round(max(0.0, self._opened_until - time.monotonic()), 1),
+            }
+
 
-def _reset_db_connection():
+DB_CIRCUIT_BREAKER = DbCircuitBreaker(DB_BREAKER_FAILURE_THRESHOLD, DB_BREAKER_OPEN_SECONDS)
+
+
+def _discard_db_session() -> None:
+    # Лише сесія цього потоку: зламане з'єднання пул інвалідує сам, а engine.dispose()
+    # обірвав би й живі з'єднання інших потоків.
     try:
         db.session.rollback()
     except Exception:
         pass
     db.session.remove()
-    try:
-        db.engine.dispose()
-    except Exception:
-        pass
+
+
+def _db_retry_delay(attempt: int) -> float:
+    base_seconds = DB_RETRY_BACKOFF_MS / 1000.0 * (2 ** attempt)
+    return base_seconds * random.uniform(0.5, 1.0)
+
 
 def _run_db_query_with_retry(loader):
-    try:
-        return loader()
-    except (OperationalError, InterfaceError):
-        _reset_db_connection()
-        return loader()
+    """Виконує loader із повторами; OperationalError після останньої спроби або при відкритому breaker."""
+    if not DB_CIRCUIT_BREAKER.allow():
+        _count_db_event("breaker_rejections")
+        raise OperationalError("circuit breaker open", {}, RuntimeError("database marked unavailable"))
+
+    for attempt in range(DB_RETRY_ATTEMPTS):
+        try:
+            result = loader()
+        except (OperationalError, InterfaceError):
+            _discard_db_session()
+            if attempt + 1 >= DB_RETRY_ATTEMPTS:
+                _count_db_event("failures")
+                DB_CIRCUIT_BREAKER.record_failure()
+                raise
+            _count_db_event("retries")
+            time.sleep(_db_retry_delay(attempt))
+        except Exception:
+            # База відповіла; помилка в самих даних breaker не стосується.
+            DB_CIRCUIT_BREAKER.record_success()
+            raise
+        else:
+            DB_CIRCUIT_BREAKER.record_success()
+            return result
+
+
+def _stick_reads_to_primary(topic: str) -> None:
+    if not DATABASE_REPLICA_ENGINES or DATABASE_REPLICA_STICKY_SECONDS <= 0:
+        return
+    now = time.monotonic()
+    with DB_PRIMARY_STICKY_LOCK:
+        if len(DB_PRIMARY_STICKY_UNTIL) > 4096:
+            for stale_topic in [key for key, until in DB_PRIMARY_STICKY_UNTIL.items() if until <= now]:
+                del DB_PRIMARY_STICKY_UNTIL[stale_topic]
+        DB_PRIMARY_STICKY_UNTIL[topic] = now + DATABASE_REPLICA_STICKY_SECONDS
+
+
+def _is_sticky_to_primary(topic: str) -> bool:
+    until = DB_PRIMARY_STICKY_UNTIL.get(topic)
+    if until is not None and time.monotonic() < until:
+        return True
+    if topic == "archive":
+        # Збереження в іншому воркері видно за mtime файлу версії архіву.
+        signature = ARCHIVE_CACHE_VERSION_SIGNATURE
+        return signature is not None and time.time() - signature[0] / 1e9 < DATABASE_REPLICA_STICKY_SECONDS
+    return False
+
+
+def _reads_from_replica(sticky_topic: Callable[..., str]):
+    """Виконує read-only завантажувач на репліці; недоступна репліка — повтор на primary."""
+    def decorator(loader):
+        @wraps(loader)
+        def wrapper(*args, **kwargs):
+            if (
+                not DATABASE_REPLICA_ENGINES
+                or DB_REPLICA_SLOT.get() is not None
+                or _is_sticky_to_primary(sticky_topic(*args, **kwargs))
+            ):
+                return loader(*args, **kwargs)
+
+            token = DB_REPLICA_SLOT.set(next(DB_REPLICA_COUNTER))
+            try:
+                result = loader(*args, **kwargs)
+            except (OperationalError, InterfaceError) as e:
+                _discard_db_session()
+                _count_db_event("replica_fallbacks")
+                print(f"[DB] Репліка недоступна для {loader.__name__}, читаю з primary: {e.orig!r}")
+            else:
+                _count_db_event("replica_reads")
+                return result
+            finally:
+                DB_REPLICA_SLOT.reset(token)
+            return loader(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def _cache_ranking(target_date: date, ranking: list) -> None:
+    RANKING_CACHE[target_date] = ranking
+    _remember_last_good_ranking(target_date, ranking)
+
+
+def _remember_last_good_ranking(target_date: date, ranking: list) -> None:
+    if DB_STALE_RANKINGS_MAX <= 0:
+        return
+    with RANKING_LAST_GOOD_LOCK:
+        RANKING_LAST_GOOD[target_date] = ranking
+        RANKING_LAST_GOOD.move_to_end(target_date)
+        while len(RANKING_LAST_GOOD) > DB_STALE_RANKINGS_MAX:
+            RANKING_LAST_GOOD.popitem(last=False)
+
+
+def _get_stale_ranking(target_date: date) -> Optional[list]:
+    """Останній вдалий рейтинг дати, коли БД недоступна; рахується як stale-відповідь."""
+    with RANKING_LAST_GOOD_LOCK:
+        ranking = RANKING_LAST_GOOD.get(target_date)
+    if ranking is not None:
+        _count_db_event("stale_responses")
+    return ranking
 
+@_reads_from_replica(lambda target_date: "archive")
 def _load_ranking_from_db(target_date: date) -> list | None:
     row = ArchivedGame.query.filter_by(game_date=target_date).first()
     if not row:
         return None
-    data = json.loads(row.ranking_json)
+    return _parse_ranking_json(row.ranking_json)
+
+
+def _parse_ranking_json(raw_json: str) -> list:
+    data = fast_json.loads(raw_json)
+    if isinstance(data, dict) and data.get("format") == HYBRID_RANKING_FORMAT:
+        data = _expand_hybrid_ranking(data)
     if not isinstance(data, list):
         raise ValueError("Ranking data is not a list")
-    return data
+    return fast_json.round_similarities(data, JSON_FLOAT_PRECISION)
+
+
+def _encode_archive_ranking(secret_word: str, ranking: List[Dict[str, Any]], vectors_version: str) -> str:
+    """ranking_json для archived_game: повний список або голова hybrid-v1, якщо задано ARCHIVE_RANKING_HEAD_ENTRIES."""
+    head_size = ARCHIVE_RANKING_HEAD_ENTRIES
+    if head_size <= 0 or len(ranking) <= head_size:
+        return fast_json.dumps(ranking)
+    return fast_json.dumps({
+        "format": HYBRID_RANKING_FORMAT,
+        "secret_word": secret_word,
+        "vectors_version": vectors_version,
+        "total": len(ranking),
+        "head": ranking[:head_size],
+    })
+
+
+def _hybrid_ranking_tail(head: List[Dict[str, Any]], live_ranking: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Live-рейтинг без слів голови, з рангами одразу після неї; live_ranking не змінюється."""
+    head_words = {entry.get("word") for entry in head}
+    next_rank = len(head) + 1
+    tail: List[Dict[str, Any]] = []
+    for entry in live_ranking:
+        if entry["word"] in head_words:
+            continue
+        tail.append({"word": entry["word"], "similarity": entry["similarity"], "rank": next_rank})
+        next_rank += 1
+    return tail
+
+
+def _expand_hybrid_ranking(payload: Dict[str, Any]) -> List[Dict[str, Any]]:
+    head = payload.get("head")
+    secret_word = payload.get("secret_word")
+    if not isinstance(head, list) or not isinstance(secret_word, str) or not secret_word:
+        raise ValueError("Hybrid ranking has no head or secret_word")
+
+    live_ranking, vectors_version = _get_live_ranking_with_version(secret_word)
+    if vectors_version != payload.get("vectors_version"):
+        # Голова й хвіст з різних векторів дали б неузгоджені ранги й similarity — не склеюємо.
+        print(
+            f"[ARCHIVE] Рейтинг '{secret_word}' збережено з векторами v{payload.get('vectors_version')}, "
+            f"а завантажено v{vectors_version}: хвіст не відновлюю. "
+            "Перед заміною векторів запустіть verify_hybrid_rankings.py --expand."
+        )
+        raise ValueError("Hybrid ranking was saved with different live vectors")
+    ranking = head + _hybrid_ranking_tail(head, live_ranking)
+    if len(ranking) != payload.get("total"):
+        print(f"[ARCHIVE] Рейтинг '{secret_word}': відновлено {len(ranking)} записів замість {payload.get('total')}.")
+    return ranking
 
+@_reads_from_replica(lambda: "archive")
 def _load_archive_dates_from_db() -> List[str]:
     games = (
         ArchivedGame.query
@@ -486,17 +975,95 @@ def _today_in_kyiv() -> date:
     return _now_in_kyiv().date()
 
 
-def _invalidate_archive_caches(target_date: Optional[date] = None) -> None:
+def _seconds_until_kyiv_midnight() -> int:
+    now = _now_in_kyiv()
+    midnight = datetime.combine(now.date() + timedelta(days=1), datetime.min.time(), tzinfo=KYIV_TZ)
+    return max(1, int(midnight.timestamp() - now.timestamp()))
+
+
+def _public_cache_control_until_midnight(max_age: int) -> str:
+    """Спільні кеші (nginx) не мають тримати "сьогоднішню" відповідь після 00:00 за Києвом."""
+    return f"public, max-age={min(max_age, _seconds_until_kyiv_midnight())}"
+
+
+def _invalidate_archive_caches(target_date: Optional[date] = None, bump_version: bool = True) -> None:
     global ARCHIVE_DATES_CACHE, ARCHIVE_DATES_CACHE_EXPIRES_AT
 
     if target_date is None:
         RANKING_CACHE.clear()
     else:
         RANKING_CACHE.pop(target_date, None)
+    # Змінена гра не має повернутись як "остання вдала", якщо БД потім ляже.
+    with RANKING_LAST_GOOD_LOCK:
+        if target_date is None:
+            RANKING_LAST_GOOD.clear()
+        else:
+            RANKING_LAST_GOOD.pop(target_date, None)
 
-    ARCHIVE_DATES_CACHE = None
+    # Список лишається як останній вдалий на випадок недоступної БД; TTL скинуто.
     ARCHIVE_DATES_CACHE_EXPIRES_AT = 0.0
 
+    if bump_version:
+        _bump_archive_cache_version()
+
+
+def _read_archive_cache_version_file() -> Tuple[str, Optional[Tuple[int, int]]]:
+    try:
+        with open(ARCHIVE_CACHE_VERSION_PATH, "r", encoding="utf-8") as f:
+            stat = os.fstat(f.fileno())
+            version = f.read(64).strip()
+    except FileNotFoundError:
+        return "0", None
+    return version or "0", (stat.st_mtime_ns, stat.st_size)
+
+
+def _get_archive_cache_version() -> str:
+    """Поточна версія архіву; файл перевіряється раз на ARCHIVE_CACHE_VERSION_CHECK_SECONDS.
+
+    Нова версія від іншого воркера скидає і тутешні кеші архіву в пам'яті.
+    """
+    global ARCHIVE_CACHE_VERSION, ARCHIVE_CACHE_VERSION_SIGNATURE, ARCHIVE_CACHE_VERSION_CHECKED_AT
+
+    now = time.monotonic()
+    if now - ARCHIVE_CACHE_VERSION_CHECKED_AT < ARCHIVE_CACHE_VERSION_CHECK_SECONDS:
+        return ARCHIVE_CACHE_VERSION
+
+    with ARCHIVE_CACHE_VERSION_LOCK:
+        if now - ARCHIVE_CACHE_VERSION_CHECKED_AT < ARCHIVE_CACHE_VERSION_CHECK_SECONDS:
+            return ARCHIVE_CACHE_VERSION
+        first_check = ARCHIVE_CACHE_VERSION_CHECKED_AT == 0.0
+        ARCHIVE_CACHE_VERSION_CHECKED_AT = now
+        try:
+            version, signature = _read_archive_cache_version_file()
+        except OSError as e:
+            print(f"[ARCHIVE] Не вдалося прочитати версію кешу '{ARCHIVE_CACHE_VERSION_PATH}': {e}")
+            return ARCHIVE_CACHE_VERSION
+        if signature == ARCHIVE_CACHE_VERSION_SIGNATURE:
+            return ARCHIVE_CACHE_VERSION
+        changed = version != ARCHIVE_CACHE_VERSION
+        ARCHIVE_CACHE_VERSION, ARCHIVE_CACHE_VERSION_SIGNATURE = version, signature
+
+    if changed and not first_check:
+        _invalidate_archive_caches(bump_version=False)
+        print(f"[ARCHIVE] Нова версія кешу архіву {version}: кеші в пам'яті скинуто.")
+    return version
+
+
+def _bump_archive_cache_version() -> str:
+    global ARCHIVE_CACHE_VERSION, ARCHIVE_CACHE_VERSION_SIGNATURE, ARCHIVE_CACHE_VERSION_CHECKED_AT
+
+    version = f"{time.time_ns():x}"
+    with ARCHIVE_CACHE_VERSION_LOCK:
+        ARCHIVE_CACHE_VERSION = version
+        ARCHIVE_CACHE_VERSION_CHECKED_AT = time.monotonic()
+        try:
+            _write_file_atomically(ARCHIVE_CACHE_VERSION_PATH, version.encode("ascii"))
+            ARCHIVE_CACHE_VERSION_SIGNATURE = _read_archive_cache_version_file()[1]
+        except OSError as e:
+            # Цей воркер уже віддає нову версію; інші підхоплять її з наступним записом.
+            print(f"[ARCHIVE] Не вдалося записати версію кешу '{ARCHIVE_CACHE_VERSION_PATH}': {e}")
+    return version
+
 
 def _normalize_word(raw_word: Optional[str]) -> str:
     return (raw_word or "").strip().lower()
@@ -858,6 +1425,7 @@ def _upsert_twitch_connection(
         row.last_validated_at = datetime.utcnow()
 
     db.session.commit()
+    _invalidate_twitch_worker_connections_memo()
     return row
 
 
@@ -905,11 +1473,12 @@ def _upsert_mock_twitch_connection() -> TwitchConnection:
         row.last_validated_at = datetime.utcnow()
 
     db.session.commit()
+    _invalidate_twitch_worker_connections_memo()
     return row
 
 
 def _refresh_twitch_connection_if_needed(row: TwitchConnection, force: bool = False) -> TwitchConnection:
-    refresh_before = datetime.utcnow() + timedelta(minutes=10)
+    refresh_before = datetime.utcnow() + timedelta(seconds=TWITCH_TOKEN_REFRESH_AHEAD_SECONDS)
     if (
         not force
         and row.token_expires_at is not None
@@ -924,6 +1493,187 @@ def _refresh_twitch_connection_if_needed(row: TwitchConnection, force: bool = Fa
     return _upsert_twitch_connection(validate_payload, token_payload, profile_payload)
 
 
+def _refresh_due_twitch_connections() -> int:
+    """Оновлює токени, що спливають протягом TWITCH_TOKEN_REFRESH_AHEAD_SECONDS; невдалі — з backoff."""
+    refresh_before = datetime.utcnow() + timedelta(seconds=TWITCH_TOKEN_REFRESH_AHEAD_SECONDS)
+    due_ids = [
+        row[0]
+        for row in db.session.query(TwitchConnection.id)
+        .filter(
+            TwitchConnection.is_active.is_(True),
+            db.or_(
+                TwitchConnection.token_expires_at.is_(None),
+                TwitchConnection.token_expires_at <= refresh_before,
+            ),
+        )
+        .all()
+    ]
+    db.session.commit()
+
+    refreshed = 0
+    now = time.time()
+    for connection_id in due_ids:
+        failure = TWITCH_TOKEN_REFRESH_FAILURES.get(connection_id)
+        if failure is not None and failure[0] > now:
+            continue
+
+        row = db.session.get(TwitchConnection, connection_id)
+        if row is None or not row.is_active:
+            continue
+        twitch_login = row.twitch_login
+        try:
+            _refresh_twitch_connection_if_needed(row)
+            TWITCH_TOKEN_REFRESH_FAILURES.pop(connection_id, None)
+            refreshed += 1
+        except Exception as exc:
+            db.session.rollback()
+            TWITCH_TOKEN_REFRESH_FAILURES[connection_id] = (now + 300, str(exc))
+            print(f"[TWITCH WORKER] Failed to refresh token for {twitch_login}: {exc}")
+    if refreshed:
+        _invalidate_twitch_worker_connections_memo()
+    return refreshed
+
+
+def _twitch_token_refresh_loop() -> None:
+    while True:
+        try:
+            with app.app_context():
+                _refresh_due_twitch_connections()
+        except Exception as exc:
+            with app.app_context():
+                db.session.rollback()
+            print(f"[TWITCH WORKER] Token refresh pass failed: {exc}")
+        TWITCH_TOKEN_REFRESH_WAKE.wait(TWITCH_TOKEN_REFRESH_CHECK_SECONDS)
+        TWITCH_TOKEN_REFRESH_WAKE.clear()
+
+
+def _ensure_twitch_token_refresh_started() -> None:
+    """Фонове оновлення токенів наперед — щоб /connections ніколи не ходив у Twitch сам."""
+    global TWITCH_TOKEN_REFRESH_THREAD
+
+    if not _has_real_twitch_oauth_config():
+        return
+    thread = TWITCH_TOKEN_REFRESH_THREAD
+    if thread is not None and thread.is_alive():
+        return
+
+    with TWITCH_TOKEN_REFRESH_LOCK:
+        if TWITCH_TOKEN_REFRESH_THREAD is not None and TWITCH_TOKEN_REFRESH_THREAD.is_alive():
+            return
+        TWITCH_TOKEN_REFRESH_THREAD = threading.Thread(
+            target=_twitch_token_refresh_loop,
+            name="twitch-token-refresh",
+            daemon=True,
+        )
+        TWITCH_TOKEN_REFRESH_THREAD.start()
+
+
+def _invalidate_twitch_worker_connections_memo() -> None:
+    global TWITCH_WORKER_CONNECTIONS_MEMO
+    TWITCH_WORKER_CONNECTIONS_MEMO = None
+    with TWITCH_WORKER_CHANGES_CONDITION:
+        TWITCH_WORKER_CHANGES_CONDITION.notify_all()
+
+
+def _load_twitch_worker_connections_fingerprint() -> str:
+    """Дешевий відбиток того, від чого залежить /connections: живі цілі та активні підключення."""
+    cutoff = datetime.utcnow() - timedelta(seconds=TWITCH_CHAT_TARGET_TTL_SECONDS)
+    target_rows = (
+        db.session.query(
+            TwitchChatActiveTarget.channel,
+            TwitchChatActiveTarget.game_scope,
+            TwitchChatActiveTarget.page_url,
+        )
+        .filter(TwitchChatActiveTarget.updated_at >= cutoff)
+        .order_by(TwitchChatActiveTarget.channel.asc())
+        .all()
+    )
+    connection_rows = (
+        db.session.query(TwitchConnection.id, TwitchConnection.updated_at)
+        .filter(TwitchConnection.is_active.is_(True))
+        .order_by(TwitchConnection.id.asc())
+        .all()
+    )
+    db.session.commit()
+
+    digest = hashlib.sha256()
+    for channel, game_scope, page_url in target_rows:
+        digest.update(f"t|{channel}|{game_scope}|{page_url}\n".encode("utf-8"))
+    for connection_id, updated_at in connection_rows:
+        digest.update(f"c|{connection_id}|{updated_at.isoformat() if updated_at else ''}\n".encode("utf-8"))
+    return digest.hexdigest()[:32]
+
+
+def _build_twitch_worker_connections_payload() -> Dict[str, Any]:
+    rows = _run_db_query_with_retry(_load_worker_active_twitch_connections)
+    now = datetime.utcnow()
+    active_connections: List[Dict[str, Any]] = []
+    skipped_connections: List[Dict[str, Any]] = []
+    needs_refresh = False
+
+    for connection, active_target in rows:
+        missing_scopes = _twitch_connection_missing_required_scopes(connection)
+        if missing_scopes:
+            skipped_connections.append({
+                "twitch_login": connection.twitch_login,
+                "twitch_user_id": connection.twitch_user_id,
+                "reason": "missing_scopes",
+                "missing_scopes": missing_scopes,
+            })
+            continue
+
+        token_expired = connection.token_expires_at is not None and connection.token_expires_at <= now
+        failure = TWITCH_TOKEN_REFRESH_FAILURES.get(connection.id)
+        if token_expired and failure is not None:
+            skipped_connections.append({
+                "twitch_login": connection.twitch_login,
+                "twitch_user_id": connection.twitch_user_id,
+                "reason": "token_refresh_failed",
+                "error": failure[1],
+            })
+            continue
+        if connection.token_expires_at is None or token_expired:
+            # Фоновий планувальник ще не встиг — будимо його; вже відкриті EventSub-сесії працюють і далі.
+            needs_refresh = True
+
+        active_connections.append({
+            "connection_id": connection.id,
+            "twitch_user_id": connection.twitch_user_id,
+            "twitch_login": connection.twitch_login,
+            "twitch_display_name": connection.twitch_display_name,
+            "access_token": connection.access_token,
+            "token_scopes": _twitch_connection_scope_values(connection),
+            "game_scope": active_target.game_scope,
+            "page_url": active_target.page_url or None,
+        })
+
+    if needs_refresh:
+        TWITCH_TOKEN_REFRESH_WAKE.set()
+
+    return {
+        "connections": active_connections,
+        "count": len(active_connections),
+        "required_scopes": TWITCH_EVENTSUB_REQUIRED_SCOPES,
+        "skipped": skipped_connections,
+    }
+
+
+def _get_twitch_worker_connections_snapshot(bypass_memo: bool = False) -> Tuple[str, Dict[str, Any]]:
+    """(ETag, тіло) для воркерів; у межах TWITCH_WORKER_CONNECTIONS_CACHE_SECONDS — без звернень до БД."""
+    global TWITCH_WORKER_CONNECTIONS_MEMO
+
+    memo = TWITCH_WORKER_CONNECTIONS_MEMO
+    now = time.time()
+    if memo is not None and memo[0] > now and not bypass_memo:
+        return memo[1], memo[2]
+
+    payload = _build_twitch_worker_connections_payload()
+    canonical = json.dumps(payload, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+    etag = hashlib.sha256(canonical.encode("utf-8")).hexdigest()[:32]
+    TWITCH_WORKER_CONNECTIONS_MEMO = (now + TWITCH_WORKER_CONNECTIONS_CACHE_SECONDS, etag, payload)
+    return etag, payload
+
+
 def _resolve_twitch_guess_word(raw_word: Any) -> Optional[str]:
     normalized_word = _normalize_word(raw_word if isinstance(raw_word, str) else "")
     if not normalized_word:
@@ -960,6 +1710,216 @@ def _load_twitch_chat_latest_event_id(channel: str = "", game_scope: str = "") -
     return int(row[0]) if row else 0
 
 
+def _get_twitch_chat_latest_event_id(channel: str = "", game_scope: str = "") -> int:
+    """Останній id події з пам'яті процесу; у БД ходить раз на TWITCH_CHAT_LATEST_ID_TTL_SECONDS.
+
+    Публікації цього процесу одразу піднімають значення, а TTL підхоплює записи
+    інших gunicorn-воркерів.
+    """
+    key = (channel, game_scope)
+    now = time.time()
+    cached = TWITCH_CHAT_LATEST_EVENT_IDS.get(key)
+    if cached is not None and now - cached[1] < TWITCH_CHAT_LATEST_ID_TTL_SECONDS:
+        return cached[0]
+
+    latest_event_id = _run_db_query_with_retry(
+        lambda: _load_twitch_chat_latest_event_id(channel, game_scope)
+    )
+    if TWITCH_CHAT_WRITE_BEHIND is not None:
+        pending_rows = TWITCH_CHAT_WRITE_BEHIND.pending_events(latest_event_id, channel, game_scope)
+        if pending_rows:
+            latest_event_id = pending_rows[-1].id
+    with TWITCH_CHAT_LATEST_EVENT_IDS_LOCK:
+        if len(TWITCH_CHAT_LATEST_EVENT_IDS) > 4096:
+            TWITCH_CHAT_LATEST_EVENT_IDS.clear()
+        TWITCH_CHAT_LATEST_EVENT_IDS[key] = (latest_event_id, now)
+    return latest_event_id
+
+
+def _note_twitch_chat_event_id(channel: str, game_scope: str, event_id: int) -> None:
+    with TWITCH_CHAT_LATEST_EVENT_IDS_LOCK:
+        for key in ((channel, game_scope), (channel, ""), ("", game_scope), ("", "")):
+            cached = TWITCH_CHAT_LATEST_EVENT_IDS.get(key)
+            if cached is not None and event_id > cached[0]:
+                TWITCH_CHAT_LATEST_EVENT_IDS[key] = (event_id, cached[1])
+
+
+class TwitchChatWriteBehindBuffer:
+    """Буфер publish-подій для SQLite: id видаються в пам'яті, запис у БД — груповими транзакціями.
+
+    Події видно в /api/twitch-chat/events одразу після publish. Фоновий потік
+    скидає їх у БД кожні TWITCH_CHAT_WRITE_BEHIND_FLUSH_MS. Режим "buffered"
+    відповідає клієнту до коміту (при аварії втрачається не більше одного
+    інтервалу), "sync" чекає на груповий коміт, куди потрапляють усі
+    паралельні publish.
+    """
+
+    def __init__(self, flush_interval_seconds: float, max_batch: int, durability: str, max_pending: int) -> None:
+        self.flush_interval_seconds = flush_interval_seconds
+        self.max_batch = max_batch
+        self.max_pending = max_pending
+        self.durability = durability
+        self._condition = threading.Condition()
+        self._pending: List[TwitchChatEvent] = []
+        self._next_id: Optional[int] = None
+        self._flushed_through_id = 0
+        self._failed_through_id = 0
+        self._thread: Optional[threading.Thread] = None
+        self._flush_lock = threading.Lock()
+
+    def append(self, row: TwitchChatEvent) -> TwitchChatEvent:
+        with self._condition:
+            if len(self._pending) >= self.max_pending:
+                self._condition.notify_all()
+                raise OperationalError("write-behind append", {}, RuntimeError("write-behind buffer is full"))
+            if self._next_id is None:
+                # Незаписані події теж займають id: інакше після збою flush вони видалися б повторно.
+                max_id = int(db.session.query(db.func.max(TwitchChatEvent.id)).scalar() or 0)
+                if self._pending:
+                    max_id = max(max_id, self._pending[-1].id)
+                self._next_id = max_id + 1
+            row.id = self._next_id
+            row.created_at = datetime.utcnow()
+            self._next_id += 1
+            self._pending.append(row)
+            if len(self._pending) >= self.max_batch:
+                self._condition.notify_all()
+            self._ensure_thread()
+        return row
+
+    def wait_durable(self, event_id: int, timeout: float = 10.0) -> None:
+        deadline = time.monotonic() + timeout
+        with self._condition:
+            self._condition.notify_all()
+            while self._flushed_through_id < event_id:
+                if self._failed_through_id >= event_id:
+                    raise OperationalError("write-behind flush", {}, RuntimeError("flush failed"))
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise OperationalError("write-behind flush", {}, TimeoutError("flush timed out"))
+                self._condition.wait(remaining)
+
+    def pending_events(
+        self,
+        after_id: int,
+        channel: str,
+        game_scope: str,
+        source_message_id: str = "",
+    ) -> List[TwitchChatEvent]:
+        with self._condition:
+            return [
+                row
+                for row in self._pending
+                if row.id > after_id
+                and (not channel or row.channel == channel)
+                and (not game_scope or row.game_scope == game_scope)
+                and (not source_message_id or row.source_message_id == source_message_id)
+            ]
+
+    def flush(self) -> int:
+        with self._flush_lock:
+            with self._condition:
+                batch = list(self._pending[: self.max_batch])
+            if not batch:
+                return 0
+
+            values = [
+                {
+                    "id": row.id,
+                    "channel": row.channel,
+                    "game_scope": row.game_scope,
+                    "source_message_id": row.source_message_id,
+                    "chatter_user_login": row.chatter_user_login,
+                    "chatter_display_name": row.chatter_display_name,
+                    "raw_message": row.raw_message,
+                    "guessed_word": row.guessed_word,
+                    "created_at": row.created_at,
+                }
+                for row in batch
+            ]
+            try:
+                db.session.execute(TwitchChatEvent.__table__.insert(), values)
+                db.session.commit()
+            except Exception:
+                db.session.rollback()
+                with self._condition:
+                    self._failed_through_id = max(self._failed_through_id, batch[-1].id)
+                    # Інший процес міг писати в таблицю — наступний append перечитає max(id)
+                    # з урахуванням подій, що лишились у _pending.
+                    self._next_id = None
+                    self._condition.notify_all()
+                raise
+
+            with self._condition:
+                del self._pending[: len(batch)]
+                self._flushed_through_id = max(self._flushed_through_id, batch[-1].id)
+                self._failed_through_id = 0
+                self._condition.notify_all()
+            return len(batch)
+
+    def _ensure_thread(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._thread = threading.Thread(
+            target=self._flush_loop,
+            name="twitch-chat-write-behind",
+            daemon=True,
+        )
+        self._thread.start()
+
+    def _flush_loop(self) -> None:
+        while True:
+            with self._condition:
+                self._condition.wait(self.flush_interval_seconds)
+                if not self._pending:
+                    continue
+            try:
+                with app.app_context():
+                    while self.flush() >= self.max_batch:
+                        pass
+            except Exception as e:
+                print(f"[TWITCH CHAT] Write-behind: не вдалося записати пакет подій: {e}")
+                time.sleep(min(1.0, self.flush_interval_seconds * 10))
+
+    def flush_all(self) -> None:
+        with app.app_context():
+            while self.flush():
+                pass
+
+
+def _create_twitch_chat_write_behind_buffer() -> Optional[TwitchChatWriteBehindBuffer]:
+    if not TWITCH_CHAT_WRITE_BEHIND_REQUESTED:
+        return None
+    if not app.config["SQLALCHEMY_DATABASE_URI"].startswith("sqlite"):
+        print("[TWITCH CHAT] TWITCH_CHAT_WRITE_BEHIND підтримується лише для SQLite — вимкнено.")
+        return None
+    if TWITCH_CHAT_WRITE_BEHIND_DURABILITY not in {"buffered", "sync"}:
+        raise RuntimeError("TWITCH_CHAT_WRITE_BEHIND_DURABILITY має бути 'buffered' або 'sync'.")
+
+    buffer = TwitchChatWriteBehindBuffer(
+        TWITCH_CHAT_WRITE_BEHIND_FLUSH_MS / 1000.0,
+        TWITCH_CHAT_WRITE_BEHIND_MAX_BATCH,
+        TWITCH_CHAT_WRITE_BEHIND_DURABILITY,
+        TWITCH_CHAT_WRITE_BEHIND_MAX_PENDING,
+    )
+    atexit.register(_flush_twitch_chat_write_behind_on_exit, buffer)
+    print(
+        f"[TWITCH CHAT] Write-behind увімкнено: flush={TWITCH_CHAT_WRITE_BEHIND_FLUSH_MS}ms, "
+        f"durability={TWITCH_CHAT_WRITE_BEHIND_DURABILITY}. Запускайте один процес-писач."
+    )
+    return buffer
+
+
+def _flush_twitch_chat_write_behind_on_exit(buffer: TwitchChatWriteBehindBuffer) -> None:
+    try:
+        buffer.flush_all()
+    except Exception as e:
+        print(f"[TWITCH CHAT] Write-behind: не вдалося дописати події при зупинці: {e}")
+
+
+TWITCH_CHAT_WRITE_BEHIND = _create_twitch_chat_write_behind_buffer()
+
+
 def _load_twitch_chat_event_by_source_message(
     channel: str,
     game_scope: str,
@@ -968,6 +1928,11 @@ def _load_twitch_chat_event_by_source_message(
     if not source_message_id:
         return None
 
+    if TWITCH_CHAT_WRITE_BEHIND is not None:
+        pending_rows = TWITCH_CHAT_WRITE_BEHIND.pending_events(0, channel, game_scope, source_message_id)
+        if pending_rows:
+            return pending_rows[-1]
+
     query = TwitchChatEvent.query.filter(
         TwitchChatEvent.channel == channel,
         TwitchChatEvent.source_message_id == source_message_id,
@@ -997,12 +1962,21 @@ def _upsert_twitch_chat_active_target(channel: str, game_scope: str, page_url: s
             page_url=page_url,
         )
         db.session.add(row)
+        target_changed = True
     else:
+        # Звичайний heartbeat сторінки не змінює того, що бачать воркери.
+        target_changed = (
+            row.game_scope != game_scope
+            or row.page_url != page_url
+            or row.updated_at < datetime.utcnow() - timedelta(seconds=TWITCH_CHAT_TARGET_TTL_SECONDS)
+        )
         row.game_scope = game_scope
         row.page_url = page_url
         row.updated_at = datetime.utcnow()
 
     db.session.commit()
+    if target_changed:
+        _invalidate_twitch_worker_connections_memo()
     return row
 
 
@@ -1015,6 +1989,7 @@ def _resolve_active_twitch_game_scope(channel: str) -> Optional[str]:
     return game_scope or None
 
 
+@_reads_from_replica(lambda after_id, channel, game_scope, limit: f"twitch:{channel}")
 def _load_twitch_chat_events(after_id: int, channel: str, game_scope: str, limit: int) -> List[TwitchChatEvent]:
     query = TwitchChatEvent.query.filter(TwitchChatEvent.id > after_id)
     if channel:
@@ -1022,7 +1997,18 @@ def _load_twitch_chat_events(after_id: int, channel: str, game_scope: str, limit
     if game_scope:
         query = query.filter(TwitchChatEvent.game_scope == game_scope)
 
-    return query.order_by(TwitchChatEvent.id.asc()).limit(limit).all()
+    rows = query.order_by(TwitchChatEvent.id.asc()).limit(limit).all()
+    if TWITCH_CHAT_WRITE_BEHIND is None:
+        return rows
+
+    # Події з буфера ще не в БД (або саме комітяться) — зливаємо без дублів за id.
+    pending_rows = TWITCH_CHAT_WRITE_BEHIND.pending_events(after_id, channel, game_scope)
+    if not pending_rows:
+        return rows
+    seen_ids = {row.id for row in rows}
+    merged = rows + [row for row in pending_rows if row.id not in seen_ids]
+    merged.sort(key=lambda row: row.id)
+    return merged[:limit]
 
 
 @lru_cache(maxsize=2048)
@@ -1109,6 +2095,7 @@ def _resolve_secret_word_for_twitch_event(game_scope: str, created_at: Optional[
     return _resolve_secret_word_for_twitch_game_scope(normalized_scope)
 
 
+@_reads_from_replica(lambda channel, limit: f"twitch:{channel}")
 def _load_twitch_chat_solver_leaderboard(channel: str, limit: int) -> List[Dict[str, Any]]:
     if not channel:
         return []
@@ -1195,66 +2182,383 @@ def _load_twitch_chat_solver_leaderboard(channel: str, limit: int) -> List[Dict[
     ]
 
 
-def _prune_twitch_chat_events_if_needed(force: bool = False) -> None:
-    global LAST_TWITCH_CHAT_PRUNE_AT
+def _load_twitch_game_ranking(instance_key: str) -> Optional[List[Dict[str, Any]]]:
+    if instance_key.startswith("date:"):
+        try:
+            target_date = datetime.strptime(instance_key[5:], "%Y-%m-%d").date()
+        except ValueError:
+            return None
+        cached = RANKING_CACHE.get(target_date)
+        if cached is not None:
+            return cached
+        try:
+            data = _run_db_query_with_retry(lambda: _load_ranking_from_db(target_date))
+        except (OperationalError, InterfaceError):
+            stale = _get_stale_ranking(target_date)
+            if stale is None:
+                raise
+            return stale
+        except (LiveRankingBusyError, FileNotFoundError, ValueError) as e:
+            print(f"[TWITCH] Не вдалося відновити рейтинг гри {target_date.isoformat()}: {e}")
+            return None
+        if data is not None:
+            _cache_ranking(target_date, data)
+        return data
+
+    if instance_key.startswith("custom:"):
+        try:
+            target_word = _get_custom_game_id_map().get(instance_key[7:])
+            return _get_live_ranking_cached(target_word) if target_word else None
+        except (FileNotFoundError, ValueError, RuntimeError) as e:
+            print(f"[TWITCH CHAT] Немає рейтингу для '{instance_key}': {e}")
+            return None
 
-    if not _is_twitch_chat_bridge_enabled():
-        return
+    return None
 
-    now = time.time()
-    if not force and (now - LAST_TWITCH_CHAT_PRUNE_AT) < TWITCH_CHAT_PRUNE_INTERVAL_SECONDS:
-        return
 
-    LAST_TWITCH_CHAT_PRUNE_AT = now
-    cutoff = datetime.utcnow() - timedelta(hours=TWITCH_CHAT_EVENT_RETENTION_HOURS)
+def _get_twitch_game_rank_index(instance_key: str) -> Dict[str, int]:
+    """word -> rank для гри; перебудовується, лише коли кеш рейтингу віддав інший список."""
+    ranking = _load_twitch_game_ranking(instance_key)
+    if not ranking:
+        return {}
 
-    db.session.query(TwitchChatEvent).filter(
-        TwitchChatEvent.created_at < cutoff
-    ).delete(synchronize_session=False)
-
-    total_rows = db.session.query(TwitchChatEvent.id).count()
-    overflow = total_rows - TWITCH_CHAT_MAX_STORED_EVENTS
-    if overflow > 0:
-        overflow_ids = [
-            row.id
-            for row in TwitchChatEvent.query
-            .order_by(TwitchChatEvent.id.asc())
-            .limit(overflow)
-            .all()
-        ]
-        if overflow_ids:
-            db.session.query(TwitchChatEvent).filter(
-                TwitchChatEvent.id.in_(overflow_ids)
-            ).delete(synchronize_session=False)
+    with TWITCH_GAME_RANK_INDEX_LOCK:
+        cached = TWITCH_GAME_RANK_INDEX_CACHE.get(instance_key)
+        if cached is not None and cached[0] is ranking:
+            TWITCH_GAME_RANK_INDEX_CACHE.move_to_end(instance_key)
+            return cached[1]
 
-    db.session.commit()
+    rank_index: Dict[str, int] = {}
+    for entry in ranking:
+        word = entry.get("word")
+        rank = entry.get("rank")
+        if word and rank is not None and word not in rank_index:
+            rank_index[word] = int(rank)
 
+    with TWITCH_GAME_RANK_INDEX_LOCK:
+        TWITCH_GAME_RANK_INDEX_CACHE[instance_key] = (ranking, rank_index)
+        TWITCH_GAME_RANK_INDEX_CACHE.move_to_end(instance_key)
+        while len(TWITCH_GAME_RANK_INDEX_CACHE) > TWITCH_CHAT_GUESS_AGGREGATES_MAX:
+            TWITCH_GAME_RANK_INDEX_CACHE.popitem(last=False)
+    return rank_index
 
-def _get_uk_morph_analyzer() -> Any | None:
-    global UK_MORPH_ANALYZER, UK_MORPH_ANALYZER_INIT_ATTEMPTED
 
-    if UK_MORPH_ANALYZER_INIT_ATTEMPTED:
-        return UK_MORPH_ANALYZER
+class TwitchChatGuessAggregate:
+    """Різні слова однієї гри каналу: хто назвав першим, скільки разів і який ранг.
 
-    UK_MORPH_ANALYZER_INIT_ATTEMPTED = True
-    try:
-        import pymorphy3  # type: ignore
-        UK_MORPH_ANALYZER = pymorphy3.MorphAnalyzer(lang="uk")
-        print("[MORPH] Ukrainian pymorphy3 analyzer enabled.")
-    except Exception as e:
-        UK_MORPH_ANALYZER = None
-        print(f"[MORPH] pymorphy3 unavailable; normalization disabled: {e!r}")
+    Версія запису — id останньої події, що його змінила. Id спільні для всіх
+    gunicorn-воркерів, тож курсор after_id оверлея однаковий у будь-якому процесі.
+    Усі методи викликаються під self.lock.
+    """
 
-    return UK_MORPH_ANALYZER
+    def __init__(self, channel: str, instance_key: str) -> None:
+        self.channel = channel
+        self.instance_key = instance_key
+        self.lock = threading.Lock()
+        self.entries: Dict[str, Dict[str, Any]] = {}
+        self.guess_count = 0
+        # Відсортований журнал (версія, слово); застарілі пари пропускаються при читанні.
+        self._changes: List[Tuple[int, str]] = []
+        # Події з id <= synced_through_id уже прочитані з БД; вище — лише ті, що внесені при publish.
+        self.synced_through_id = 0
+        self._folded_ids: set[int] = set()
+        self.synced_at = 0.0
+        self._rank_index: Dict[str, int] = {}
+
+    def set_rank_index(self, rank_index: Dict[str, int]) -> None:
+        if rank_index is self._rank_index:
+            return
+        self._rank_index = rank_index
+        for word, entry in self.entries.items():
+            entry["rank"] = rank_index.get(word)
+
+    def fold(self, row: Any) -> bool:
+        event_id = int(row.id)
+        if event_id <= self.synced_through_id or event_id in self._folded_ids:
+            return False
+        self._folded_ids.add(event_id)
+
+        word = row.guessed_word
+        entry = self.entries.get(word)
+        if entry is None:
+            entry = {
+                "word": word,
+                "rank": self._rank_index.get(word),
+                "count": 0,
+                "first_event_id": event_id,
+                "first_user_login": row.chatter_user_login,
+                "first_user_name": row.chatter_display_name,
+                "version": 0,
+            }
+            self.entries[word] = entry
+        elif event_id < entry["first_event_id"]:
+            # Пізній коміт меншого id: першим усе одно вважається менший id.
+            entry["first_event_id"] = event_id
+            entry["first_user_login"] = row.chatter_user_login
+            entry["first_user_name"] = row.chatter_display_name
+
+        entry["count"] += 1
+        self.guess_count += 1
+        if event_id > entry["version"]:
+            entry["version"] = event_id
+            bisect.insort(self._changes, (event_id, word))
+        if len(self._changes) > 2 * len(self.entries) + 256:
+            self._changes = sorted((item["version"], item["word"]) for item in self.entries.values())
+        return True
 
+    def mark_synced(self, through_id: int) -> None:
+        if through_id <= self.synced_through_id:
+            return
+        self.synced_through_id = through_id
+        self._folded_ids = {event_id for event_id in self._folded_ids if event_id > through_id}
+
+    def changes_after(self, after_id: int, limit: int) -> Tuple[List[Dict[str, Any]], int, bool]:
+        """Зміни з версією в (after_id, synced_through_id].
+
+        Події, внесені при publish, видно лише після синхронізації, що їх покрила:
+        менший id з іншого воркера може закомітитись пізніше, і курсор не має його перескочити.
+        """
+        start = bisect.bisect_right(self._changes, (after_id, "\U0010ffff"))
+        changed: List[Dict[str, Any]] = []
+        next_after_id = after_id
+        for version, word in self._changes[start:]:
+            if version > self.synced_through_id:
+                break
+            entry = self.entries[word]
+            if entry["version"] != version:
+                continue
+            if len(changed) >= limit:
+                return changed, next_after_id, True
+            changed.append(dict(entry))
+            next_after_id = version
+        return changed, next_after_id, False
+
+
+def _twitch_chat_instance_scope_filter(instance_key: str) -> Any:
+    if not instance_key.startswith("date:"):
+        return TwitchChatEvent.game_scope == instance_key
+
+    # daily:current на дату D — це та сама гра, що й date:D; межі доби — за Києвом.
+    target_date = datetime.strptime(instance_key[5:], "%Y-%m-%d").date()
+    day_start = datetime(target_date.year, target_date.month, target_date.day, tzinfo=KYIV_TZ)
+    start_utc = day_start.astimezone(ZoneInfo("UTC")).replace(tzinfo=None)
+    end_utc = (day_start + timedelta(days=1)).astimezone(ZoneInfo("UTC")).replace(tzinfo=None)
+    return or_(
+        TwitchChatEvent.game_scope == instance_key,
+        and_(
+            TwitchChatEvent.game_scope == "daily:current",
+            TwitchChatEvent.created_at >= start_utc,
+            TwitchChatEvent.created_at < end_utc,
+        ),
+    )
 
-@lru_cache(maxsize=8192)
-def _resolve_word_to_valid_lemma(raw_word: str) -> Optional[str]:
-    word = _normalize_word(raw_word)
-    if not word:
-        return None
 
-    if word in VALID_WORDS:
+def _load_twitch_chat_instance_events(channel: str, instance_key: str, after_id: int, limit: int) -> List[Any]:
+    rows = (
+        db.session.query(
+            TwitchChatEvent.id,
+            TwitchChatEvent.chatter_user_login,
+            TwitchChatEvent.chatter_display_name,
+            TwitchChatEvent.guessed_word,
+        )
+        .filter(
+            TwitchChatEvent.channel == channel,
+            TwitchChatEvent.id > after_id,
+            _twitch_chat_instance_scope_filter(instance_key),
+        )
+        .order_by(TwitchChatEvent.id.asc())
+        .limit(limit)
+        .all()
+    )
+    db.session.commit()
+    if TWITCH_CHAT_WRITE_BEHIND is None or len(rows) >= limit:
+        return rows
+
+    pending_rows = [
+        row
+        for row in TWITCH_CHAT_WRITE_BEHIND.pending_events(after_id, channel, "")
+        if _resolve_twitch_game_instance_key(row.game_scope, row.created_at) == instance_key
+    ]
+    if not pending_rows:
+        return rows
+    seen_ids = {row.id for row in rows}
+    merged = list(rows) + [row for row in pending_rows if row.id not in seen_ids]
+    merged.sort(key=lambda row: row.id)
+    return merged[:limit]
+
+
+def _get_twitch_chat_guess_aggregate(channel: str, instance_key: str) -> TwitchChatGuessAggregate:
+    """Агрегат гри, дочитаний з БД не давніше ніж TWITCH_CHAT_GUESS_SYNC_MS тому.
+
+    Перший запит будує його з усіх збережених подій гри, далі читаються лише
+    події з id > synced_through_id, тож оверлеї не перечитують чергу.
+    """
+    key = (channel, instance_key)
+    with TWITCH_CHAT_GUESS_AGGREGATES_LOCK:
+        aggregate = TWITCH_CHAT_GUESS_AGGREGATES.get(key)
+        if aggregate is None:
+            aggregate = TwitchChatGuessAggregate(channel, instance_key)
+            TWITCH_CHAT_GUESS_AGGREGATES[key] = aggregate
+            while len(TWITCH_CHAT_GUESS_AGGREGATES) > TWITCH_CHAT_GUESS_AGGREGATES_MAX:
+                TWITCH_CHAT_GUESS_AGGREGATES.popitem(last=False)
+        TWITCH_CHAT_GUESS_AGGREGATES.move_to_end(key)
+
+    with aggregate.lock:
+        now = time.monotonic()
+        if now - aggregate.synced_at < TWITCH_CHAT_GUESS_SYNC_MS / 1000:
+            return aggregate
+
+        aggregate.set_rank_index(_get_twitch_game_rank_index(instance_key))
+        batch_size = 1000
+        while True:
+            rows = _run_db_query_with_retry(
+                lambda: _load_twitch_chat_instance_events(
+                    channel,
+                    instance_key,
+                    aggregate.synced_through_id,
+                    batch_size,
+                )
+            )
+            for row in rows:
+                aggregate.fold(row)
+            if rows:
+                aggregate.mark_synced(rows[-1].id)
+            if len(rows) < batch_size:
+                break
+        aggregate.synced_at = now
+    return aggregate
+
+
+def _fold_published_twitch_chat_event(row: TwitchChatEvent) -> None:
+    """Одразу вносить нову подію в агрегат цього процесу, якщо його вже хтось читає."""
+    instance_key = _resolve_twitch_game_instance_key(row.game_scope, row.created_at)
+    aggregate = TWITCH_CHAT_GUESS_AGGREGATES.get((row.channel, instance_key))
+    if aggregate is None:
+        return
+    with aggregate.lock:
+        aggregate.fold(row)
+
+
+def _delete_twitch_chat_events_in_batches(low_id: int, high_id: int, extra_filter: Any = None) -> int:
+    """Видаляє події з id у [low_id, high_id) короткими транзакціями по TWITCH_CHAT_PRUNE_BATCH_SIZE id."""
+    deleted_total = 0
+    batch_low = low_id
+    while batch_low < high_id:
+        batch_high = min(batch_low + TWITCH_CHAT_PRUNE_BATCH_SIZE, high_id)
+        query = db.session.query(TwitchChatEvent).filter(
+            TwitchChatEvent.id >= batch_low,
+            TwitchChatEvent.id < batch_high,
+        )
+        if extra_filter is not None:
+            query = query.filter(extra_filter)
+        deleted_total += query.delete(synchronize_session=False) or 0
+        db.session.commit()
+        batch_low = batch_high
+        if batch_low < high_id:
+            # Даємо SQLite-писачам з publish проскочити між пакетами.
+            time.sleep(TWITCH_CHAT_PRUNE_BATCH_PAUSE_MS / 1000.0)
+    return deleted_total
+
+
+def _prune_twitch_chat_events() -> int:
+    """Ретеншн twitch_chat_event без COUNT(*) і без великих IN (...): лише діапазони id."""
+    min_id, max_id = db.session.query(
+        db.func.min(TwitchChatEvent.id),
+        db.func.max(TwitchChatEvent.id),
+    ).one()
+    db.session.commit()
+    if min_id is None or max_id is None:
+        return 0
+
+    deleted = 0
+
+    # 1) Ліміт кількості: лишаємо останні TWITCH_CHAT_MAX_STORED_EVENTS id (дірки в id лише зменшують залишок).
+    keep_from_id = max_id - TWITCH_CHAT_MAX_STORED_EVENTS + 1
+    if keep_from_id > min_id:
+        deleted += _delete_twitch_chat_events_in_batches(min_id, keep_from_id)
+        min_id = keep_from_id
+
+    # 2) Ліміт віку: id ростуть разом із created_at, тож шукаємо межу по індексу created_at.
+    cutoff = datetime.utcnow() - timedelta(hours=TWITCH_CHAT_EVENT_RETENTION_HOURS)
+    expired_max_id = db.session.query(db.func.max(TwitchChatEvent.id)).filter(
+        TwitchChatEvent.created_at < cutoff
+    ).scalar()
+    db.session.commit()
+    if expired_max_id is not None and expired_max_id >= min_id:
+        deleted += _delete_twitch_chat_events_in_batches(
+            min_id,
+            expired_max_id + 1,
+            TwitchChatEvent.created_at < cutoff,
+        )
+    return deleted
+
+
+def _twitch_chat_maintenance_loop() -> None:
+    # Розводимо gunicorn-воркери, щоб вони не чистили таблицю одночасно.
+    time.sleep(secrets.randbelow(max(1, TWITCH_CHAT_PRUNE_INTERVAL_SECONDS // 4) * 1000) / 1000.0)
+    while True:
+        started_at = time.perf_counter()
+        try:
+            with app.app_context():
+                deleted = _prune_twitch_chat_events()
+                if deleted:
+                    print(
+                        f"[TWITCH CHAT] Очищено {deleted} старих подій за "
+                        f"{time.perf_counter() - started_at:.2f}s."
+                    )
+        except Exception as e:
+            with app.app_context():
+                db.session.rollback()
+            print(f"[TWITCH CHAT] Не вдалося почистити старі події: {e}")
+        time.sleep(TWITCH_CHAT_PRUNE_INTERVAL_SECONDS)
+
+
+def _ensure_twitch_chat_maintenance_started() -> None:
+    """Запускає фонове чищення черги в цьому процесі (ліниво — вже після fork у gunicorn)."""
+    global TWITCH_CHAT_MAINTENANCE_THREAD
+
+    if not _is_twitch_chat_bridge_enabled():
+        return
+    thread = TWITCH_CHAT_MAINTENANCE_THREAD
+    if thread is not None and thread.is_alive():
+        return
+
+    with TWITCH_CHAT_MAINTENANCE_LOCK:
+        if TWITCH_CHAT_MAINTENANCE_THREAD is not None and TWITCH_CHAT_MAINTENANCE_THREAD.is_alive():
+            return
+        TWITCH_CHAT_MAINTENANCE_THREAD = threading.Thread(
+            target=_twitch_chat_maintenance_loop,
+            name="twitch-chat-maintenance",
+            daemon=True,
+        )
+        TWITCH_CHAT_MAINTENANCE_THREAD.start()
+
+
+def _get_uk_morph_analyzer() -> Any | None:
+    global UK_MORPH_ANALYZER, UK_MORPH_ANALYZER_INIT_ATTEMPTED
+
+    if UK_MORPH_ANALYZER_INIT_ATTEMPTED:
+        return UK_MORPH_ANALYZER
+
+    UK_MORPH_ANALYZER_INIT_ATTEMPTED = True
+    try:
+        import pymorphy3  # type: ignore
+        UK_MORPH_ANALYZER = pymorphy3.MorphAnalyzer(lang="uk")
+        print("[MORPH] Ukrainian pymorphy3 analyzer enabled.")
+    except Exception as e:
+        UK_MORPH_ANALYZER = None
+        print(f"[MORPH] pymorphy3 unavailable; normalization disabled: {e!r}")
+
+    return UK_MORPH_ANALYZER
+
+
+@lru_cache(maxsize=8192)
+def _resolve_word_to_valid_lemma(raw_word: str) -> Optional[str]:
+    word = _normalize_word(raw_word)
+    if not word:
+        return None
+
+    if word in VALID_WORDS:
         return word
 
     morph = _get_uk_morph_analyzer()
@@ -1281,6 +2585,57 @@ def _resolve_word_to_valid_lemma(raw_word: str) -> Optional[str]:
     return None
 
 
+def _collect_valid_word_forms(morph: Any) -> set[str]:
+    """Усі словоформи, які _resolve_word_to_valid_lemma зведе до слова зі словника."""
+    forms: set[str] = set(VALID_WORDS)
+    for word in VALID_WORDS_SORTED:
+        for parse in morph.parse(word):
+            if not getattr(parse, "is_known", False) or getattr(parse.tag, "POS", None) != "NOUN":
+                continue
+            if _normalize_word(getattr(parse, "normal_form", "")) != word:
+                continue
+            for form in parse.lexeme:
+                normalized_form = _normalize_word(getattr(form, "word", ""))
+                if normalized_form:
+                    forms.add(normalized_form)
+    return forms
+
+
+def _get_twitch_guess_vocabulary_snapshot() -> Dict[str, Any]:
+    """Знімок слів, які /api/twitch-chat/publish прийме як здогадку; рахується один раз на процес."""
+    global TWITCH_GUESS_VOCABULARY_SNAPSHOT
+
+    snapshot = TWITCH_GUESS_VOCABULARY_SNAPSHOT
+    if snapshot is not None:
+        return snapshot
+
+    with TWITCH_GUESS_VOCABULARY_LOCK:
+        if TWITCH_GUESS_VOCABULARY_SNAPSHOT is not None:
+            return TWITCH_GUESS_VOCABULARY_SNAPSHOT
+
+        started_at = time.perf_counter()
+        morph = _get_uk_morph_analyzer()
+        if morph is None:
+            mode = "exact"
+            words = VALID_WORDS_SORTED
+        else:
+            mode = "forms"
+            words = sorted(_collect_valid_word_forms(morph))
+
+        body = json.dumps({"mode": mode, "words": words}, ensure_ascii=False, separators=(",", ":"))
+        version = hashlib.sha256(body.encode("utf-8")).hexdigest()[:20]
+        TWITCH_GUESS_VOCABULARY_SNAPSHOT = {
+            "version": version,
+            "mode": mode,
+            "words": words,
+        }
+        print(
+            f"[TWITCH WORKER] Словник для фільтра чату: {len(words)} форм, режим={mode}, "
+            f"v{version}, {time.perf_counter() - started_at:.2f}s"
+        )
+        return TWITCH_GUESS_VOCABULARY_SNAPSHOT
+
+
 def _custom_game_id_for_word(word: str) -> str:
     return hmac.new(
         CUSTOM_GAME_TOKEN_SECRET,
@@ -1311,25 +2666,37 @@ def _resolve_live_vectors_path() -> str:
     return os.path.normpath(LIVE_VECTORS_PATH.replace("\\", os.sep))
 
 
-def _load_live_vectors_if_needed() -> Tuple[List[str], Dict[str, int], np.ndarray, np.ndarray]:
-    global LIVE_WORDS, LIVE_WORD_TO_INDEX, LIVE_MATRIX, LIVE_NORMS
+@dataclass(frozen=True)
+class LiveVectorStore:
+    """Незмінний знімок live-векторів; підміняється цілком при гарячому перезавантаженні."""
 
-    if (
-        LIVE_WORDS is not None
-        and LIVE_WORD_TO_INDEX is not None
-        and LIVE_MATRIX is not None
-        and LIVE_NORMS is not None
-    ):
-        return LIVE_WORDS, LIVE_WORD_TO_INDEX, LIVE_MATRIX, LIVE_NORMS
+    version: str
+    path: str
+    signature: Tuple[int, int]
+    words: List[str]
+    word_to_index: Dict[str, int]
+    matrix: np.ndarray
+    norms: np.ndarray
+
+
+def _live_vectors_file_signature(vectors_path: str) -> Tuple[int, int]:
+    stat = os.stat(vectors_path)
+    return stat.st_mtime_ns, stat.st_size
 
-    vectors_path = _resolve_live_vectors_path()
+
+def _read_live_vector_store(vectors_path: str) -> LiveVectorStore:
     if not os.path.isfile(vectors_path):
         raise FileNotFoundError(
             "Файл live-векторів не знайдено. "
             f"Очікував: '{vectors_path}'."
         )
 
-    with np.load(vectors_path, allow_pickle=False) as payload:
+    signature = _live_vectors_file_signature(vectors_path)
+    with open(vectors_path, "rb") as f:
+        raw_bytes = f.read()
+    version = hashlib.sha256(raw_bytes).hexdigest()[:16]
+
+    with np.load(io.BytesIO(raw_bytes), allow_pickle=False) as payload:
         if "words" not in payload or "vectors" not in payload:
             raise ValueError("Файл live-векторів має містити масиви 'words' і 'vectors'.")
 
@@ -1343,9 +2710,15 @@ def _load_live_vectors_if_needed() -> Tuple[List[str], Dict[str, int], np.ndarra
     words = [str(w) for w in words_arr.tolist()]
     matrix = vectors_arr.astype(np.float32, copy=False)
 
+    if not words:
+        raise ValueError("Файл live-векторів не містить жодного слова.")
+
     if matrix.shape[0] != len(words):
         raise ValueError("Кількість слів у 'words' не збігається з кількістю рядків 'vectors'.")
 
+    if not np.isfinite(matrix).all():
+        raise ValueError("Масив 'vectors' містить NaN або нескінченні значення.")
+
     if norms_arr is None:
         norms = np.linalg.norm(matrix, axis=1).astype(np.float32)
     else:
@@ -1356,34 +2729,136 @@ def _load_live_vectors_if_needed() -> Tuple[List[str], Dict[str, int], np.ndarra
     norms = np.where(norms == 0.0, 1e-12, norms)
     word_to_index = {word: idx for idx, word in enumerate(words)}
 
-    LIVE_WORDS = words
-    LIVE_WORD_TO_INDEX = word_to_index
-    LIVE_MATRIX = matrix
-    LIVE_NORMS = norms
+    return LiveVectorStore(
+        version=version,
+        path=vectors_path,
+        signature=signature,
+        words=words,
+        word_to_index=word_to_index,
+        matrix=matrix,
+        norms=norms,
+    )
+
+
+def _install_live_vector_store(store: LiveVectorStore) -> None:
+    global LIVE_VECTOR_STORE
+
+    previous = LIVE_VECTOR_STORE
+    LIVE_VECTOR_STORE = store
+    with CUSTOM_RANKING_CACHE_LOCK:
+        stale_words = [
+            word
+            for word, (version, _) in CUSTOM_RANKING_CACHE.items()
+            if version != store.version
+        ]
+        for word in stale_words:
+            CUSTOM_RANKING_CACHE.pop(word, None)
 
     print(
-        f"[LIVE] Завантажено live-вектори: {len(words)} слів, "
-        f"розмірність={matrix.shape[1]}, файл='{vectors_path}'"
+        f"[LIVE] Завантажено live-вектори v{store.version}: {len(store.words)} слів, "
+        f"розмірність={store.matrix.shape[1]}, файл='{store.path}'"
+        + (f", замінено v{previous.version}" if previous is not None else "")
     )
-    return LIVE_WORDS, LIVE_WORD_TO_INDEX, LIVE_MATRIX, LIVE_NORMS
 
 
-def _build_live_ranking(target_word: str) -> List[Dict[str, Any]]:
-    words, word_to_index, matrix, norms = _load_live_vectors_if_needed()
-    vector_word = target_word
-    target_idx = word_to_index.get(vector_word)
-    if target_idx is None:
-        fallback_word = _normalize_word(LIVE_VECTOR_WORD_FALLBACKS.get(target_word, ""))
-        if fallback_word:
-            fallback_idx = word_to_index.get(fallback_word)
-            if fallback_idx is not None:
-                vector_word = fallback_word
-                target_idx = fallback_idx
-                print(f"[LIVE] Fallback vector for '{target_word}' -> '{vector_word}'")
+def _reload_live_vectors_in_background(vectors_path: str, signature: Tuple[int, int]) -> None:
+    global LIVE_VECTOR_STORE, LIVE_VECTORS_RELOAD_IN_PROGRESS, LIVE_VECTORS_REJECTED_SIGNATURE
+
+    try:
+        current = LIVE_VECTOR_STORE
+        store = _read_live_vector_store(vectors_path)
+        if current is not None and store.version == current.version:
+            # Файл лише "торкнули" — вміст той самий, міняємо тільки сигнатуру.
+            store = LiveVectorStore(
+                version=current.version,
+                path=current.path,
+                signature=store.signature,
+                words=current.words,
+                word_to_index=current.word_to_index,
+                matrix=current.matrix,
+                norms=current.norms,
+            )
+            with LIVE_VECTOR_STORE_LOCK:
+                LIVE_VECTOR_STORE = store
+            return
+
+        if current is not None and store.matrix.shape[1] != current.matrix.shape[1]:
+            print(
+                f"[LIVE] Увага: нова розмірність векторів {store.matrix.shape[1]} "
+                f"замість {current.matrix.shape[1]}."
+            )
+        with LIVE_VECTOR_STORE_LOCK:
+            _install_live_vector_store(store)
+    except Exception as exc:
+        LIVE_VECTORS_REJECTED_SIGNATURE = signature
+        print(f"[LIVE] Новий файл live-векторів відхилено, лишаю поточну версію: {exc}")
+    finally:
+        LIVE_VECTORS_RELOAD_IN_PROGRESS = False
+
+
+def _maybe_schedule_live_vectors_reload(store: LiveVectorStore) -> None:
+    """Раз на LIVE_VECTORS_RELOAD_CHECK_SECONDS перевіряє mtime/розмір файлу і перечитує його у фоні."""
+    global LIVE_VECTORS_LAST_CHECK_AT, LIVE_VECTORS_RELOAD_IN_PROGRESS
+
+    now = time.time()
+    if LIVE_VECTORS_RELOAD_IN_PROGRESS or (now - LIVE_VECTORS_LAST_CHECK_AT) < LIVE_VECTORS_RELOAD_CHECK_SECONDS:
+        return
+    LIVE_VECTORS_LAST_CHECK_AT = now
+
+    try:
+        signature = _live_vectors_file_signature(store.path)
+    except OSError:
+        return
+
+    if signature == store.signature or signature == LIVE_VECTORS_REJECTED_SIGNATURE:
+        return
+
+    with LIVE_VECTOR_STORE_LOCK:
+        if LIVE_VECTORS_RELOAD_IN_PROGRESS:
+            return
+        LIVE_VECTORS_RELOAD_IN_PROGRESS = True
 
-    if target_idx is None:
-        raise ValueError(f"Слово '{target_word}' відсутнє у live-векторах.")
+    threading.Thread(
+        target=_reload_live_vectors_in_background,
+        args=(store.path, signature),
+        name="live-vectors-reload",
+        daemon=True,
+    ).start()
 
+
+def _get_live_vector_store() -> LiveVectorStore:
+    store = LIVE_VECTOR_STORE
+    if store is not None:
+        _maybe_schedule_live_vectors_reload(store)
+        return store
+
+    with LIVE_VECTOR_STORE_LOCK:
+        if LIVE_VECTOR_STORE is None:
+            _install_live_vector_store(_read_live_vector_store(_resolve_live_vectors_path()))
+        return LIVE_VECTOR_STORE
+
+
+LIVE_RANKING_DISK_DTYPE = np.dtype([("index", "<i4"), ("similarity", "<f4")])
+
+
+def _resolve_live_vector_index(target_word: str, store: LiveVectorStore) -> Tuple[int, str]:
+    target_idx = store.word_to_index.get(target_word)
+    if target_idx is not None:
+        return target_idx, target_word
+
+    fallback_word = _normalize_word(LIVE_VECTOR_WORD_FALLBACKS.get(target_word, ""))
+    if fallback_word:
+        fallback_idx = store.word_to_index.get(fallback_word)
+        if fallback_idx is not None:
+            print(f"[LIVE] Fallback vector for '{target_word}' -> '{fallback_word}'")
+            return fallback_idx, fallback_word
+
+    raise ValueError(f"Слово '{target_word}' відсутнє у live-векторах.")
+
+
+def _compute_live_ranking_arrays(target_idx: int, store: LiveVectorStore) -> np.ndarray:
+    """Порядок слів і схожості, відсортовані за спаданням, у форматі LIVE_RANKING_DISK_DTYPE."""
+    matrix, norms = store.matrix, store.norms
     target_vector = matrix[target_idx]
     target_norm = float(norms[target_idx])
     if target_norm == 0.0:
@@ -1391,6 +2866,26 @@ def _build_live_ranking(target_word: str) -> List[Dict[str, Any]]:
     similarities = (matrix @ target_vector) / (norms * target_norm)
     order = np.argsort(similarities)[::-1]
 
+    arrays = np.empty(len(order), dtype=LIVE_RANKING_DISK_DTYPE)
+    arrays["index"] = order
+    arrays["similarity"] = similarities[order]
+    return arrays
+
+
+def _live_ranking_from_arrays(
+    target_word: str,
+    vector_word: str,
+    target_idx: int,
+    arrays: np.ndarray,
+    store: LiveVectorStore,
+) -> List[Dict[str, Any]]:
+    words = store.words
+    # tolist() один раз швидше, ніж numpy-скаляри на кожен запис.
+    order = arrays["index"].tolist()
+    similarities = arrays["similarity"].astype(np.float64)
+    if JSON_FLOAT_PRECISION > 0:
+        similarities = np.round(similarities, JSON_FLOAT_PRECISION)
+    similarities = similarities.tolist()
     ranking = [
         {
             "word": (
@@ -1398,10 +2893,10 @@ def _build_live_ranking(target_word: str) -> List[Dict[str, Any]]:
                 if idx == target_idx and target_word != vector_word
                 else words[idx]
             ),
-            "similarity": float(similarities[idx]),
+            "similarity": similarity,
             "rank": rank,
         }
-        for rank, idx in enumerate(order, start=1)
+        for rank, (idx, similarity) in enumerate(zip(order, similarities), start=1)
     ]
     if target_word == "павлін":
         # Product exception: keep "павлін" as secret word (#1), and force
@@ -1418,19 +2913,429 @@ def _build_live_ranking(target_word: str) -> List[Dict[str, Any]]:
     return ranking
 
 
-def _get_live_ranking_cached(target_word: str) -> List[Dict[str, Any]]:
-    cached = CUSTOM_RANKING_CACHE.get(target_word)
-    if cached is not None:
-        CUSTOM_RANKING_CACHE.move_to_end(target_word)
-        return cached
+def _build_live_ranking(target_word: str, store: Optional[LiveVectorStore] = None) -> List[Dict[str, Any]]:
+    store = store or _get_live_vector_store()
+    target_idx, vector_word = _resolve_live_vector_index(target_word, store)
+    arrays = _compute_live_ranking_arrays(target_idx, store)
+    return _live_ranking_from_arrays(target_word, vector_word, target_idx, arrays, store)
+
+
+def _live_ranking_disk_path(version: str, vector_word: str) -> str:
+    word_key = hashlib.sha256(vector_word.encode("utf-8")).hexdigest()[:32]
+    return os.path.join(LIVE_RANKING_DISK_CACHE_DIR, version, f"{word_key}.npy")
+
+
+def _load_live_ranking_arrays_from_disk(path: str, expected_length: int) -> Optional[np.ndarray]:
+    try:
+        arrays = np.load(path, mmap_mode="r", allow_pickle=False)
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        print(f"[LIVE] Пошкоджений файл кешу рейтингу '{path}': {e}")
+        _remove_file_quietly(path)
+        return None
+
+    if arrays.dtype != LIVE_RANKING_DISK_DTYPE or arrays.shape != (expected_length,):
+        print(f"[LIVE] Файл кешу рейтингу '{path}' не відповідає векторам, видаляю.")
+        _remove_file_quietly(path)
+        return None
+
+    # mtime — час останнього використання для LRU-витіснення; оновлюємо не частіше раза на хвилину.
+    try:
+        if time.time() - os.path.getmtime(path) > 60:
+            os.utime(path)
+    except OSError:
+        pass
+    return arrays
+
+
+def _save_live_ranking_arrays_to_disk(path: str, arrays: np.ndarray) -> None:
+    directory = os.path.dirname(path)
+    try:
+        os.makedirs(directory, exist_ok=True)
+        # Пишемо в тимчасовий файл і підміняємо атомарно: інші воркери не побачать половину файлу.
+        fd, temp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                np.save(f, arrays, allow_pickle=False)
+            os.replace(temp_path, path)
+        except BaseException:
+            _remove_file_quietly(temp_path)
+            raise
+    except OSError as e:
+        print(f"[LIVE] Не вдалося записати кеш рейтингу '{path}': {e}")
+        return
+
+    _evict_live_ranking_disk_cache()
+
+
+def _remove_file_quietly(path: str) -> None:
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
 
-    ranking = _build_live_ranking(target_word)
-    CUSTOM_RANKING_CACHE[target_word] = ranking
-    if len(CUSTOM_RANKING_CACHE) > CUSTOM_RANKING_CACHE_SIZE:
-        CUSTOM_RANKING_CACHE.popitem(last=False)
+def _evict_live_ranking_disk_cache() -> None:
+    """Тримає каталог кешу в межах LIVE_RANKING_DISK_CACHE_MAX_MB, видаляючи найдавніше використані файли.
+
+    Файли інших версій векторів вже ніхто не читає, тож вони йдуть першими.
+    """
+    if not LIVE_RANKING_DISK_CACHE_EVICT_LOCK.acquire(blocking=False):
+        return
+    try:
+        current_version = LIVE_VECTOR_STORE.version if LIVE_VECTOR_STORE is not None else ""
+        entries: List[Tuple[bool, float, int, str]] = []
+        total_bytes = 0
+        with os.scandir(LIVE_RANKING_DISK_CACHE_DIR) as version_dirs:
+            for version_dir in version_dirs:
+                if not version_dir.is_dir():
+                    continue
+                with os.scandir(version_dir.path) as files:
+                    for entry in files:
+                        try:
+                            stat = entry.stat()
+                        except OSError:
+                            continue
+                        total_bytes += stat.st_size
+                        entries.append((version_dir.name == current_version, stat.st_mtime, stat.st_size, entry.path))
+
+        limit_bytes = LIVE_RANKING_DISK_CACHE_MAX_MB * 1024 * 1024
+        if total_bytes <= limit_bytes:
+            return
+        entries.sort()
+        target_bytes = int(limit_bytes * 0.9)
+        for _, _, size, path in entries:
+            if total_bytes <= target_bytes:
+                break
+            _remove_file_quietly(path)
+            total_bytes -= size
+
+        for version_dir in os.scandir(LIVE_RANKING_DISK_CACHE_DIR):
+            if version_dir.is_dir() and version_dir.name != current_version:
+                try:
+                    os.rmdir(version_dir.path)
+                except OSError:
+                    pass
+    except OSError as e:
+        print(f"[LIVE] Не вдалося прибрати кеш рейтингів: {e}")
+    finally:
+        LIVE_RANKING_DISK_CACHE_EVICT_LOCK.release()
+
+
+def _load_or_build_live_ranking(target_word: str, store: LiveVectorStore) -> List[Dict[str, Any]]:
+    """Рейтинг із дискового кешу (ключ — версія векторів і слово) або обчислений і збережений туди."""
+    target_idx, vector_word = _resolve_live_vector_index(target_word, store)
+    if LIVE_RANKING_DISK_CACHE_MAX_MB <= 0:
+        arrays = _compute_live_ranking_arrays(target_idx, store)
+        return _live_ranking_from_arrays(target_word, vector_word, target_idx, arrays, store)
+
+    path = _live_ranking_disk_path(store.version, vector_word)
+    arrays = _load_live_ranking_arrays_from_disk(path, len(store.words))
+    if arrays is None:
+        arrays = _compute_live_ranking_arrays(target_idx, store)
+        _save_live_ranking_arrays_to_disk(path, arrays)
+    return _live_ranking_from_arrays(target_word, vector_word, target_idx, arrays, store)
+
+
+class LiveRankingBusyError(RuntimeError):
+    """Пул live-рейтингів переповнений або не встиг вчасно; запит варто повторити пізніше."""
+
+    def __init__(self, message: str, retry_after: int) -> None:
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+def _pin_live_ranking_blas_threads() -> None:
+    """Обмежує BLAS-потоки процесу, щоб пул × воркери gunicorn не перевантажували ядра.
+
+    Ліміт OpenBLAS/MKL діє на весь процес, тож ставимо його один раз при створенні пулу.
+    """
+    global LIVE_RANKING_BLAS_LIMITER
+    if LIVE_RANKING_BLAS_THREADS <= 0:
+        return
+    try:
+        from threadpoolctl import threadpool_limits  # type: ignore
+    except ImportError:
+        print("[LIVE] threadpoolctl не встановлено (див. requirements.txt) — кількість BLAS-потоків не обмежено.")
+        return
+    LIVE_RANKING_BLAS_LIMITER = threadpool_limits(limits=LIVE_RANKING_BLAS_THREADS, user_api="blas")
+    print(f"[LIVE] BLAS-потоків на процес: {LIVE_RANKING_BLAS_THREADS}.")
+
+
+def _get_live_ranking_executor() -> ThreadPoolExecutor:
+    global LIVE_RANKING_EXECUTOR
+    with LIVE_RANKING_EXECUTOR_LOCK:
+        if LIVE_RANKING_EXECUTOR is None:
+            _pin_live_ranking_blas_threads()
+            LIVE_RANKING_EXECUTOR = ThreadPoolExecutor(
+                max_workers=LIVE_RANKING_POOL_SIZE,
+                thread_name_prefix="live-ranking",
+            )
+        return LIVE_RANKING_EXECUTOR
+
+
+def _run_live_ranking_task(target_word: str, store: LiveVectorStore) -> List[Dict[str, Any]]:
+    ranking = _load_or_build_live_ranking(target_word, store)
+    # Кладемо в кеш тут, а не в запиті: результат не пропаде, навіть якщо клієнт не дочекався.
+    with CUSTOM_RANKING_CACHE_LOCK:
+        if LIVE_VECTOR_STORE is None or LIVE_VECTOR_STORE.version == store.version:
+            CUSTOM_RANKING_CACHE[target_word] = (store.version, ranking)
+            CUSTOM_RANKING_CACHE.move_to_end(target_word)
+            if len(CUSTOM_RANKING_CACHE) > CUSTOM_RANKING_CACHE_SIZE:
+                CUSTOM_RANKING_CACHE.popitem(last=False)
     return ranking
 
 
+def _submit_live_ranking_build(target_word: str, store: LiveVectorStore) -> Future:
+    """Ставить побудову в пул; однакове слово ділить один Future, понад ліміт черги — LiveRankingBusyError."""
+    key = (store.version, target_word)
+    executor = _get_live_ranking_executor()
+    with LIVE_RANKING_EXECUTOR_LOCK:
+        future = LIVE_RANKING_INFLIGHT.get(key)
+        if future is not None:
+            return future
+        if len(LIVE_RANKING_INFLIGHT) >= LIVE_RANKING_POOL_SIZE + LIVE_RANKING_QUEUE_MAX:
+            raise LiveRankingBusyError(
+                "Сервер зараз будує багато рейтингів. Спробуйте за кілька секунд.",
+                LIVE_RANKING_RETRY_AFTER_SECONDS,
+            )
+        future = executor.submit(_run_live_ranking_task, target_word, store)
+        LIVE_RANKING_INFLIGHT[key] = future
+
+    def forget(done_future: Future) -> None:
+        with LIVE_RANKING_EXECUTOR_LOCK:
+            if LIVE_RANKING_INFLIGHT.get(key) is done_future:
+                del LIVE_RANKING_INFLIGHT[key]
+
+    future.add_done_callback(forget)
+    return future
+
+
+def _get_live_ranking_with_version(target_word: str) -> Tuple[List[Dict[str, Any]], str]:
+    """Live-рейтинг разом із версією векторів, з яких його побудовано (hot reload може статись посередині)."""
+    store = _get_live_vector_store()
+    with CUSTOM_RANKING_CACHE_LOCK:
+        cached = CUSTOM_RANKING_CACHE.get(target_word)
+        if cached is not None and cached[0] == store.version:
+            CUSTOM_RANKING_CACHE.move_to_end(target_word)
+            return cached[1], cached[0]
+
+    future = _submit_live_ranking_build(target_word, store)
+    try:
+        return future.result(timeout=LIVE_RANKING_TIMEOUT_SECONDS), store.version
+    except FutureTimeoutError:
+        raise LiveRankingBusyError(
+            "Рейтинг ще будується. Спробуйте за кілька секунд.",
+            LIVE_RANKING_RETRY_AFTER_SECONDS,
+        ) from None
+
+
+def _get_live_ranking_cached(target_word: str) -> List[Dict[str, Any]]:
+    return _get_live_ranking_with_version(target_word)[0]
+
+
+def _live_ranking_busy_response(error: LiveRankingBusyError):
+    response = jsonify({"error": str(error)})
+    response.status_code = 503
+    response.headers["Retry-After"] = str(error.retry_after)
+    response.headers["Cache-Control"] = "no-store"
+    return response
+
+
+def _iter_ranking_json(ranking: List[Dict[str, Any]], envelope: Optional[Dict[str, Any]]) -> Iterator[bytes]:
+    """JSON рейтингу шматками по RANKING_STREAM_CHUNK_ENTRIES записів.
+
+    Без envelope віддає сам список; з envelope — об'єкт із його полями та "ranking".
+    Кожен шматок кодується app.json, тож формат той самий, що й у jsonify.
+    """
+    if envelope is None:
+        prefix, suffix = b"[", b"]"
+    else:
+        head = app.json.dumps_bytes(envelope)
+        prefix = (head[:-1] + b"," if envelope else b"{") + b'"ranking":['
+        suffix = b"]}"
+
+    yield prefix
+    for start in range(0, len(ranking), RANKING_STREAM_CHUNK_ENTRIES):
+        body = app.json.dumps_bytes(ranking[start:start + RANKING_STREAM_CHUNK_ENTRIES]).strip()[1:-1]
+        yield (b"," + body) if start else body
+    yield suffix
+
+
+def _gzip_stream(chunks: Iterable[bytes]) -> Iterator[bytes]:
+    compressor = zlib.compressobj(RANKING_STREAM_GZIP_LEVEL, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    for chunk in chunks:
+        compressed = compressor.compress(chunk)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
+
+
+def _ranking_json_response(
+    ranking: List[Dict[str, Any]],
+    envelope: Optional[Dict[str, Any]] = None,
+    cache_control: str = "public, max-age=300",
+    etag: str = "",
+) -> Response:
+    """Потокова відповідь із рейтингом: без повного рядка тіла в пам'яті, chunked transfer."""
+    chunks = _iter_ranking_json(ranking, envelope)
+    response = Response(mimetype="application/json")
+    if _should_gzip_ranking_response():
+        response.response = _gzip_stream(chunks)
+        response.headers["Content-Encoding"] = "gzip"
+    else:
+        response.response = chunks
+    response.vary.add("Accept-Encoding")
+    response.headers["Cache-Control"] = cache_control
+    if etag:
+        response.set_etag(_ranking_representation_etag(etag))
+    return response
+
+
+def _should_gzip_ranking_response() -> bool:
+    return RANKING_STREAM_GZIP and request.accept_encodings["gzip"] > 0
+
+
+def _ranking_representation_etag(etag: str) -> str:
+    # Сильний ETag різний для стиснутого й нестиснутого тіла.
+    return f"{etag}-gz" if _should_gzip_ranking_response() else etag
+
+
+def _ranking_not_modified_response(etag: str, cache_control: str) -> Optional[Response]:
+    representation_etag = _ranking_representation_etag(etag)
+    if not request.if_none_match.contains(representation_etag):
+        return None
+    response = Response(status=304)
+    response.set_etag(representation_etag)
+    response.vary.add("Accept-Encoding")
+    response.headers["Cache-Control"] = cache_control
+    return response
+
+
+STATIC_RANKING_MANIFEST_NAME = "manifest.json"
+
+
+def _static_ranking_bodies(game_date: date, ranking: List[Dict[str, Any]]) -> Dict[str, bytes]:
+    """Тіла відповідей /api/ranked і /archive/<date> байт-у-байт, як їх віддає Flask."""
+    return {
+        "ranked": b"".join(_iter_ranking_json(ranking, None)),
+        "archive": b"".join(_iter_ranking_json(ranking, {"game_date": game_date.isoformat()})),
+    }
+
+
+def _static_ranking_relative_path(kind: str, body: bytes) -> str:
+    return f"{kind}/{hashlib.sha256(body).hexdigest()[:32]}.json"
+
+
+def _write_file_atomically(path: str, data: bytes) -> None:
+    directory = os.path.dirname(path)
+    os.makedirs(directory, exist_ok=True)
+    fd, temp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(temp_path, path)
+    except BaseException:
+        _remove_file_quietly(temp_path)
+        raise
+
+
+def _load_static_ranking_manifest(export_dir: str) -> Dict[str, Dict[str, str]]:
+    try:
+        with open(os.path.join(export_dir, STATIC_RANKING_MANIFEST_NAME), "r", encoding="utf-8") as f:
+            payload = json.load(f)
+    except FileNotFoundError:
+        return {}
+    games = payload.get("games") if isinstance(payload, dict) else None
+    if not isinstance(games, dict):
+        raise ValueError("manifest.json має містити об'єкт 'games'.")
+    return {
+        str(game_date): dict(entry)
+        for game_date, entry in games.items()
+        if isinstance(entry, dict)
+    }
+
+
+def _write_static_ranking_manifest(export_dir: str, games: Dict[str, Dict[str, str]]) -> None:
+    payload = {
+        "format": 1,
+        "generated_at": datetime.utcnow().isoformat() + "Z",
+        "games": dict(sorted(games.items())),
+    }
+    _write_file_atomically(
+        os.path.join(export_dir, STATIC_RANKING_MANIFEST_NAME),
+        json.dumps(payload, ensure_ascii=False, indent=1).encode("utf-8"),
+    )
+
+
+def _get_static_ranking_manifest() -> Dict[str, Dict[str, str]]:
+    """Маніфест експорту з пам'яті; файл перевіряється за mtime/size раз на RANKING_STATIC_MANIFEST_CHECK_SECONDS."""
+    global STATIC_RANKING_MANIFEST, STATIC_RANKING_MANIFEST_SIGNATURE, STATIC_RANKING_MANIFEST_CHECKED_AT
+
+    now = time.monotonic()
+    if now - STATIC_RANKING_MANIFEST_CHECKED_AT < RANKING_STATIC_MANIFEST_CHECK_SECONDS:
+        return STATIC_RANKING_MANIFEST
+
+    with STATIC_RANKING_MANIFEST_LOCK:
+        if now - STATIC_RANKING_MANIFEST_CHECKED_AT < RANKING_STATIC_MANIFEST_CHECK_SECONDS:
+            return STATIC_RANKING_MANIFEST
+        STATIC_RANKING_MANIFEST_CHECKED_AT = now
+        manifest_path = os.path.join(RANKING_STATIC_EXPORT_DIR, STATIC_RANKING_MANIFEST_NAME)
+        try:
+            stat = os.stat(manifest_path)
+            signature = (stat.st_mtime_ns, stat.st_size)
+        except FileNotFoundError:
+            STATIC_RANKING_MANIFEST, STATIC_RANKING_MANIFEST_SIGNATURE = {}, None
+            return STATIC_RANKING_MANIFEST
+        if signature != STATIC_RANKING_MANIFEST_SIGNATURE:
+            try:
+                STATIC_RANKING_MANIFEST = _load_static_ranking_manifest(RANKING_STATIC_EXPORT_DIR)
+                print(f"[STATIC] Маніфест експорту: {len(STATIC_RANKING_MANIFEST)} ігор.")
+            except (OSError, ValueError) as e:
+                # Зламаний маніфест — все йде через Flask, як без експорту.
+                STATIC_RANKING_MANIFEST = {}
+                print(f"[STATIC] Не вдалося прочитати маніфест '{manifest_path}': {e}")
+            STATIC_RANKING_MANIFEST_SIGNATURE = signature
+        return STATIC_RANKING_MANIFEST
+
+
+def _static_ranking_redirect(target_date: date, kind: str) -> Optional[Response]:
+    """Порожня відповідь із X-Accel-Redirect на готовий файл; None — віддаємо з Flask як звичайно."""
+    if not RANKING_X_ACCEL_REDIRECT:
+        return None
+
+    entry = _get_static_ranking_manifest().get(target_date.isoformat())
+    relative_path = entry.get(kind) if entry else None
+    if not relative_path or not os.path.isfile(os.path.join(RANKING_STATIC_EXPORT_DIR, relative_path)):
+        return None
+
+    response = Response(mimetype="application/json")
+    response.headers["X-Accel-Redirect"] = RANKING_X_ACCEL_PREFIX + relative_path
+    response.headers["Cache-Control"] = "public, max-age=300"
+    return response
+
+
+def _drop_static_ranking_export(target_date: date) -> None:
+    """Прибирає дату з маніфесту, коли гру перезаписали в БД: старий файл більше не актуальний."""
+    global STATIC_RANKING_MANIFEST_CHECKED_AT
+
+    try:
+        games = _load_static_ranking_manifest(RANKING_STATIC_EXPORT_DIR)
+        if games.pop(target_date.isoformat(), None) is None:
+            return
+        _write_static_ranking_manifest(RANKING_STATIC_EXPORT_DIR, games)
+    except (OSError, ValueError) as e:
+        print(f"[STATIC] Не вдалося оновити маніфест для {target_date.isoformat()}: {e}")
+    STATIC_RANKING_MANIFEST_CHECKED_AT = 0.0
+
+
+def _live_ranking_etag(target_word: str, vectors_version: str) -> str:
+    """Тіло повністю визначається версією векторів, словом, версією алгоритму та форматом JSON."""
+    key = f"{LIVE_RANKING_ALGORITHM_VERSION}|{JSON_FLOAT_PRECISION}|{app.json.name}|{vectors_version}|{target_word}"
+    return hashlib.sha256(key.encode("utf-8")).hexdigest()[:32]
+
+
 def _is_dev_mode_available() -> bool:
     return DEV_MODE_ENABLED and bool(DEV_MODE_PASSWORD) and bool(DEV_MODE_PATH)
 
@@ -1551,10 +3456,15 @@ def _build_dev_archive_preview(game_date: date, raw_word: Any) -> Dict[str, Any]
     }
 
 
-def _upsert_archived_game_for_date(game_date: date, secret_word: str, ranking: List[Dict[str, Any]]) -> Dict[str, Any]:
+def _upsert_archived_game_for_date(
+    game_date: date,
+    secret_word: str,
+    ranking: List[Dict[str, Any]],
+    vectors_version: str,
+) -> Dict[str, Any]:
     row = ArchivedGame.query.filter_by(game_date=game_date).first()
     previous_secret_word = row.secret_word if row else None
-    payload = json.dumps(ranking, ensure_ascii=False)
+    payload = _encode_archive_ranking(secret_word, ranking, vectors_version)
 
     if row is None:
         row = ArchivedGame(
@@ -1570,7 +3480,9 @@ def _upsert_archived_game_for_date(game_date: date, secret_word: str, ranking: L
         save_action = "replaced"
 
     db.session.commit()
+    _stick_reads_to_primary("archive")
     _invalidate_archive_caches(game_date)
+    _drop_static_ranking_export(game_date)
 
     return {
         "save_action": save_action,
@@ -1602,7 +3514,7 @@ def _request_has_query_params() -> bool:
 
 
 def _archive_game_exists(game_date: date) -> bool:
-    if game_date in RANKING_CACHE:
+    if game_date in RANKING_CACHE or game_date in RANKING_LAST_GOOD:
         return True
 
     try:
@@ -1684,6 +3596,7 @@ def index():
         ads_enabled=_can_monetize_index_request(),
         noindex=_request_has_query_params(),
         initial_custom_game_id="",
+        archive_cache_version=_get_archive_cache_version(),
         canonical_url="https://slovozviaz.com/",
     )
 
@@ -1700,6 +3613,7 @@ def custom_game_page(game_id):
         ads_enabled=True,
         noindex=False,
         initial_custom_game_id=normalized_game_id,
+        archive_cache_version=_get_archive_cache_version(),
         canonical_url=f"https://slovozviaz.com/game/{normalized_game_id}",
     )
 
@@ -1824,6 +3738,7 @@ def twitch_connection_disconnect():
         connection.is_active = False
         connection.disconnected_at = datetime.utcnow()
         db.session.commit()
+        _invalidate_twitch_worker_connections_memo()
     except Exception as exc:
         db.session.rollback()
         print(f"[TWITCH OAUTH] Disconnect failed for {connection.twitch_login}: {exc}")
@@ -1860,6 +3775,26 @@ def twitch_worker_channels():
     return response
 
 
+@app.route("/api/twitch-worker/vocabulary")
+def twitch_worker_vocabulary():
+    if not _is_twitch_chat_bridge_enabled():
+        return jsonify({"error": "Twitch worker не налаштований на сервері."}), 503
+
+    provided_secret = request.headers.get("X-Twitch-Bridge-Secret", "")
+    if not provided_secret or not hmac.compare_digest(provided_secret, TWITCH_CHAT_BRIDGE_SECRET):
+        return jsonify({"error": "Недійсний ключ Twitch worker."}), 401
+
+    snapshot = _get_twitch_guess_vocabulary_snapshot()
+    etag = snapshot["version"]
+    if request.if_none_match.contains(etag):
+        response = Response(status=304)
+    else:
+        response = jsonify(snapshot)
+    response.set_etag(etag)
+    response.headers["Cache-Control"] = "private, no-cache"
+    return response
+
+
 @app.route("/api/twitch-worker/connections")
 def twitch_worker_connections():
     if not _is_twitch_chat_bridge_enabled():
@@ -1869,60 +3804,63 @@ def twitch_worker_connections():
     if not provided_secret or not hmac.compare_digest(provided_secret, TWITCH_CHAT_BRIDGE_SECRET):
         return jsonify({"error": "Недійсний ключ Twitch worker."}), 401
 
+    _ensure_twitch_token_refresh_started()
+    # Воркер, розбуджений /changes, просить no-cache: зміна могла статися в іншому процесі.
+    bypass_memo = "no-cache" in (request.headers.get("Cache-Control") or "").lower()
     try:
-        rows = _run_db_query_with_retry(_load_worker_active_twitch_connections)
+        etag, payload = _get_twitch_worker_connections_snapshot(bypass_memo)
     except (OperationalError, InterfaceError):
         return jsonify({"error": "Тимчасова помилка читання Twitch-підключень."}), 503
     except Exception as exc:
         print(f"[TWITCH WORKER] Failed to load connections: {exc}")
         return jsonify({"error": "Не вдалося прочитати Twitch-підключення."}), 500
 
-    active_connections: List[Dict[str, Any]] = []
-    skipped_connections: List[Dict[str, Any]] = []
+    if request.if_none_match.contains(etag):
+        response = Response(status=304)
+    else:
+        response = jsonify(payload)
+    response.set_etag(etag)
+    response.headers["Cache-Control"] = "private, no-store"
+    return response
 
-    for connection, active_target in rows:
-        missing_scopes = _twitch_connection_missing_required_scopes(connection)
-        if missing_scopes:
-            skipped_connections.append({
-                "twitch_login": connection.twitch_login,
-                "twitch_user_id": connection.twitch_user_id,
-                "reason": "missing_scopes",
-                "missing_scopes": missing_scopes,
-            })
-            continue
 
-        try:
-            refreshed_connection = _run_db_query_with_retry(
-                lambda connection_id=connection.id: _refresh_twitch_connection_if_needed(
-                    TwitchConnection.query.get(connection_id)
-                )
-            )
-        except Exception as exc:
-            skipped_connections.append({
-                "twitch_login": connection.twitch_login,
-                "twitch_user_id": connection.twitch_user_id,
-                "reason": "token_refresh_failed",
-                "error": str(exc),
-            })
-            print(f"[TWITCH WORKER] Failed to refresh token for {connection.twitch_login}: {exc}")
-            continue
+@app.route("/api/twitch-worker/connections/changes")
+def twitch_worker_connections_changes():
+    """Long-poll: тримає запит, доки не зміниться відбиток підключень, або до таймауту."""
+    if not _is_twitch_chat_bridge_enabled():
+        return jsonify({"error": "Twitch worker не налаштований на сервері."}), 503
 
-        active_connections.append({
-            "connection_id": refreshed_connection.id,
-            "twitch_user_id": refreshed_connection.twitch_user_id,
-            "twitch_login": refreshed_connection.twitch_login,
-            "twitch_display_name": refreshed_connection.twitch_display_name,
-            "access_token": refreshed_connection.access_token,
-            "token_scopes": _twitch_connection_scope_values(refreshed_connection),
-            "game_scope": active_target.game_scope,
-            "page_url": active_target.page_url or None,
-        })
+    provided_secret = request.headers.get("X-Twitch-Bridge-Secret", "")
+    if not provided_secret or not hmac.compare_digest(provided_secret, TWITCH_CHAT_BRIDGE_SECRET):
+        return jsonify({"error": "Недійсний ключ Twitch worker."}), 401
+
+    since = (request.args.get("since") or "").strip()
+    try:
+        wait_seconds = int(request.args.get("timeout", str(TWITCH_WORKER_CHANGES_MAX_WAIT_SECONDS)))
+    except ValueError:
+        return jsonify({"error": "Параметр timeout має бути цілим числом."}), 400
+    wait_seconds = max(0, min(wait_seconds, TWITCH_WORKER_CHANGES_MAX_WAIT_SECONDS))
+
+    deadline = time.monotonic() + wait_seconds
+    try:
+        version = _run_db_query_with_retry(_load_twitch_worker_connections_fingerprint)
+        while since and version == since:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            # Записи цього процесу будять одразу; записи інших процесів ловимо перевіркою раз на секунду.
+            with TWITCH_WORKER_CHANGES_CONDITION:
+                TWITCH_WORKER_CHANGES_CONDITION.wait(min(1.0, remaining))
+            version = _run_db_query_with_retry(_load_twitch_worker_connections_fingerprint)
+    except (OperationalError, InterfaceError):
+        return jsonify({"error": "Тимчасова помилка читання Twitch-підключень."}), 503
+    except Exception as exc:
+        print(f"[TWITCH WORKER] Failed to watch connections: {exc}")
+        return jsonify({"error": "Не вдалося прочитати Twitch-підключення."}), 500
 
     response = jsonify({
-        "connections": active_connections,
-        "count": len(active_connections),
-        "required_scopes": TWITCH_EVENTSUB_REQUIRED_SCOPES,
-        "skipped": skipped_connections,
+        "version": version,
+        "changed": bool(since) and version != since,
     })
     response.headers["Cache-Control"] = "private, no-store"
     return response
@@ -1946,6 +3884,7 @@ def dev_archive_game_page():
 @app.route("/api/ranked")
 def get_ranked():
     d = request.args.get("date")
+    cache_control = "public, max-age=300"
     if d:
         try:
             target = datetime.strptime(d, "%Y-%m-%d").date()
@@ -1954,24 +3893,32 @@ def get_ranked():
     else:
         # Базова "сьогоднішня" гра перемикається о 00:00 за Києвом
         target = _today_in_kyiv()
+        cache_control = _public_cache_control_until_midnight(300)
+    _get_archive_cache_version()
+
+    # 0) Готовий файл експорту віддає nginx
+    static_redirect = _static_ranking_redirect(target, "ranked")
+    if static_redirect is not None:
+        return static_redirect
 
     # 1) Кеш у пам'яті
     cached = RANKING_CACHE.get(target)
     if cached is not None:
-        response = jsonify(cached)
-        response.headers["Cache-Control"] = "public, max-age=300"
-        return response
+        return _ranking_json_response(cached, cache_control=cache_control)
 
     # 2) Перша спроба читання
     try:
         data = _run_db_query_with_retry(lambda: _load_ranking_from_db(target))
         if data is None:
             return jsonify({"error": f"Рейтинг для {target.isoformat()} не знайдено."}), 404
-        RANKING_CACHE[target] = data
-        response = jsonify(data)
-        response.headers["Cache-Control"] = "public, max-age=300"
-        return response
+        _cache_ranking(target, data)
+        return _ranking_json_response(data, cache_control=cache_control)
+    except LiveRankingBusyError as e:
+        return _live_ranking_busy_response(e)
     except (OperationalError, InterfaceError):
+        stale = _get_stale_ranking(target)
+        if stale is not None:
+            return _ranking_json_response(stale, cache_control="public, max-age=30")
         return jsonify({"error": "Тимчасова помилка підключення до бази. Спробуйте ще раз."}), 503
 
     except Exception:
@@ -2009,8 +3956,18 @@ def ranked_by_word():
     if target_word not in VALID_WORDS:
         return jsonify({"error": "Цього слова немає у словнику гри."}), 400
 
+    # Слово в URL — загадане слово, тож лише приватний кеш браузера з ревалідацією.
+    cache_control = "private, no-cache"
     try:
-        ranking = _get_live_ranking_cached(target_word)
+        etag = _live_ranking_etag(target_word, _get_live_vector_store().version)
+        not_modified = _ranking_not_modified_response(etag, cache_control)
+        if not_modified is not None:
+            return not_modified
+        ranking, vectors_version = _get_live_ranking_with_version(target_word)
+        # ETag — від векторів, що справді дали це тіло, а не від тих, що були до побудови.
+        etag = _live_ranking_etag(target_word, vectors_version)
+    except LiveRankingBusyError as e:
+        return _live_ranking_busy_response(e)
     except FileNotFoundError as e:
         return jsonify({"error": str(e)}), 503
     except ValueError as e:
@@ -2020,13 +3977,12 @@ def ranked_by_word():
         return jsonify({"error": "Не вдалося згенерувати live-рейтинг."}), 500
 
     game_id = _custom_game_id_for_word(target_word)
-    response = jsonify({
-        "mode": "custom",
-        "game_id": game_id,
-        "ranking": ranking,
-    })
-    response.headers["Cache-Control"] = "private, no-store"
-    return response
+    return _ranking_json_response(
+        ranking,
+        {"game_id": game_id, "mode": "custom"},
+        cache_control=cache_control,
+        etag=etag,
+    )
 
 
 @app.route("/api/ranked-by-game")
@@ -2046,8 +4002,17 @@ def ranked_by_game():
     if not target_word:
         return jsonify({"error": "Гру за цим посиланням не знайдено."}), 404
 
+    # id гри не розкриває слово, тож відповідь можна кешувати спільно (nginx, CDN).
+    cache_control = f"public, max-age={LIVE_RANKING_PUBLIC_MAX_AGE_SECONDS}"
     try:
-        ranking = _get_live_ranking_cached(target_word)
+        etag = _live_ranking_etag(target_word, _get_live_vector_store().version)
+        not_modified = _ranking_not_modified_response(etag, cache_control)
+        if not_modified is not None:
+            return not_modified
+        ranking, vectors_version = _get_live_ranking_with_version(target_word)
+        etag = _live_ranking_etag(target_word, vectors_version)
+    except LiveRankingBusyError as e:
+        return _live_ranking_busy_response(e)
     except FileNotFoundError as e:
         return jsonify({"error": str(e)}), 503
     except ValueError as e:
@@ -2056,13 +4021,12 @@ def ranked_by_game():
         print(f"[LIVE] Помилка генерації рейтингу для game_id '{game_id}': {e}")
         return jsonify({"error": "Не вдалося згенерувати live-рейтинг."}), 500
 
-    response = jsonify({
-        "mode": "custom",
-        "game_id": game_id,
-        "ranking": ranking,
-    })
-    response.headers["Cache-Control"] = "private, no-store"
-    return response
+    return _ranking_json_response(
+        ranking,
+        {"game_id": game_id, "mode": "custom"},
+        cache_control=cache_control,
+        etag=etag,
+    )
 
 
 @app.route("/api/twitch-chat/target", methods=["POST"])
@@ -2085,9 +4049,7 @@ def twitch_chat_target():
         row = _run_db_query_with_retry(
             lambda: _upsert_twitch_chat_active_target(channel, game_scope, page_url)
         )
-        latest_event_id = _run_db_query_with_retry(
-            lambda: _load_twitch_chat_latest_event_id(channel, game_scope)
-        )
+        latest_event_id = _get_twitch_chat_latest_event_id(channel, game_scope)
     except (OperationalError, InterfaceError):
         db.session.rollback()
         return jsonify({"error": "Тимчасова помилка збереження активної Twitch-гри."}), 503
@@ -2115,9 +4077,7 @@ def twitch_chat_status():
     game_scope = _normalize_twitch_game_scope(request.args.get("game_scope"))
 
     try:
-        latest_event_id = _run_db_query_with_retry(
-            lambda: _load_twitch_chat_latest_event_id(channel, game_scope)
-        )
+        latest_event_id = _get_twitch_chat_latest_event_id(channel, game_scope)
     except (OperationalError, InterfaceError):
         return jsonify({"error": "Тимчасова помилка підключення до Twitch-черги."}), 503
     except Exception as e:
@@ -2165,6 +4125,9 @@ def twitch_chat_events():
         print(f"[TWITCH CHAT] Помилка читання подій для channel='{channel}', scope='{game_scope}': {e}")
         return jsonify({"error": "Не вдалося прочитати Twitch-події."}), 500
 
+    if rows:
+        _note_twitch_chat_event_id(channel, game_scope, rows[-1].id)
+
     response = jsonify({
         "events": [_serialize_twitch_chat_event(row) for row in rows],
         "next_after_id": rows[-1].id if rows else after_id,
@@ -2173,6 +4136,59 @@ def twitch_chat_events():
     return response
 
 
+@app.route("/api/twitch-chat/guesses")
+def twitch_chat_guesses():
+    """Дельта різних слів гри для оверлеїв: нові слова та зміни лічильників після after_id."""
+    channel = _normalize_twitch_channel(request.args.get("channel"))
+    if not channel:
+        return jsonify({"error": "Передайте Twitch-канал у параметрі 'channel'."}), 400
+
+    try:
+        after_id = max(0, int(request.args.get("after_id", "0")))
+    except ValueError:
+        return jsonify({"error": "Параметр after_id має бути цілим числом."}), 400
+
+    try:
+        limit = int(request.args.get("limit", str(TWITCH_CHAT_GUESS_FEED_LIMIT)))
+    except ValueError:
+        return jsonify({"error": "Параметр limit має бути цілим числом."}), 400
+    limit = max(1, min(limit, TWITCH_CHAT_GUESS_FEED_MAX_LIMIT))
+
+    game_scope = _normalize_twitch_game_scope(request.args.get("game_scope"))
+    try:
+        if not game_scope:
+            game_scope = _run_db_query_with_retry(
+                lambda: _resolve_active_twitch_game_scope(channel)
+            ) or ""
+        instance_key = _resolve_twitch_game_instance_key(game_scope, None) if game_scope else ""
+        if not instance_key:
+            return jsonify({"error": "Для цього каналу немає активної гри."}), 404
+        aggregate = _get_twitch_chat_guess_aggregate(channel, instance_key)
+    except (OperationalError, InterfaceError):
+        return jsonify({"error": "Тимчасова помилка підключення до Twitch-черги."}), 503
+    except Exception as e:
+        print(f"[TWITCH CHAT] Помилка guesses для channel='{channel}', scope='{game_scope}': {e}")
+        return jsonify({"error": "Не вдалося прочитати здогадки Twitch-чату."}), 500
+
+    with aggregate.lock:
+        words, next_after_id, has_more = aggregate.changes_after(after_id, limit)
+        distinct_count = len(aggregate.entries)
+        guess_count = aggregate.guess_count
+
+    response = jsonify({
+        "channel": channel,
+        "game_scope": game_scope,
+        "instance_key": instance_key,
+        "words": words,
+        "next_after_id": next_after_id,
+        "has_more": has_more,
+        "distinct_count": distinct_count,
+        "guess_count": guess_count,
+    })
+    response.headers["Cache-Control"] = "private, no-store"
+    return response
+
+
 @app.route("/api/twitch-chat/solvers")
 def twitch_chat_solvers():
     channel = _normalize_twitch_channel(request.args.get("channel"))
@@ -2206,22 +4222,11 @@ def twitch_chat_solvers():
     return response
 
 
-@app.route("/api/twitch-chat/publish", methods=["POST"])
-def twitch_chat_publish():
-    if not _is_twitch_chat_bridge_enabled():
-        return jsonify({"error": "Twitch bridge не налаштований на сервері."}), 503
-
-    provided_secret = request.headers.get("X-Twitch-Bridge-Secret", "")
-    if not provided_secret or not hmac.compare_digest(provided_secret, TWITCH_CHAT_BRIDGE_SECRET):
-        return jsonify({"error": "Недійсний ключ Twitch bridge."}), 401
-
-    payload = request.get_json(silent=True)
-    if not isinstance(payload, dict):
-        return jsonify({"error": "Очікував JSON-об'єкт."}), 400
-
+def _publish_twitch_chat_payload(payload: Dict[str, Any]) -> Tuple[Dict[str, Any], int]:
+    """Зберігає одну здогадку з чату; повертає (тіло відповіді, HTTP-статус) без prune."""
     channel = _normalize_twitch_channel(payload.get("channel"))
     if not channel:
-        return jsonify({"error": "Передайте назву Twitch-каналу в полі 'channel'."}), 400
+        return {"error": "Передайте назву Twitch-каналу в полі 'channel'."}, 400
 
     game_scope = _normalize_twitch_game_scope(payload.get("game_scope"))
     if not game_scope:
@@ -2230,15 +4235,13 @@ def twitch_chat_publish():
                 lambda: _resolve_active_twitch_game_scope(channel)
             ) or ""
         except (OperationalError, InterfaceError):
-            return jsonify({"error": "Тимчасова помилка пошуку активної Twitch-гри."}), 503
+            return {"error": "Тимчасова помилка пошуку активної Twitch-гри."}, 503
         except Exception as e:
             print(f"[TWITCH CHAT] Помилка resolve active scope для channel='{channel}': {e}")
-            return jsonify({"error": "Не вдалося визначити активну гру для Twitch-каналу."}), 500
+            return {"error": "Не вдалося визначити активну гру для Twitch-каналу."}, 500
 
     if not game_scope:
-        response = jsonify({"accepted": False, "reason": "no_active_game"})
-        response.headers["Cache-Control"] = "private, no-store"
-        return response, 202
+        return {"accepted": False, "reason": "no_active_game"}, 202
 
     source_message_id = _normalize_twitch_text(
         payload.get("message_id"),
@@ -2247,9 +4250,7 @@ def twitch_chat_publish():
     )
     resolved_word = _resolve_twitch_guess_word(payload.get("word"))
     if not resolved_word:
-        response = jsonify({"accepted": False, "reason": "unknown_word"})
-        response.headers["Cache-Control"] = "private, no-store"
-        return response, 202
+        return {"accepted": False, "reason": "unknown_word"}, 202
 
     chatter_user_login = _normalize_twitch_channel(payload.get("user_login")) or "chat"
     chatter_display_name = _normalize_twitch_text(
@@ -2273,20 +4274,18 @@ def twitch_chat_publish():
                 )
             )
         except (OperationalError, InterfaceError):
-            return jsonify({"error": "Тимчасова помилка перевірки дубля Twitch-події."}), 503
+            return {"error": "Тимчасова помилка перевірки дубля Twitch-події."}, 503
         except Exception as e:
             print(f"[TWITCH CHAT] Помилка duplicate-check для payload={payload!r}: {e}")
-            return jsonify({"error": "Не вдалося перевірити дублікат Twitch-події."}), 500
+            return {"error": "Не вдалося перевірити дублікат Twitch-події."}, 500
 
         if existing_row is not None:
-            response = jsonify({
+            return {
                 "accepted": True,
                 "duplicate": True,
                 "event_id": existing_row.id,
                 "game_scope": existing_row.game_scope,
-            })
-            response.headers["Cache-Control"] = "private, no-store"
-            return response
+            }, 200
 
     row = TwitchChatEvent(
         channel=channel,
@@ -2299,31 +4298,77 @@ def twitch_chat_publish():
     )
 
     try:
-        db.session.add(row)
-        db.session.commit()
+        if TWITCH_CHAT_WRITE_BEHIND is not None:
+            TWITCH_CHAT_WRITE_BEHIND.append(row)
+            if TWITCH_CHAT_WRITE_BEHIND.durability == "sync":
+                TWITCH_CHAT_WRITE_BEHIND.wait_durable(row.id)
+        else:
+            db.session.add(row)
+            db.session.commit()
     except (OperationalError, InterfaceError):
         db.session.rollback()
-        return jsonify({"error": "Тимчасова помилка запису Twitch-події."}), 503
+        return {"error": "Тимчасова помилка запису Twitch-події."}, 503
     except Exception as e:
         db.session.rollback()
         print(f"[TWITCH CHAT] Помилка publish для payload={payload!r}: {e}")
-        return jsonify({"error": "Не вдалося зберегти Twitch-подію."}), 500
+        return {"error": "Не вдалося зберегти Twitch-подію."}, 500
 
-    try:
-        _prune_twitch_chat_events_if_needed()
-    except Exception as e:
-        db.session.rollback()
-        print(f"[TWITCH CHAT] Не вдалося почистити старі події: {e}")
+    _note_twitch_chat_event_id(channel, game_scope, row.id)
+    _stick_reads_to_primary(f"twitch:{channel}")
+    _fold_published_twitch_chat_event(row)
 
-    response = jsonify({
+    return {
         "accepted": True,
         "event_id": row.id,
         "word": resolved_word,
         "channel": channel,
         "game_scope": game_scope,
-    })
+    }, 200
+
+
+@app.route("/api/twitch-chat/publish", methods=["POST"])
+def twitch_chat_publish():
+    if not _is_twitch_chat_bridge_enabled():
+        return jsonify({"error": "Twitch bridge не налаштований на сервері."}), 503
+
+    provided_secret = request.headers.get("X-Twitch-Bridge-Secret", "")
+    if not provided_secret or not hmac.compare_digest(provided_secret, TWITCH_CHAT_BRIDGE_SECRET):
+        return jsonify({"error": "Недійсний ключ Twitch bridge."}), 401
+
+    payload = request.get_json(silent=True)
+    if not isinstance(payload, dict):
+        return jsonify({"error": "Очікував JSON-об'єкт."}), 400
+
+    # Пакетний режим: {"events": [{...}, ...]} — один HTTP-запит на кілька здогадок.
+    raw_events = payload.get("events")
+    if raw_events is not None:
+        if not isinstance(raw_events, list) or not raw_events:
+            return jsonify({"error": "Поле 'events' має бути непорожнім списком."}), 400
+        if len(raw_events) > TWITCH_CHAT_PUBLISH_BATCH_MAX:
+            return jsonify({
+                "error": f"Забагато подій у пакеті (максимум {TWITCH_CHAT_PUBLISH_BATCH_MAX})."
+            }), 413
+
+        results: List[Dict[str, Any]] = []
+        for raw_event in raw_events:
+            if isinstance(raw_event, dict):
+                result, status = _publish_twitch_chat_payload(raw_event)
+            else:
+                result, status = {"error": "Очікував JSON-об'єкт."}, 400
+            result["status"] = status
+            results.append(result)
+    else:
+        result, status = _publish_twitch_chat_payload(payload)
+
+    _ensure_twitch_chat_maintenance_started()
+
+    if raw_events is not None:
+        response = jsonify({"results": results})
+        status = 200
+    else:
+        response = jsonify(result)
     response.headers["Cache-Control"] = "private, no-store"
-    return response
+    return response, status
 
 
 def dev_login():
@@ -2368,6 +4413,8 @@ def dev_archive_game_preview():
         return jsonify({"error": str(e)}), 400
     except (OperationalError, InterfaceError):
         return jsonify({"error": "Тимчасова помилка підключення до бази. Спробуйте ще раз."}), 503
+    except LiveRankingBusyError as e:
+        return _live_ranking_busy_response(e)
     except FileNotFoundError as e:
         return jsonify({"error": str(e)}), 503
     except Exception as e:
@@ -2391,14 +4438,17 @@ def dev_archive_game_save():
     try:
         game_date = _parse_requested_game_date(payload.get("game_date"))
         preview = _build_dev_archive_preview(game_date, payload.get("word"))
-        ranking = _get_live_ranking_cached(preview["secret_word"])
-        save_result = _upsert_archived_game_for_date(game_date, preview["secret_word"], ranking)
+        ranking, vectors_version = _get_live_ranking_with_version(preview["secret_word"])
+        save_result = _upsert_archived_game_for_date(game_date, preview["secret_word"], ranking, vectors_version)
     except ValueError as e:
         db.session.rollback()
         return jsonify({"error": str(e)}), 400
     except (OperationalError, InterfaceError):
         db.session.rollback()
         return jsonify({"error": "Тимчасова помилка підключення до бази. Спробуйте ще раз."}), 503
+    except LiveRankingBusyError as e:
+        db.session.rollback()
+        return _live_ranking_busy_response(e)
     except FileNotFoundError as e:
         db.session.rollback()
         return jsonify({"error": str(e)}), 503
@@ -2414,18 +4464,38 @@ def dev_archive_game_save():
     response.headers["Cache-Control"] = "private, no-store"
     return response
 
+
+def dev_db_stats():
+    _require_dev_mode_enabled()
+    if not _has_dev_access():
+        return _dev_auth_required_response()
+
+    with DB_ACCESS_STATS_LOCK:
+        counters = dict(DB_ACCESS_STATS)
+    with RANKING_LAST_GOOD_LOCK:
+        stale_rankings = len(RANKING_LAST_GOOD)
+    response = jsonify({
+        "pid": os.getpid(),
+        "counters": counters,
+        "breaker": DB_CIRCUIT_BREAKER.snapshot(),
+        "stale_rankings": stale_rankings,
+    })
+    response.headers["Cache-Control"] = "private, no-store"
+    return response
+
 if DEV_MODE_PATH:
     app.add_url_rule(DEV_MODE_PATH, view_func=dev_archive_game_page, methods=["GET"])
     app.add_url_rule(f"{DEV_MODE_PATH}/login", view_func=dev_login, methods=["POST"])
     app.add_url_rule(f"{DEV_MODE_PATH}/logout", view_func=dev_logout, methods=["POST"])
     app.add_url_rule(f"{DEV_MODE_PATH}/preview", view_func=dev_archive_game_preview, methods=["POST"])
     app.add_url_rule(f"{DEV_MODE_PATH}/save", view_func=dev_archive_game_save, methods=["POST"])
+    app.add_url_rule(f"{DEV_MODE_PATH}/db-stats", view_func=dev_db_stats, methods=["GET"])
 
 @app.route("/api/daily-index")
 def daily_index():
     delta = (_today_in_kyiv() - BASE_DATE).days
     response = jsonify({"game_number": delta + 1})
-    response.headers["Cache-Control"] = "public, max-age=60"
+    response.headers["Cache-Control"] = _public_cache_control_until_midnight(60)
     return response
 
 @app.route("/archive")
@@ -2434,6 +4504,7 @@ def archive_list():
     Повертає ТІЛЬКИ список дат.
     ВАЖЛИВО: не вантажимо LONGTEXT ranking_json із MySQL.
     """
+    _get_archive_cache_version()
     try:
         dates = _get_archive_dates_cached()
         response = jsonify(dates)
@@ -2441,6 +4512,7 @@ def archive_list():
         return response
     except (OperationalError, InterfaceError):
         if ARCHIVE_DATES_CACHE is not None:
+            _count_db_event("stale_responses")
             response = jsonify(ARCHIVE_DATES_CACHE)
             response.headers["Cache-Control"] = "public, max-age=30"
             return response
@@ -2455,14 +4527,14 @@ def archive_by_date(game_date_str):
     except ValueError:
         return jsonify({"error": "Невірний формат дати. Використовуйте YYYY-MM-DD."}), 400
 
+    _get_archive_cache_version()
+    static_redirect = _static_ranking_redirect(d, "archive")
+    if static_redirect is not None:
+        return static_redirect
+
     cached = RANKING_CACHE.get(d)
     if cached is not None:
-        response = jsonify({
-            "game_date": d.isoformat(),
-            "ranking": cached
-        })
-        response.headers["Cache-Control"] = "public, max-age=300"
-        return response
+        return _ranking_json_response(cached, {"game_date": d.isoformat()})
 
     try:
         row = _run_db_query_with_retry(
@@ -2474,18 +4546,17 @@ def archive_by_date(game_date_str):
         if not row:
             return jsonify({"error": f"Гру для {game_date_str} не знайдено."}), 404
     except (OperationalError, InterfaceError):
+        stale = _get_stale_ranking(d)
+        if stale is not None:
+            return _ranking_json_response(stale, {"game_date": d.isoformat()}, cache_control="public, max-age=30")
         return jsonify({"error": "Тимчасова помилка підключення до бази. Спробуйте ще раз."}), 503
 
     try:
-        ranking = json.loads(row.ranking_json)
-        if not isinstance(ranking, list):
-            raise ValueError("Ranking data is not a list")
-        response = jsonify({
-            "game_date": row.game_date.isoformat(),
-            "ranking": ranking
-        })
-        response.headers["Cache-Control"] = "public, max-age=300"
-        return response
+        ranking = _parse_ranking_json(row.ranking_json)
+        _remember_last_good_ranking(d, ranking)
+        return _ranking_json_response(ranking, {"game_date": row.game_date.isoformat()})
+    except LiveRankingBusyError as e:
+        return _live_ranking_busy_response(e)
     except Exception as e:
         print(f"Помилка даних для гри {game_date_str}: {e}")
         return jsonify({"error": "Помилка даних для цієї гри."}), 500
@@ -0,0 +1,643 @@
+#!/usr/bin/env python3
+"""Offline latency benchmarks for the Slovozviaz request hot paths.
+
+The suite builds a throwaway SQLite database and a synthetic live-vector file
+for the real wordlist, imports the Flask app against them and times the hot
+paths the way pytest-benchmark would (warmup, N rounds, min/median/mean/stddev).
+Every case also checks the ranking it produced, so a "fast but wrong" change
+fails the run as well.
+
+Usage:
+  python benchmark_hot_paths.py --output bench/latest.json
+  python benchmark_hot_paths.py --baseline bench/baseline.json --max-regression 0.25
+  python benchmark_hot_paths.py --only irc --irc-log recorded_raid.log
+
+Exit code is 1 when an integrity check fails or when a case's median is slower
+than the baseline median by more than --max-regression.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import platform
+import random
+import re
+import statistics
+import sys
+import tempfile
+import time
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+import numpy as np
+
+
+BENCH_SECRET = "bench-secret"
+BENCH_CHANNEL = "bench_channel"
+DEFAULT_ROUNDS = 20
+DEFAULT_DIM = 300
+DEFAULT_GAMES = 14
+DEFAULT_EVENTS = 5000
+DEFAULT_MAX_REGRESSION = 0.25
+DEFAULT_MIN_DELTA_MS = 0.05
+DEFAULT_IRC_LINES = 20000
+IRC_CHUNK_SIZE = 4096
+LEGACY_PRIVMSG_RE = re.compile(
+    r"^(?:@(?P<tags>[^ ]+) )?:(?P<prefix>[^ ]+) PRIVMSG #(?P<channel>[^ ]+) :(?P<message>.*)$"
+)
+
+
+@dataclass
+class BenchCase:
+    name: str
+    run: Callable[[], Any]
+    setup: Optional[Callable[[], None]] = None
+    check: Optional[Callable[[Any], None]] = None
+    rounds: Optional[int] = None
+    items_per_round: int = 1
+
+
+@dataclass
+class BenchContext:
+    app_module: Any
+    client: Any
+    game_dates: List[date]
+    secret_words: Dict[date, str]
+    live_words: List[str]
+    lemma_probes: List[str]
+    irc_log: bytes = b""
+    extra: Dict[str, Any] = field(default_factory=dict)
+
+
+def _build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        description="Benchmark Slovozviaz hot paths against a synthetic SQLite DB and vector file."
+    )
+    parser.add_argument("--rounds", type=int, default=DEFAULT_ROUNDS, help=f"Rounds per case (default: {DEFAULT_ROUNDS}).")
+    parser.add_argument("--dim", type=int, default=DEFAULT_DIM, help=f"Synthetic vector dimension (default: {DEFAULT_DIM}).")
+    parser.add_argument("--games", type=int, default=DEFAULT_GAMES, help=f"Archived games to create (default: {DEFAULT_GAMES}).")
+    parser.add_argument("--events", type=int, default=DEFAULT_EVENTS, help=f"Twitch chat events to create (default: {DEFAULT_EVENTS}).")
+    parser.add_argument("--only", action="append", default=[], help="Run only cases whose name contains this text (repeatable).")
+    parser.add_argument("--workdir", type=Path, default=None, help="Where to put the synthetic DB/vectors (default: temp dir).")
+    parser.add_argument("--output", type=Path, default=None, help="Write results as JSON to this path.")
+    parser.add_argument("--baseline", type=Path, default=None, help="Compare medians with a previous --output file.")
+    parser.add_argument(
+        "--max-regression",
+        type=float,
+        default=DEFAULT_MAX_REGRESSION,
+        help=f"Allowed median slowdown vs baseline as a fraction (default: {DEFAULT_MAX_REGRESSION}).",
+    )
+    parser.add_argument(
+        "--min-delta-ms",
+        type=float,
+        default=DEFAULT_MIN_DELTA_MS,
+        help=f"Ignore slowdowns smaller than this many milliseconds (default: {DEFAULT_MIN_DELTA_MS}).",
+    )
+    parser.add_argument(
+        "--irc-log",
+        type=Path,
+        default=None,
+        help="Raw Twitch IRC capture (CRLF lines) for the IRC framing cases (default: synthetic raid).",
+    )
+    parser.add_argument(
+        "--irc-lines",
+        type=int,
+        default=DEFAULT_IRC_LINES,
+        help=f"Lines in the synthetic raid log (default: {DEFAULT_IRC_LINES}).",
+    )
+    parser.add_argument("--seed", type=int, default=1234, help="Random seed for synthetic data (default: 1234).")
+    return parser
+
+
+# ── Synthetic data ────────────────────────────────────────────────────────────
+def _write_synthetic_vectors(path: Path, words: List[str], dim: int, seed: int) -> None:
+    rng = np.random.default_rng(seed)
+    vectors = rng.standard_normal((len(words), dim), dtype=np.float32)
+    norms = np.linalg.norm(vectors, axis=1).astype(np.float32)
+    np.savez_compressed(
+        path,
+        words=np.asarray(words, dtype=np.str_),
+        vectors=vectors.astype(np.float16),
+        norms=norms,
+    )
+
+
+def _import_app(workdir: Path, dim: int, seed: int):
+    db_path = workdir / "bench_games.db"
+    vectors_path = workdir / "bench_vectors_fp16.npz"
+    for stale_path in (db_path, Path(f"{db_path}-wal"), Path(f"{db_path}-shm")):
+        if stale_path.exists():
+            stale_path.unlink()
+
+    os.environ["DATABASE_URL"] = f"sqlite:///{db_path}"
+    os.environ["LIVE_VECTORS_PATH"] = str(vectors_path)
+    os.environ["LIVE_RANKING_DISK_CACHE_DIR"] = str(workdir / "live_ranking_cache")
+    os.environ["ARCHIVE_CACHE_VERSION_PATH"] = str(workdir / "archive_cache_version")
+    os.environ["TWITCH_CHAT_BRIDGE_SECRET"] = BENCH_SECRET
+    os.environ.setdefault("CUSTOM_RANKING_CACHE_SIZE", "2")
+
+    import app as app_module  # noqa: E402  (env must be set before import)
+
+    if not app_module.VALID_WORDS_SORTED:
+        raise SystemExit("data/wordlist.txt is empty or missing; run from the repository root.")
+
+    _write_synthetic_vectors(vectors_path, app_module.VALID_WORDS_SORTED, dim, seed)
+    app_module.app.testing = True
+    return app_module
+
+
+def _seed_archive(app_module, game_count: int) -> Dict[date, str]:
+    daily_words = [
+        word for word in (app_module._normalize_word(w) for w in app_module.DAILY_WORDS)
+        if word in app_module.VALID_WORDS
+    ]
+    if not daily_words:
+        daily_words = app_module.VALID_WORDS_SORTED[:game_count]
+
+    secret_words: Dict[date, str] = {}
+    with app_module.app.app_context():
+        for offset in range(game_count):
+            game_date = app_module.BASE_DATE + timedelta(days=offset)
+            secret_word = daily_words[offset % len(daily_words)]
+            ranking = app_module._build_live_ranking(secret_word)
+            app_module.db.session.add(
+                app_module.ArchivedGame(
+                    game_date=game_date,
+                    secret_word=secret_word,
+                    ranking_json=json.dumps(ranking, ensure_ascii=False),
+                )
+            )
+            secret_words[game_date] = secret_word
+        app_module.db.session.commit()
+    return secret_words
+
+
+def _seed_twitch_events(app_module, secret_words: Dict[date, str], event_count: int, seed: int) -> None:
+    rng = np.random.default_rng(seed)
+    words = app_module.VALID_WORDS_SORTED
+    game_dates = sorted(secret_words)
+    now = datetime.utcnow()
+    rows: List[Dict[str, Any]] = []
+    for idx in range(event_count):
+        game_date = game_dates[idx % len(game_dates)]
+        chatter = f"chatter_{int(rng.integers(0, 400))}"
+        solved = rng.random() < 0.05
+        word = secret_words[game_date] if solved else words[int(rng.integers(0, len(words)))]
+        rows.append({
+            "channel": BENCH_CHANNEL,
+            "game_scope": f"date:{game_date.isoformat()}",
+            "source_message_id": f"seed-{idx}",
+            "chatter_user_login": chatter,
+            "chatter_display_name": chatter.title(),
+            "raw_message": f"!guess {word}",
+            "guessed_word": word,
+            "created_at": now - timedelta(seconds=event_count - idx),
+        })
+
+    with app_module.app.app_context():
+        app_module.db.session.execute(app_module.TwitchChatEvent.__table__.insert(), rows)
+        app_module.db.session.commit()
+
+
+def _build_lemma_probes(words: List[str], count: int = 200) -> List[str]:
+    step = max(1, len(words) // count)
+    probes: List[str] = []
+    for word in words[::step][:count]:
+        # Mix of exact dictionary words and inflected-looking forms.
+        probes.append(word)
+        probes.append(f"{word}ами")
+    return probes
+
+
+def _build_synthetic_raid_log(words: List[str], line_count: int, seed: int) -> bytes:
+    """Chat shaped like a raid: mostly emote spam and chatter, some !guess lines, JOINs and PINGs."""
+    rng = random.Random(seed)
+    spam = ["PogChamp PogChamp PogChamp", "KEKW", "raid hype!!! 🎉🎉🎉", "привіт чат", "LUL LUL", "що тут відбувається?"]
+    lines: List[bytes] = []
+    for idx in range(line_count):
+        roll = rng.random()
+        login = f"raider{rng.randrange(5000)}"
+        if roll < 0.01:
+            lines.append(b"PING :tmi.twitch.tv")
+            continue
+        if roll < 0.05:
+            lines.append(f":{login}!{login}@{login}.tmi.twitch.tv JOIN #{BENCH_CHANNEL}".encode("utf-8"))
+            continue
+        if roll < 0.25:
+            message = f"!guess {rng.choice(words)}"
+        elif roll < 0.30:
+            message = rng.choice(words)
+        else:
+            message = rng.choice(spam)
+        tags = (
+            f"@badge-info=;badges=;color=#1E90FF;display-name={login.capitalize()};emotes=;"
+            f"first-msg=0;flags=;id=msg-{idx:08d};mod=0;room-id=1;subscriber=0;"
+            f"tmi-sent-ts={1700000000000 + idx};turbo=0;user-id={idx};user-type="
+        )
+        lines.append(
+            f"{tags} :{login}!{login}@{login}.tmi.twitch.tv PRIVMSG #{BENCH_CHANNEL} :{message}".encode("utf-8")
+        )
+    return b"\r\n".join(lines) + b"\r\n"
+
+
+def _iter_chunks(raw: bytes, size: int = IRC_CHUNK_SIZE):
+    for offset in range(0, len(raw), size):
+        yield raw[offset:offset + size]
+
+
+def _legacy_irc_guesses(raw: bytes, bridge, command_prefix: str, chunk_size: int = IRC_CHUNK_SIZE) -> List[tuple]:
+    """The pre-IrcLineBuffer bridge loop: str buffer + split per line + regex + full tag parse.
+
+    Decoding each chunk on its own drops UTF-8 characters split across chunk
+    boundaries, so only a single-chunk run of this parser is a valid reference.
+    """
+    guesses: List[tuple] = []
+    buffer = ""
+    for chunk in _iter_chunks(raw, chunk_size):
+        buffer += chunk.decode("utf-8", errors="ignore")
+        while "\r\n" in buffer:
+            line, buffer = buffer.split("\r\n", 1)
+            if not line or line.startswith("PING "):
+                continue
+            match = LEGACY_PRIVMSG_RE.match(line)
+            if not match:
+                continue
+            tags: Dict[str, str] = {}
+            for item in (match.group("tags") or "").split(";"):
+                if "=" in item:
+                    key, value = item.split("=", 1)
+                    tags[key] = value
+            message = match.group("message").strip()
+            word = bridge.extract_guess_word(message, command_prefix, False, False)
+            if word:
+                login = match.group("prefix").split("!", 1)[0].strip().lower()
+                guesses.append((login, tags.get("display-name") or login, word, tags.get("id") or ""))
+    return guesses
+
+
+def _bridge_irc_guesses(raw: bytes, bridge, command_prefix: str) -> List[tuple]:
+    guesses: List[tuple] = []
+    line_buffer = bridge.IrcLineBuffer()
+    prefix_bytes = bridge.ascii_command_prefix(command_prefix)
+    for chunk in _iter_chunks(raw):
+        for line in line_buffer.feed(chunk):
+            privmsg = bridge.split_privmsg(line)
+            if privmsg is None:
+                continue
+            raw_tags, prefix, raw_message = privmsg
+            if not bridge.message_may_contain_guess(raw_message, prefix_bytes, False, False):
+                continue
+            message = raw_message.decode("utf-8", errors="ignore").strip()
+            word = bridge.extract_guess_word(message, command_prefix, False, False)
+            if word:
+                login = prefix.split(b"!", 1)[0].decode("utf-8", errors="ignore").strip().lower()
+                guesses.append((login, bridge.extract_tag(raw_tags, b"display-name") or login, word, bridge.extract_tag(raw_tags, b"id")))
+    return guesses
+
+
+# ── Integrity checks ──────────────────────────────────────────────────────────
+def check_ranking_integrity(ranking: Any, secret_word: Optional[str] = None) -> None:
+    if not isinstance(ranking, list) or not ranking:
+        raise AssertionError("ranking must be a non-empty list")
+
+    seen_words: set[str] = set()
+    previous_similarity = float("inf")
+    for expected_rank, entry in enumerate(ranking, start=1):
+        if entry.get("rank") != expected_rank:
+            raise AssertionError(f"rank gap at position {expected_rank}: {entry!r}")
+        word = entry.get("word")
+        if not isinstance(word, str) or not word or word in seen_words:
+            raise AssertionError(f"missing or duplicate word at rank {expected_rank}: {entry!r}")
+        seen_words.add(word)
+        similarity = float(entry.get("similarity"))
+        if similarity > previous_similarity + 1e-6:
+            raise AssertionError(f"similarity increases at rank {expected_rank}: {entry!r}")
+        previous_similarity = similarity
+
+    if secret_word is not None and ranking[0]["word"] != secret_word:
+        raise AssertionError(f"rank 1 is {ranking[0]['word']!r}, expected {secret_word!r}")
+
+
+def _get_buffered(client, url: str):
+    # Ranking responses are streamed; read the body inside the timed call so encoding is measured.
+    response = client.get(url)
+    response.get_data()
+    return response
+
+
+def _expect_status(response, status: int = 200):
+    if response.status_code != status:
+        raise AssertionError(f"HTTP {response.status_code}: {response.get_data(as_text=True)[:200]}")
+    return response
+
+
+# ── Cases ─────────────────────────────────────────────────────────────────────
+def build_cases(ctx: BenchContext) -> List[BenchCase]:
+    slovo = ctx.app_module
+    client = ctx.client
+    first_date = ctx.game_dates[0]
+    rotating_dates = list(ctx.game_dates)
+    custom_word = ctx.live_words[len(ctx.live_words) // 2]
+    publish_counter = {"value": 0}
+
+    def next_date() -> date:
+        rotating_dates.append(rotating_dates.pop(0))
+        return rotating_dates[0]
+
+    def clear_ranking_caches() -> None:
+        slovo._invalidate_archive_caches()
+
+    def get_ranked_cold():
+        target = next_date()
+        return target, _get_buffered(client, f"/api/ranked?date={target.isoformat()}")
+
+    def get_ranked_warm():
+        return first_date, _get_buffered(client, f"/api/ranked?date={first_date.isoformat()}")
+
+    def check_dated_ranking(result) -> None:
+        target, response = result
+        check_ranking_integrity(_expect_status(response).get_json(), ctx.secret_words[target])
+
+    def archive_by_date():
+        target = next_date()
+        return target, _get_buffered(client, f"/archive/{target.isoformat()}")
+
+    def check_archive(result) -> None:
+        target, response = result
+        payload = _expect_status(response).get_json()
+        if payload.get("game_date") != target.isoformat():
+            raise AssertionError(f"archive returned {payload.get('game_date')!r} for {target}")
+        check_ranking_integrity(payload.get("ranking"), ctx.secret_words[target])
+
+    json_provider = slovo.app.json
+    with slovo.app.app_context():
+        encode_source = slovo._load_ranking_from_db(first_date)
+
+    def encode_ranked_body(use_orjson: bool) -> bytes:
+        # Same chunked encoder /api/ranked streams, with the provider switched per case.
+        previous = json_provider.use_orjson
+        json_provider.use_orjson = use_orjson
+        try:
+            return b"".join(slovo._iter_ranking_json(encode_source, None))
+        finally:
+            json_provider.use_orjson = previous
+
+    def check_encoded_ranking(body: bytes) -> None:
+        if json.loads(body) != encode_source:
+            raise AssertionError("encoded ranking does not round-trip to the source list")
+
+    def build_live_ranking():
+        return slovo._build_live_ranking(custom_word)
+
+    def live_ranking_disk_hit():
+        # Memory tier dropped every round, so the ranking comes from the on-disk tier.
+        slovo.CUSTOM_RANKING_CACHE.clear()
+        return slovo._get_live_ranking_cached(custom_word)
+
+    def resolve_lemmas():
+        return [slovo._resolve_word_to_valid_lemma(word) for word in ctx.lemma_probes]
+
+    def check_lemmas(result) -> None:
+        for probe, resolved in zip(ctx.lemma_probes, result):
+            if probe in slovo.VALID_WORDS and resolved != probe:
+                raise AssertionError(f"dictionary word {probe!r} resolved to {resolved!r}")
+
+    def solver_leaderboard():
+        with slovo.app.app_context():
+            return slovo._load_twitch_chat_solver_leaderboard(BENCH_CHANNEL, 50)
+
+    def check_leaderboard(result) -> None:
+        counts = [item["solved_count"] for item in result]
+        if counts != sorted(counts, reverse=True):
+            raise AssertionError("solver leaderboard is not sorted by solved_count")
+
+    def twitch_publish():
+        publish_counter["value"] += 1
+        idx = publish_counter["value"]
+        word = ctx.live_words[idx % len(ctx.live_words)]
+        return client.post(
+            "/api/twitch-chat/publish",
+            json={
+                "channel": BENCH_CHANNEL,
+                "game_scope": f"date:{first_date.isoformat()}",
+                "user_login": f"publisher_{idx % 50}",
+                "user_name": f"Publisher{idx % 50}",
+                "message": f"!guess {word}",
+                "word": word,
+                "message_id": f"bench-publish-{time.time_ns()}-{idx}",
+            },
+            headers={"X-Twitch-Bridge-Secret": BENCH_SECRET},
+        )
+
+    def check_publish(response) -> None:
+        payload = _expect_status(response).get_json()
+        if not payload.get("accepted"):
+            raise AssertionError(f"publish was not accepted: {payload!r}")
+
+    import twitch_chat_bridge as bridge
+
+    irc_log = ctx.irc_log
+    irc_line_count = irc_log.count(b"\r\n")
+    expected_irc_guesses = _legacy_irc_guesses(irc_log, bridge, "!guess", chunk_size=max(1, len(irc_log)))
+
+    def check_irc_guesses(guesses) -> None:
+        if guesses != expected_irc_guesses:
+            raise AssertionError(
+                f"IRC framing produced {len(guesses)} guesses, legacy parser produced {len(expected_irc_guesses)}"
+            )
+
+    return [
+        BenchCase("get_ranked_cold", get_ranked_cold, setup=clear_ranking_caches, check=check_dated_ranking),
+        BenchCase("get_ranked_warm", get_ranked_warm, check=check_dated_ranking),
+        BenchCase("archive_by_date_cold", archive_by_date, setup=clear_ranking_caches, check=check_archive),
+        BenchCase(
+            "ranked_encode_stdlib",
+            lambda: encode_ranked_body(False),
+            check=check_encoded_ranking,
+            items_per_round=len(encode_source),
+        ),
+        *(
+            [BenchCase(
+                "ranked_encode_orjson",
+                lambda: encode_ranked_body(True),
+                check=check_encoded_ranking,
+                items_per_round=len(encode_source),
+            )]
+            if slovo.fast_json.orjson is not None
+            else []
+        ),
+        BenchCase(
+            "build_live_ranking",
+            build_live_ranking,
+            check=lambda ranking: check_ranking_integrity(ranking, custom_word),
+        ),
+        BenchCase(
+            "live_ranking_disk_hit",
+            live_ranking_disk_hit,
+            check=lambda ranking: check_ranking_integrity(ranking, custom_word),
+        ),
+        BenchCase(
+            "resolve_word_to_valid_lemma_cold",
+            resolve_lemmas,
+            setup=slovo._resolve_word_to_valid_lemma.cache_clear,
+            check=check_lemmas,
+            items_per_round=len(ctx.lemma_probes),
+        ),
+        BenchCase("twitch_solver_leaderboard", solver_leaderboard, check=check_leaderboard),
+        BenchCase("twitch_chat_publish", twitch_publish, check=check_publish),
+        BenchCase(
+            "irc_line_framing_legacy",
+            lambda: _legacy_irc_guesses(irc_log, bridge, "!guess"),
+            items_per_round=irc_line_count,
+        ),
+        BenchCase(
+            "irc_line_framing",
+            lambda: _bridge_irc_guesses(irc_log, bridge, "!guess"),
+            check=check_irc_guesses,
+            items_per_round=irc_line_count,
+        ),
+    ]
+
+
+# ── Runner ────────────────────────────────────────────────────────────────────
+def run_case(case: BenchCase, rounds: int) -> Dict[str, Any]:
+    if case.setup:
+        case.setup()
+    warmup_result = case.run()
+    if case.check:
+        case.check(warmup_result)
+
+    timings: List[float] = []
+    for _ in range(case.rounds or rounds):
+        if case.setup:
+            case.setup()
+        started_at = time.perf_counter()
+        result = case.run()
+        timings.append(time.perf_counter() - started_at)
+        if case.check:
+            case.check(result)
+
+    mean = statistics.fmean(timings)
+    return {
+        "rounds": len(timings),
+        "min_ms": min(timings) * 1000,
+        "max_ms": max(timings) * 1000,
+        "mean_ms": mean * 1000,
+        "median_ms": statistics.median(timings) * 1000,
+        "stddev_ms": (statistics.stdev(timings) if len(timings) > 1 else 0.0) * 1000,
+        "ops_per_second": (case.items_per_round / mean) if mean > 0 else None,
+        "items_per_round": case.items_per_round,
+    }
+
+
+def compare_with_baseline(
+    results: Dict[str, Dict[str, Any]],
+    baseline: Dict[str, Any],
+    max_regression: float,
+    min_delta_ms: float,
+) -> List[str]:
+    regressions: List[str] = []
+    baseline_results = baseline.get("results") or {}
+    for name, current in results.items():
+        previous = baseline_results.get(name)
+        if not isinstance(previous, dict) or not previous.get("median_ms"):
+            continue
+        previous_ms = float(previous["median_ms"])
+        current_ms = float(current["median_ms"])
+        limit_ms = previous_ms * (1 + max_regression)
+        if current_ms > limit_ms and (current_ms - previous_ms) > min_delta_ms:
+            regressions.append(
+                f"{name}: median {current_ms:.3f} ms vs baseline {previous_ms:.3f} ms "
+                f"(+{(current_ms / previous_ms - 1) * 100:.1f}%, limit +{max_regression * 100:.0f}%)"
+            )
+    return regressions
+
+
+def main() -> int:
+    args = _build_parser().parse_args()
+    rounds = max(1, args.rounds)
+
+    with tempfile.TemporaryDirectory(prefix="slovozviaz-bench-") as temp_dir:
+        workdir = args.workdir or Path(temp_dir)
+        workdir.mkdir(parents=True, exist_ok=True)
+
+        print(f"[BENCH] Workdir: {workdir}")
+        slovo = _import_app(workdir, args.dim, args.seed)
+        secret_words = _seed_archive(slovo, max(1, args.games))
+        _seed_twitch_events(slovo, secret_words, max(0, args.events), args.seed)
+        print(
+            f"[BENCH] Synthetic data: {len(slovo.VALID_WORDS_SORTED)} words, dim={args.dim}, "
+            f"games={len(secret_words)}, events={args.events}"
+        )
+
+        ctx = BenchContext(
+            app_module=slovo,
+            client=slovo.app.test_client(),
+            game_dates=sorted(secret_words),
+            secret_words=secret_words,
+            live_words=slovo.VALID_WORDS_SORTED,
+            lemma_probes=_build_lemma_probes(slovo.VALID_WORDS_SORTED),
+            irc_log=(
+                args.irc_log.read_bytes()
+                if args.irc_log
+                else _build_synthetic_raid_log(slovo.VALID_WORDS_SORTED, max(1, args.irc_lines), args.seed)
+            ),
+        )
+
+        results: Dict[str, Dict[str, Any]] = {}
+        failures: List[str] = []
+        for case in build_cases(ctx):
+            if args.only and not any(part in case.name for part in args.only):
+                continue
+            try:
+                stats = run_case(case, rounds)
+            except AssertionError as exc:
+                failures.append(f"{case.name}: integrity check failed: {exc}")
+                print(f"[BENCH] {case.name:<36} FAILED: {exc}")
+                continue
+            results[case.name] = stats
+            ops = stats["ops_per_second"]
+            print(
+                f"[BENCH] {case.name:<36} median={stats['median_ms']:9.3f} ms  "
+                f"min={stats['min_ms']:9.3f} ms  ops/s={ops:10.1f}"
+            )
+
+    report = {
+        "meta": {
+            "created_at": datetime.utcnow().isoformat() + "Z",
+            "python": sys.version.split()[0],
+            "numpy": np.__version__,
+            "platform": platform.platform(),
+            "rounds": rounds,
+            "dim": args.dim,
+            "games": args.games,
+            "events": args.events,
+            "irc_log": str(args.irc_log) if args.irc_log else f"synthetic:{args.irc_lines}",
+        },
+        "results": results,
+    }
+
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(json.dumps(report, ensure_ascii=False, indent=2) + "\n", encoding="utf-8")
+        print(f"[BENCH] Results: {args.output}")
+
+    if args.baseline:
+        baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+        regressions = compare_with_baseline(results, baseline, args.max_regression, args.min_delta_ms)
+        for line in regressions:
+            print(f"[BENCH] REGRESSION {line}")
+        failures.extend(regressions)
+
+    if failures:
+        print(f"[BENCH] {len(failures)} problem(s) found.")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
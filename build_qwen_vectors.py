@@ -1,7 +1,15 @@
 import argparse
+import hashlib
+import json
+import multiprocessing
 import os
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass
+from datetime import datetime
 from pathlib import Path
-from typing import List
+from typing import Dict, List, Optional, Tuple
 
 import numpy as np
 from sentence_transformers import SentenceTransformer
@@ -11,6 +19,7 @@ DEFAULT_MODEL_NAME = "Qwen/Qwen3-Embedding-0.6B"
 DEFAULT_CACHE_PATH = Path("models/sentence-transformers")
 DEFAULT_WORDLIST_PATH = Path("data/wordlist.txt")
 DEFAULT_OUTPUT_PATH = Path("data/word_vectors_qwen3_0_6b_wordlist_fp16.npz")
+DEFAULT_SHARD_SIZE = 2048
 DEFAULT_TEMPLATE = (
     "Instruct: Represent the meaning of this single Ukrainian word for "
     "semantic similarity search. Query: {word}"
@@ -26,6 +35,349 @@ def _normalize_path(path: Path) -> Path:
     return Path(os.path.normpath(str(path).replace("\\", os.sep)))
 
 
+def _text_hash(model_name: str, text: str) -> str:
+    return hashlib.sha256(f"{model_name}\n{text}".encode("utf-8")).hexdigest()[:32]
+
+
+def _file_sha256(path: Path) -> str:
+    digest = hashlib.sha256()
+    with path.open("rb") as f:
+        for block in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _manifest_path(output_path: Path) -> Path:
+    return output_path.with_name(f"{output_path.name}.manifest.json")
+
+
+@dataclass
+class ExistingVectors:
+    words: List[str]
+    vectors: np.ndarray
+    norms: np.ndarray
+    text_hashes: Optional[List[str]]
+    model: str
+    template: str
+
+
+def _load_existing_vectors(path: Path) -> Optional[ExistingVectors]:
+    if not path.is_file():
+        return None
+
+    with np.load(path, allow_pickle=False) as payload:
+        if "words" not in payload or "vectors" not in payload:
+            print(f"[QWEN] Existing file has no words/vectors; ignoring: {path}")
+            return None
+        words = [str(word) for word in payload["words"].tolist()]
+        vectors = payload["vectors"]
+        norms = (
+            payload["norms"].astype(np.float32)
+            if "norms" in payload
+            else np.linalg.norm(vectors.astype(np.float32), axis=1).astype(np.float32)
+        )
+        text_hashes = [str(item) for item in payload["text_hashes"].tolist()] if "text_hashes" in payload else None
+        model = str(payload["model"]) if "model" in payload else ""
+        template = str(payload["template"]) if "template" in payload else ""
+
+    if vectors.ndim != 2 or vectors.shape[0] != len(words) or norms.shape[0] != len(words):
+        print(f"[QWEN] Existing file is inconsistent; ignoring: {path}")
+        return None
+    if text_hashes is not None and len(text_hashes) != len(words):
+        text_hashes = None
+
+    return ExistingVectors(
+        words=words,
+        vectors=vectors,
+        norms=norms,
+        text_hashes=text_hashes,
+        model=model,
+        template=template,
+    )
+
+
+def _reusable_rows(
+    existing: Optional[ExistingVectors],
+    model_name: str,
+    template: str,
+    want_float32: bool,
+    text_hashes: Dict[str, str],
+) -> Dict[str, int]:
+    """Map word -> row in the existing file for vectors that can be kept as is."""
+    if existing is None:
+        return {}
+    if existing.model != model_name or existing.template != template:
+        print("[QWEN] Model/template changed since the last build; re-encoding everything.")
+        return {}
+    if want_float32 and existing.vectors.dtype != np.float32:
+        print("[QWEN] Existing vectors are not float32; re-encoding everything.")
+        return {}
+
+    reusable: Dict[str, int] = {}
+    for idx, word in enumerate(existing.words):
+        expected_hash = text_hashes.get(word)
+        if expected_hash is None:
+            continue
+        if existing.text_hashes is not None and existing.text_hashes[idx] != expected_hash:
+            continue
+        reusable.setdefault(word, idx)
+    return reusable
+
+
+def _save_vectors_atomic(output_path: Path, **arrays: np.ndarray) -> None:
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_name = tempfile.mkstemp(prefix=f".{output_path.name}.", suffix=".tmp", dir=output_path.parent)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            np.savez_compressed(f, **arrays)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_name, output_path)
+    except BaseException:
+        if os.path.exists(tmp_name):
+            os.unlink(tmp_name)
+        raise
+
+
+def _write_manifest(
+    output_path: Path,
+    wordlist_path: Path,
+    words: List[str],
+    text_hashes: List[str],
+    model_name: str,
+    template: str,
+    dtype: np.dtype,
+    dim: int,
+    stats: Dict[str, int],
+) -> Path:
+    manifest = {
+        "file": output_path.name,
+        "sha256": _file_sha256(output_path),
+        "bytes": output_path.stat().st_size,
+        "words": len(words),
+        "dim": dim,
+        "dtype": str(dtype),
+        "model": model_name,
+        "template": template,
+        "wordlist": str(wordlist_path),
+        "wordlist_sha256": _file_sha256(wordlist_path),
+        "text_hashes_sha256": hashlib.sha256("\n".join(text_hashes).encode("utf-8")).hexdigest(),
+        "built_at": datetime.utcnow().isoformat() + "Z",
+        **stats,
+    }
+    path = _manifest_path(output_path)
+    tmp_path = path.with_name(f".{path.name}.tmp")
+    tmp_path.write_text(json.dumps(manifest, ensure_ascii=False, indent=2) + "\n", encoding="utf-8")
+    os.replace(tmp_path, path)
+    return path
+
+
+_WORKER_MODEL = None
+
+
+def _configure_torch_threads(threads: int) -> None:
+    os.environ["OMP_NUM_THREADS"] = str(threads)
+    os.environ["MKL_NUM_THREADS"] = str(threads)
+    os.environ.setdefault("TOKENIZERS_PARALLELISM", "false")
+    try:
+        import torch
+
+        torch.set_num_threads(threads)
+        torch.set_num_interop_threads(1)
+    except (ImportError, RuntimeError):
+        pass
+
+
+def _load_model(model_name: str, cache_folder: Path):
+    return SentenceTransformer(
+        model_name,
+        cache_folder=str(cache_folder),
+        device="cpu",
+    )
+
+
+def _init_encoder_worker(model_name: str, cache_folder: str, threads: int) -> None:
+    global _WORKER_MODEL
+    _configure_torch_threads(threads)
+    _WORKER_MODEL = _load_model(model_name, Path(cache_folder))
+
+
+def _encode_with_model(model, texts: List[str], batch_size: int, show_progress_bar: bool) -> np.ndarray:
+    vectors = model.encode(
+        texts,
+        batch_size=batch_size,
+        normalize_embeddings=True,
+        convert_to_numpy=True,
+        show_progress_bar=show_progress_bar,
+    )
+    return np.asarray(vectors, dtype=np.float32)
+
+
+def _save_shard_atomic(path: Path, vectors: np.ndarray) -> None:
+    tmp_path = path.with_name(f".{path.name}.tmp")
+    with tmp_path.open("wb") as f:
+        np.save(f, vectors)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+def _encode_shard_in_worker(texts: List[str], batch_size: int, shard_path: str) -> Tuple[str, int, float]:
+    started_at = time.perf_counter()
+    vectors = _encode_with_model(_WORKER_MODEL, texts, batch_size, show_progress_bar=False)
+    _save_shard_atomic(Path(shard_path), vectors)
+    return shard_path, len(texts), time.perf_counter() - started_at
+
+
+def _token_lengths(texts: List[str], model_name: str, cache_folder: Path) -> List[int]:
+    """Token counts used for bucketing; falls back to character length without a tokenizer."""
+    try:
+        from transformers import AutoTokenizer
+
+        tokenizer = AutoTokenizer.from_pretrained(model_name, cache_dir=str(cache_folder))
+        encoded = tokenizer(texts, add_special_tokens=True, truncation=False)["input_ids"]
+        return [len(ids) for ids in encoded]
+    except Exception as exc:
+        print(f"[QWEN] Tokenizer unavailable for bucketing ({exc}); using character length.")
+        return [len(text) for text in texts]
+
+
+@dataclass
+class EncodeShard:
+    rows: List[int]
+    path: Path
+
+
+def _plan_shards(
+    texts: List[str],
+    text_hashes: List[str],
+    lengths: List[int],
+    model_name: str,
+    shard_size: int,
+    checkpoint_dir: Path,
+) -> List[EncodeShard]:
+    """Sort by token length and cut into shards; similar lengths share batches, so padding stays small."""
+    order = sorted(range(len(texts)), key=lambda idx: (lengths[idx], texts[idx]))
+    shards: List[EncodeShard] = []
+    for start in range(0, len(order), shard_size):
+        rows = order[start:start + shard_size]
+        digest = hashlib.sha256(model_name.encode("utf-8"))
+        for idx in rows:
+            digest.update(text_hashes[idx].encode("ascii"))
+        shards.append(EncodeShard(rows=rows, path=checkpoint_dir / f"shard_{digest.hexdigest()[:24]}.npy"))
+    return shards
+
+
+def _load_checkpoint(shard: EncodeShard) -> Optional[np.ndarray]:
+    if not shard.path.is_file():
+        return None
+    try:
+        vectors = np.load(shard.path, allow_pickle=False)
+    except Exception as exc:
+        print(f"[QWEN] Ignoring unreadable checkpoint {shard.path.name}: {exc}")
+        return None
+    if vectors.ndim != 2 or vectors.shape[0] != len(shard.rows):
+        return None
+    return vectors.astype(np.float32, copy=False)
+
+
+def _encode_texts(
+    texts: List[str],
+    text_hashes: List[str],
+    model_name: str,
+    cache_folder: Path,
+    batch_size: int,
+    workers: int,
+    threads_per_worker: int,
+    shard_size: int,
+    checkpoint_dir: Path,
+) -> Tuple[np.ndarray, List[Path]]:
+    """Encode texts in length-sorted shards, checkpointing each shard so a killed run resumes.
+
+    Returns the vectors and the shard files this run planned, so the caller can remove exactly those.
+    """
+    checkpoint_dir.mkdir(parents=True, exist_ok=True)
+    lengths = _token_lengths(texts, model_name, cache_folder)
+    shards = _plan_shards(texts, text_hashes, lengths, model_name, shard_size, checkpoint_dir)
+
+    results: Dict[Path, np.ndarray] = {}
+    pending_shards: List[EncodeShard] = []
+    for shard in shards:
+        vectors = _load_checkpoint(shard)
+        if vectors is None:
+            pending_shards.append(shard)
+        else:
+            results[shard.path] = vectors
+
+    resumed_words = sum(len(shard.rows) for shard in shards if shard.path in results)
+    pending_words = sum(len(shard.rows) for shard in pending_shards)
+    print(
+        f"[QWEN] Shards: {len(shards)} (size<={shard_size}); resumed words={resumed_words}; "
+        f"to encode={pending_words}; workers={workers}; threads/worker={threads_per_worker}"
+    )
+
+    started_at = time.perf_counter()
+    done_words = 0
+
+    def report(shard_words: int) -> None:
+        nonlocal done_words
+        done_words += shard_words
+        elapsed = max(time.perf_counter() - started_at, 1e-9)
+        print(
+            f"[QWEN] Encoded {done_words}/{pending_words} words "
+            f"({done_words / elapsed:.1f} words/s)"
+        )
+
+    if pending_shards and workers <= 1:
+        _configure_torch_threads(threads_per_worker)
+        model = _load_model(model_name, cache_folder)
+        for shard in pending_shards:
+            vectors = _encode_with_model(
+                model,
+                [texts[idx] for idx in shard.rows],
+                batch_size,
+                show_progress_bar=False,
+            )
+            _save_shard_atomic(shard.path, vectors)
+            results[shard.path] = vectors
+            report(len(shard.rows))
+    elif pending_shards:
+        context = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=context,
+            initializer=_init_encoder_worker,
+            initargs=(model_name, str(cache_folder), threads_per_worker),
+        ) as pool:
+            futures = {
+                pool.submit(
+                    _encode_shard_in_worker,
+                    [texts[idx] for idx in shard.rows],
+                    batch_size,
+                    str(shard.path),
+                ): shard
+                for shard in pending_shards
+            }
+            for future in as_completed(futures):
+                shard = futures[future]
+                future.result()
+                vectors = _load_checkpoint(shard)
+                if vectors is None:
+                    raise RuntimeError(f"Worker did not produce a valid shard: {shard.path}")
+                results[shard.path] = vectors
+                report(len(shard.rows))
+
+    if pending_words:
+        elapsed = time.perf_counter() - started_at
+        print(f"[QWEN] Encoding took {elapsed:.1f}s ({pending_words / max(elapsed, 1e-9):.1f} words/s)")
+
+    dim = next(iter(results.values())).shape[1]
+    vectors = np.empty((len(texts), dim), dtype=np.float32)
+    for shard in shards:
+        vectors[np.asarray(shard.rows, dtype=np.int64)] = results[shard.path]
+    return vectors, [shard.path for shard in shards]
+
+
 def _build_parser() -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser(
         description="Build live word vectors for Slovozviaz with Qwen3 Embedding."
@@ -59,6 +411,35 @@ def _build_parser() -> argparse.ArgumentParser:
         default=32,
         help="Encoding batch size (default: 32). Lower this if RAM is tight.",
     )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Encoder processes (default: 1). Each loads its own copy of the model.",
+    )
+    parser.add_argument(
+        "--threads-per-worker",
+        type=int,
+        default=0,
+        help="Torch/BLAS threads per encoder process (default: CPU count / workers).",
+    )
+    parser.add_argument(
+        "--shard-size",
+        type=int,
+        default=DEFAULT_SHARD_SIZE,
+        help=f"Words per length-sorted shard/checkpoint (default: {DEFAULT_SHARD_SIZE}).",
+    )
+    parser.add_argument(
+        "--checkpoint-dir",
+        type=Path,
+        default=None,
+        help="Where to keep finished shards for resuming (default: <output>.shards).",
+    )
+    parser.add_argument(
+        "--keep-checkpoints",
+        action="store_true",
+        help="Do not delete shard checkpoints after a successful save.",
+    )
     parser.add_argument(
         "--float32",
         action="store_true",
@@ -69,6 +450,14 @@ def _build_parser() -> argparse.ArgumentParser:
         default=DEFAULT_TEMPLATE,
         help="Embedding template. Must contain {word}.",
     )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help=(
+            "Reuse vectors from the existing --output file: encode only new or changed "
+            "words and drop words that left the wordlist."
+        ),
+    )
     return parser
 
 
@@ -85,49 +474,141 @@ def main() -> None:
     if not wordlist_path.is_file():
         raise FileNotFoundError(f"wordlist not found: '{wordlist_path}'")
 
-    words = _read_nonempty_lines(wordlist_path)
+    words = list(dict.fromkeys(_read_nonempty_lines(wordlist_path)))
     if not words:
         raise RuntimeError(f"wordlist is empty: '{wordlist_path}'")
 
-    print(f"[QWEN] Loading model: {args.model}")
-    print(f"[QWEN] Cache folder: {cache_folder}")
-    model = SentenceTransformer(
-        args.model,
-        cache_folder=str(cache_folder),
-        device="cpu",
+    texts = [args.template.format(word=word) for word in words]
+    text_hashes = [_text_hash(args.model, text) for text in texts]
+    hash_by_word = dict(zip(words, text_hashes))
+
+    existing = _load_existing_vectors(output_path) if args.incremental else None
+    reusable = _reusable_rows(existing, args.model, args.template, args.float32, hash_by_word)
+    pending = [idx for idx, word in enumerate(words) if word not in reusable]
+    removed_count = (
+        len({word for word in existing.words} - set(words))
+        if existing is not None
+        else 0
     )
 
-    texts = [args.template.format(word=word) for word in words]
-    print(f"[QWEN] Encoding {len(words)} words; batch_size={args.batch_size}")
-    vectors = model.encode(
-        texts,
-        batch_size=args.batch_size,
-        normalize_embeddings=True,
-        convert_to_numpy=True,
-        show_progress_bar=True,
+    if args.incremental and existing is not None:
+        print(
+            f"[QWEN] Incremental: reuse={len(reusable)} encode={len(pending)} "
+            f"remove={removed_count}"
+        )
+        up_to_date = (
+            not pending
+            and existing.words == words
+            and existing.text_hashes is not None
+            and existing.vectors.dtype == (np.float32 if args.float32 else np.float16)
+        )
+        if up_to_date:
+            manifest_path = _manifest_path(output_path)
+            if not manifest_path.is_file():
+                _write_manifest(
+                    output_path,
+                    wordlist_path,
+                    words,
+                    text_hashes,
+                    args.model,
+                    args.template,
+                    existing.vectors.dtype,
+                    existing.vectors.shape[1],
+                    {"encoded": 0, "reused": len(reusable), "removed": 0},
+                )
+            print(f"[QWEN] Up to date: {output_path}")
+            return
+
+    workers = max(1, args.workers)
+    threads_per_worker = args.threads_per_worker or max(1, (os.cpu_count() or 1) // workers)
+    checkpoint_dir = _normalize_path(args.checkpoint_dir) if args.checkpoint_dir else output_path.with_name(
+        f"{output_path.name}.shards"
     )
-    vectors = np.asarray(vectors, dtype=np.float32)
-    norms = np.linalg.norm(vectors, axis=1).astype(np.float32)
-    norms = np.where(norms == 0.0, 1e-12, norms)
+
+    encoded_vectors: Optional[np.ndarray] = None
+    shard_paths: List[Path] = []
+    if pending:
+        print(f"[QWEN] Loading model: {args.model}")
+        print(f"[QWEN] Cache folder: {cache_folder}")
+        print(f"[QWEN] Encoding {len(pending)} words; batch_size={args.batch_size}")
+        encoded_vectors, shard_paths = _encode_texts(
+            [texts[idx] for idx in pending],
+            [text_hashes[idx] for idx in pending],
+            args.model,
+            cache_folder,
+            args.batch_size,
+            workers,
+            threads_per_worker,
+            max(1, args.shard_size),
+            checkpoint_dir,
+        )
 
     vectors_dtype = np.float32 if args.float32 else np.float16
-    vectors_to_save = vectors.astype(vectors_dtype)
-    words_arr = np.asarray(words, dtype=np.str_)
+    if encoded_vectors is not None:
+        dim = encoded_vectors.shape[1]
+    else:
+        dim = existing.vectors.shape[1]
+    if existing is not None and reusable and existing.vectors.shape[1] != dim:
+        raise RuntimeError(
+            f"Existing vectors have dim={existing.vectors.shape[1]}, new ones dim={dim}; "
+            "rebuild without --incremental."
+        )
 
-    output_path.parent.mkdir(parents=True, exist_ok=True)
-    np.savez_compressed(
+    vectors_to_save = np.empty((len(words), dim), dtype=vectors_dtype)
+    norms = np.empty(len(words), dtype=np.float32)
+    if reusable:
+        target_rows = np.fromiter(
+            (idx for idx, word in enumerate(words) if word in reusable),
+            dtype=np.int64,
+        )
+        source_rows = np.fromiter(
+            (reusable[words[idx]] for idx in target_rows),
+            dtype=np.int64,
+            count=len(target_rows),
+        )
+        vectors_to_save[target_rows] = existing.vectors[source_rows].astype(vectors_dtype)
+        norms[target_rows] = existing.norms[source_rows]
+    if encoded_vectors is not None:
+        pending_rows = np.asarray(pending, dtype=np.int64)
+        vectors_to_save[pending_rows] = encoded_vectors.astype(vectors_dtype)
+        norms[pending_rows] = np.linalg.norm(encoded_vectors, axis=1).astype(np.float32)
+    norms = np.where(norms == 0.0, 1e-12, norms)
+
+    words_arr = np.asarray(words, dtype=np.str_)
+    _save_vectors_atomic(
         output_path,
         words=words_arr,
         vectors=vectors_to_save,
         norms=norms,
         model=np.asarray(args.model),
         template=np.asarray(args.template),
+        text_hashes=np.asarray(text_hashes, dtype=np.str_),
+    )
+    manifest_path = _write_manifest(
+        output_path,
+        wordlist_path,
+        words,
+        text_hashes,
+        args.model,
+        args.template,
+        vectors_to_save.dtype,
+        dim,
+        {"encoded": len(pending), "reused": len(reusable), "removed": removed_count},
     )
 
+    if not args.keep_checkpoints:
+        # --checkpoint-dir may point at a shared directory: remove only our shards,
+        # and the directory itself only if it is the default one and is now empty.
+        for shard_path in shard_paths:
+            shard_path.unlink(missing_ok=True)
+        if not args.checkpoint_dir and checkpoint_dir.is_dir() and not any(checkpoint_dir.iterdir()):
+            checkpoint_dir.rmdir()
+
     saved_bytes = output_path.stat().st_size
     raw_bytes = vectors_to_save.nbytes + norms.nbytes + words_arr.nbytes
 
     print(f"[QWEN] Saved: {output_path}")
+    print(f"[QWEN] Manifest: {manifest_path}")
     print(
         f"[QWEN] Words: {len(words_arr)}; dim={vectors_to_save.shape[1]}; "
         f"dtype={vectors_to_save.dtype}"
@@ -1,9 +1,11 @@
 import json
 from pathlib import Path
-from typing import Dict, List
+from typing import List
 
 import numpy as np
 
+from compare_vectors import load_vector_file, normalize_rows, rank_matrix
+
 
 TEST_WORDS_PATH = Path("data/qwen_test_words_20.txt")
 QWEN_VECTORS_PATH = Path("data/word_vectors_qwen3_test20_fp16.npz")
@@ -16,43 +18,30 @@ def read_words(path: Path) -> List[str]:
     return [line.strip() for line in path.read_text(encoding="utf-8").splitlines() if line.strip()]
 
 
-def load_vectors(path: Path, required_words: List[str]) -> Dict[str, np.ndarray]:
-    required_set = set(required_words)
-    with np.load(path, allow_pickle=False) as payload:
-        words = [str(word) for word in payload["words"].tolist()]
-        vectors = payload["vectors"].astype(np.float32, copy=False)
-
-    loaded = {
-        word: vectors[idx]
-        for idx, word in enumerate(words)
-        if word in required_set
-    }
-    missing = [word for word in required_words if word not in loaded]
+def load_vectors(path: Path, required_words: List[str]) -> np.ndarray:
+    """Return unit-length vectors for `required_words`, one row per word in the same order."""
+    words, vectors = load_vector_file(path)
+    index = {word: idx for idx, word in enumerate(words)}
+    missing = [word for word in required_words if word not in index]
     if missing:
         raise RuntimeError(f"{path} is missing words: {', '.join(missing)}")
-    return loaded
-
-
-def cosine(a: np.ndarray, b: np.ndarray) -> float:
-    denom = float(np.linalg.norm(a) * np.linalg.norm(b))
-    if denom == 0.0:
-        return 0.0
-    return float(np.dot(a, b) / denom)
+    return normalize_rows(vectors[[index[word] for word in required_words]])
 
 
-def rank_words(target: str, words: List[str], vectors: Dict[str, np.ndarray]) -> List[dict]:
-    target_vector = vectors[target]
-    ranking = [
-        {
-            "word": word,
-            "similarity": cosine(target_vector, vectors[word]),
-        }
-        for word in words
+def rank_all(words: List[str], matrix: np.ndarray) -> List[List[dict]]:
+    similarities = matrix @ matrix.T
+    order, _ = rank_matrix(similarities)
+    return [
+        [
+            {
+                "word": words[idx],
+                "similarity": float(similarities[row, idx]),
+                "rank": rank,
+            }
+            for rank, idx in enumerate(order[row], start=1)
+        ]
+        for row in range(len(words))
     ]
-    ranking.sort(key=lambda item: item["similarity"], reverse=True)
-    for rank, item in enumerate(ranking, start=1):
-        item["rank"] = rank
-    return ranking
 
 
 def compact_top(ranking: List[dict], limit: int = 8) -> str:
@@ -67,10 +56,11 @@ def main() -> None:
     qwen_vectors = load_vectors(QWEN_VECTORS_PATH, words)
     fasttext_vectors = load_vectors(FASTTEXT_VECTORS_PATH, words)
 
+    qwen_rankings = rank_all(words, qwen_vectors)
+    fasttext_rankings = rank_all(words, fasttext_vectors)
+
     comparison = []
-    for target in words:
-        qwen_ranking = rank_words(target, words, qwen_vectors)
-        fasttext_ranking = rank_words(target, words, fasttext_vectors)
+    for target, qwen_ranking, fasttext_ranking in zip(words, qwen_rankings, fasttext_rankings):
         comparison.append(
             {
                 "target": target,
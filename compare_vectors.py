@@ -0,0 +1,313 @@
+#!/usr/bin/env python3
+"""Compare two live-vector files over the full wordlist.
+
+For every target word (by default every word from data/daily_words.txt) both
+models rank the whole shared vocabulary with one matrix product per chunk of
+targets. The tool then reports, per target and in aggregate:
+
+  * Spearman rank correlation over the full ranking;
+  * Kendall tau over the head of model A's ranking (--kendall-k words);
+  * top-K overlap for each --top-k value;
+  * drift: mean/median absolute rank shift of model A's top --drift-k words.
+
+Results are streamed to JSON and Markdown while targets are processed.
+
+Example:
+  python compare_vectors.py \
+      --a data/word_vectors_ubercorpus_wordlist_fp16.npz \
+      --b data/word_vectors_qwen3_0_6b_wordlist_fp16.npz
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+
+DEFAULT_WORDLIST_PATH = Path("data/wordlist.txt")
+DEFAULT_TARGETS_PATH = Path("data/daily_words.txt")
+DEFAULT_OUTPUT_JSON_PATH = Path("data/vector_comparison.json")
+DEFAULT_OUTPUT_MD_PATH = Path("data/vector_comparison.md")
+DEFAULT_TOP_K = (10, 100, 1000)
+DEFAULT_KENDALL_K = 200
+DEFAULT_DRIFT_K = 1000
+DEFAULT_CHUNK_SIZE = 64
+DEFAULT_PREVIEW = 8
+
+
+def read_words(path: Path) -> List[str]:
+    return [line.strip() for line in path.read_text(encoding="utf-8").splitlines() if line.strip()]
+
+
+def normalize_rows(matrix: np.ndarray) -> np.ndarray:
+    matrix = np.asarray(matrix, dtype=np.float32)
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms = np.where(norms == 0.0, 1e-12, norms)
+    return matrix / norms
+
+
+def load_vector_file(path: Path) -> Tuple[List[str], np.ndarray]:
+    with np.load(path, allow_pickle=False) as payload:
+        if "words" not in payload or "vectors" not in payload:
+            raise ValueError(f"{path} must contain 'words' and 'vectors' arrays")
+        words = [str(word) for word in payload["words"].tolist()]
+        vectors = payload["vectors"]
+
+    if vectors.ndim != 2 or vectors.shape[0] != len(words):
+        raise ValueError(f"{path}: 'vectors' must be 2-D with one row per word")
+    return words, vectors
+
+
+def align_vocabularies(
+    words_a: Sequence[str],
+    vectors_a: np.ndarray,
+    words_b: Sequence[str],
+    vectors_b: np.ndarray,
+    vocabulary: Optional[Sequence[str]] = None,
+) -> Tuple[List[str], np.ndarray, np.ndarray]:
+    """Restrict both models to the same words (in the same row order)."""
+    index_a = {word: idx for idx, word in enumerate(words_a)}
+    index_b = {word: idx for idx, word in enumerate(words_b)}
+    candidates = vocabulary if vocabulary is not None else words_a
+
+    shared: List[str] = []
+    seen: set[str] = set()
+    for word in candidates:
+        if word in seen or word not in index_a or word not in index_b:
+            continue
+        seen.add(word)
+        shared.append(word)
+
+    rows_a = np.fromiter((index_a[word] for word in shared), dtype=np.int64, count=len(shared))
+    rows_b = np.fromiter((index_b[word] for word in shared), dtype=np.int64, count=len(shared))
+    return shared, normalize_rows(vectors_a[rows_a]), normalize_rows(vectors_b[rows_b])
+
+
+def rank_matrix(similarities: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Return (order, ranks) for each row; rank 1 is the most similar word."""
+    order = np.argsort(-similarities, axis=1, kind="stable")
+    ranks = np.empty_like(order)
+    positions = np.broadcast_to(np.arange(1, order.shape[1] + 1), order.shape)
+    np.put_along_axis(ranks, order, positions, axis=1)
+    return order, ranks
+
+
+def spearman_from_ranks(ranks_a: np.ndarray, ranks_b: np.ndarray) -> np.ndarray:
+    n = ranks_a.shape[1]
+    if n < 2:
+        return np.ones(ranks_a.shape[0])
+    diff = (ranks_a - ranks_b).astype(np.float64)
+    return 1.0 - 6.0 * np.einsum("ij,ij->i", diff, diff) / (n * (n * n - 1.0))
+
+
+def kendall_head(order_a: np.ndarray, ranks_b: np.ndarray, head_size: int) -> np.ndarray:
+    """Kendall tau between model A's top-`head_size` order and model B's ranks for the same words."""
+    head_size = min(head_size, order_a.shape[1])
+    if head_size < 2:
+        return np.ones(order_a.shape[0])
+
+    head_ranks_b = np.take_along_axis(ranks_b, order_a[:, :head_size], axis=1)
+    # Model A ranks the head 1..head_size, so pair (i, j) with i < j is
+    # concordant exactly when model B also puts word j after word i.
+    signs = np.sign(head_ranks_b[:, None, :] - head_ranks_b[:, :, None]).astype(np.int8)
+    upper = np.triu(np.ones((head_size, head_size), dtype=bool), k=1)
+    total = signs[:, upper].sum(axis=1, dtype=np.int64)
+    return total / (head_size * (head_size - 1) / 2.0)
+
+
+def topk_overlap(order_a: np.ndarray, ranks_b: np.ndarray, k: int) -> np.ndarray:
+    k = min(k, order_a.shape[1])
+    head_ranks_b = np.take_along_axis(ranks_b, order_a[:, :k], axis=1)
+    return (head_ranks_b <= k).sum(axis=1) / float(k)
+
+
+def rank_drift(order_a: np.ndarray, ranks_b: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+    k = min(k, order_a.shape[1])
+    head_ranks_b = np.take_along_axis(ranks_b, order_a[:, :k], axis=1)
+    shifts = np.abs(head_ranks_b - np.arange(1, k + 1)[None, :])
+    return shifts.mean(axis=1), np.median(shifts, axis=1)
+
+
+def iter_comparisons(
+    words: List[str],
+    matrix_a: np.ndarray,
+    matrix_b: np.ndarray,
+    target_rows: np.ndarray,
+    top_k: Sequence[int],
+    kendall_k: int,
+    drift_k: int,
+    chunk_size: int,
+    preview: int,
+) -> Iterator[Dict[str, Any]]:
+    for start in range(0, len(target_rows), chunk_size):
+        rows = target_rows[start:start + chunk_size]
+        order_a, ranks_a = rank_matrix(matrix_a[rows] @ matrix_a.T)
+        order_b, ranks_b = rank_matrix(matrix_b[rows] @ matrix_b.T)
+
+        spearman = spearman_from_ranks(ranks_a, ranks_b)
+        kendall = kendall_head(order_a, ranks_b, kendall_k)
+        overlaps = {k: topk_overlap(order_a, ranks_b, k) for k in top_k}
+        drift_mean, drift_median = rank_drift(order_a, ranks_b, drift_k)
+
+        for offset, row in enumerate(rows):
+            yield {
+                "target": words[row],
+                "spearman": round(float(spearman[offset]), 6),
+                f"kendall_top_{kendall_k}": round(float(kendall[offset]), 6),
+                **{f"overlap_top_{k}": round(float(overlaps[k][offset]), 6) for k in top_k},
+                f"drift_top_{drift_k}_mean": round(float(drift_mean[offset]), 3),
+                f"drift_top_{drift_k}_median": float(drift_median[offset]),
+                "a_top": [words[idx] for idx in order_a[offset, :preview]],
+                "b_top": [words[idx] for idx in order_b[offset, :preview]],
+            }
+
+
+def _build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Compare two live-vector files over the full wordlist.")
+    parser.add_argument("--a", type=Path, required=True, help="First .npz vector file (the reference).")
+    parser.add_argument("--b", type=Path, required=True, help="Second .npz vector file.")
+    parser.add_argument(
+        "--wordlist",
+        default=str(DEFAULT_WORDLIST_PATH),
+        help=f"Vocabulary to rank over (default: {DEFAULT_WORDLIST_PATH}). Use '' for all shared words.",
+    )
+    parser.add_argument(
+        "--targets",
+        type=Path,
+        default=DEFAULT_TARGETS_PATH,
+        help=f"Target words to evaluate (default: {DEFAULT_TARGETS_PATH}).",
+    )
+    parser.add_argument(
+        "--top-k",
+        type=int,
+        nargs="+",
+        default=list(DEFAULT_TOP_K),
+        help=f"Top-K overlap sizes (default: {' '.join(map(str, DEFAULT_TOP_K))}).",
+    )
+    parser.add_argument("--kendall-k", type=int, default=DEFAULT_KENDALL_K, help=f"Head size for Kendall tau (default: {DEFAULT_KENDALL_K}).")
+    parser.add_argument("--drift-k", type=int, default=DEFAULT_DRIFT_K, help=f"Head size for rank drift (default: {DEFAULT_DRIFT_K}).")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE, help=f"Targets per matrix product (default: {DEFAULT_CHUNK_SIZE}).")
+    parser.add_argument("--preview", type=int, default=DEFAULT_PREVIEW, help=f"Top words to show per model (default: {DEFAULT_PREVIEW}).")
+    parser.add_argument("--output-json", type=Path, default=DEFAULT_OUTPUT_JSON_PATH, help=f"(default: {DEFAULT_OUTPUT_JSON_PATH})")
+    parser.add_argument("--output-md", type=Path, default=DEFAULT_OUTPUT_MD_PATH, help=f"(default: {DEFAULT_OUTPUT_MD_PATH})")
+    return parser
+
+
+def _summarize(values: Dict[str, List[float]]) -> Dict[str, Dict[str, float]]:
+    summary: Dict[str, Dict[str, float]] = {}
+    for key, series in values.items():
+        if not series:
+            continue
+        arr = np.asarray(series, dtype=np.float64)
+        summary[key] = {
+            "mean": round(float(arr.mean()), 6),
+            "median": round(float(np.median(arr)), 6),
+            "min": round(float(arr.min()), 6),
+            "max": round(float(arr.max()), 6),
+        }
+    return summary
+
+
+def main() -> None:
+    args = _build_parser().parse_args()
+    started_at = time.perf_counter()
+
+    words_a, vectors_a = load_vector_file(args.a)
+    words_b, vectors_b = load_vector_file(args.b)
+    vocabulary = read_words(Path(args.wordlist)) if args.wordlist else None
+    words, matrix_a, matrix_b = align_vocabularies(words_a, vectors_a, words_b, vectors_b, vocabulary)
+    if len(words) < 2:
+        raise SystemExit("The two vector files share fewer than two words.")
+
+    word_to_row = {word: idx for idx, word in enumerate(words)}
+    requested_targets = read_words(args.targets)
+    missing_targets = [word for word in requested_targets if word not in word_to_row]
+    target_rows = np.asarray(
+        list(dict.fromkeys(word_to_row[word] for word in requested_targets if word in word_to_row)),
+        dtype=np.int64,
+    )
+    top_k = sorted({max(1, k) for k in args.top_k})
+
+    print(f"[COMPARE] A: {args.a} ({len(words_a)} words, dim={vectors_a.shape[1]})")
+    print(f"[COMPARE] B: {args.b} ({len(words_b)} words, dim={vectors_b.shape[1]})")
+    print(f"[COMPARE] Shared vocabulary: {len(words)}; targets: {len(target_rows)}; missing: {len(missing_targets)}")
+
+    meta = {
+        "a": str(args.a),
+        "b": str(args.b),
+        "vocabulary_size": len(words),
+        "targets": int(len(target_rows)),
+        "missing_targets": missing_targets,
+        "top_k": top_k,
+        "kendall_k": args.kendall_k,
+        "drift_k": args.drift_k,
+    }
+    metric_keys = [
+        "spearman",
+        f"kendall_top_{args.kendall_k}",
+        *(f"overlap_top_{k}" for k in top_k),
+        f"drift_top_{args.drift_k}_mean",
+    ]
+    collected: Dict[str, List[float]] = {key: [] for key in metric_keys}
+
+    args.output_json.parent.mkdir(parents=True, exist_ok=True)
+    args.output_md.parent.mkdir(parents=True, exist_ok=True)
+    with args.output_json.open("w", encoding="utf-8") as json_file, args.output_md.open("w", encoding="utf-8") as md_file:
+        json_file.write('{"meta": ' + json.dumps(meta, ensure_ascii=False) + ',\n"targets": [\n')
+        md_file.write(f"# Vector comparison: `{args.a.name}` vs `{args.b.name}`\n\n")
+        md_file.write(f"Shared vocabulary: {len(words)} words; targets: {len(target_rows)}.\n\n")
+        md_file.write(
+            "| Target | Spearman | Kendall@{0} | {1} | Drift@{2} | A top | B top |\n".format(
+                args.kendall_k,
+                " | ".join(f"Overlap@{k}" for k in top_k),
+                args.drift_k,
+            )
+        )
+        md_file.write("|---|---|---|" + "---|" * len(top_k) + "---|---|---|\n")
+
+        for position, item in enumerate(
+            iter_comparisons(
+                words,
+                matrix_a,
+                matrix_b,
+                target_rows,
+                top_k,
+                args.kendall_k,
+                args.drift_k,
+                max(1, args.chunk_size),
+                max(0, args.preview),
+            )
+        ):
+            json_file.write(("," if position else "") + json.dumps(item, ensure_ascii=False) + "\n")
+            for key in metric_keys:
+                collected[key].append(item[key])
+            md_file.write(
+                f"| {item['target']} | {item['spearman']:.3f} | {item[f'kendall_top_{args.kendall_k}']:.3f} | "
+                + " | ".join(f"{item[f'overlap_top_{k}']:.3f}" for k in top_k)
+                + f" | {item[f'drift_top_{args.drift_k}_mean']:.1f} | "
+                f"{', '.join(item['a_top'])} | {', '.join(item['b_top'])} |\n"
+            )
+
+        summary = _summarize(collected)
+        elapsed_seconds = round(time.perf_counter() - started_at, 3)
+        json_file.write('],\n"summary": ' + json.dumps(summary, ensure_ascii=False))
+        json_file.write(',\n"elapsed_seconds": ' + json.dumps(elapsed_seconds) + "}\n")
+
+        md_file.write("\n## Summary\n\n| Metric | Mean | Median | Min | Max |\n|---|---|---|---|---|\n")
+        for key, stats in summary.items():
+            md_file.write(f"| {key} | {stats['mean']:.4f} | {stats['median']:.4f} | {stats['min']:.4f} | {stats['max']:.4f} |\n")
+
+    for key, stats in summary.items():
+        print(f"[COMPARE] {key}: mean={stats['mean']:.4f} median={stats['median']:.4f}")
+    print(f"[COMPARE] JSON: {args.output_json}")
+    print(f"[COMPARE] Markdown: {args.output_md}")
+    print(f"[COMPARE] Done in {elapsed_seconds:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
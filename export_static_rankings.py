@@ -0,0 +1,140 @@
+# export_static_rankings.py
+"""Експорт архівних рейтингів у готові файли, які nginx віддає через X-Accel-Redirect.
+
+Кожна гра дає два тіла (для /api/ranked і для /archive/<date>) байт-у-байт як
+у Flask. Шлях файлу — sha256 вмісту, тож повторний експорт пропускає вже
+записані файли, а змінена гра отримує новий шлях. Поруч лежать .json.gz і,
+якщо встановлено пакет brotli, .json.br для gzip_static/brotli_static.
+manifest.json (дата -> шляхи) підміняється атомарно останнім.
+
+Приклад:
+    python export_static_rankings.py --prune
+"""
+import argparse
+import gzip
+import os
+from typing import Dict, Set
+
+from app import (
+    app,
+    db,
+    ArchivedGame,
+    RANKING_STATIC_EXPORT_DIR,
+    _load_static_ranking_manifest,
+    _parse_ranking_json,
+    _static_ranking_bodies,
+    _static_ranking_relative_path,
+    _today_in_kyiv,
+    _write_file_atomically,
+    _write_static_ranking_manifest,
+)
+
+try:
+    import brotli  # type: ignore
+except ImportError:
+    brotli = None
+
+
+def write_variants(export_dir: str, relative_path: str, body: bytes, gzip_level: int, brotli_quality: int) -> int:
+    """Записує .json, .json.gz і .json.br, яких ще немає; повертає кількість нових файлів."""
+    written = 0
+    base_path = os.path.join(export_dir, relative_path)
+    variants = [
+        (base_path, lambda: body),
+        (base_path + ".gz", lambda: gzip.compress(body, compresslevel=gzip_level, mtime=0)),
+    ]
+    if brotli is not None and brotli_quality >= 0:
+        variants.append((base_path + ".br", lambda: brotli.compress(body, quality=brotli_quality)))
+
+    for path, build in variants:
+        if os.path.isfile(path):
+            continue
+        _write_file_atomically(path, build())
+        written += 1
+    return written
+
+
+def prune_unreferenced(export_dir: str, referenced: Set[str]) -> int:
+    removed = 0
+    for kind in ("ranked", "archive"):
+        kind_dir = os.path.join(export_dir, kind)
+        if not os.path.isdir(kind_dir):
+            continue
+        for name in os.listdir(kind_dir):
+            base_name = name
+            for suffix in (".gz", ".br", ".tmp"):
+                if base_name.endswith(suffix):
+                    base_name = base_name[: -len(suffix)]
+            if f"{kind}/{base_name}" in referenced:
+                continue
+            os.remove(os.path.join(kind_dir, name))
+            removed += 1
+    return removed
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description="Експорт ArchivedGame у статичні файли для nginx.")
+    ap.add_argument("--dir", default=RANKING_STATIC_EXPORT_DIR, help=f"Каталог експорту (default: {RANKING_STATIC_EXPORT_DIR})")
+    ap.add_argument("--include-upcoming", action="store_true", help="Експортувати також сьогоднішню й майбутні ігри")
+    ap.add_argument("--gzip-level", type=int, default=9, help="Рівень gzip (default: 9)")
+    ap.add_argument("--brotli-quality", type=int, default=9, help="Якість brotli, -1 вимикає (default: 9)")
+    ap.add_argument("--prune", action="store_true", help="Видалити файли, на які не посилається новий маніфест")
+    args = ap.parse_args()
+
+    export_dir = os.path.abspath(args.dir)
+    if brotli is None and args.brotli_quality >= 0:
+        print("[STATIC] Пакет brotli не встановлено — пишемо лише .json і .json.gz.")
+
+    today = _today_in_kyiv()
+    games: Dict[str, Dict[str, str]] = {}
+    exported, skipped, written = 0, 0, 0
+
+    with app.app_context():
+        previous_games = _load_static_ranking_manifest(export_dir)
+        game_dates = [
+            game_date
+            for (game_date,) in db.session.query(ArchivedGame.game_date)
+            .order_by(ArchivedGame.game_date.asc())
+            .all()
+        ]
+
+        for game_date in game_dates:
+            if game_date >= today and not args.include_upcoming:
+                skipped += 1
+                continue
+
+            # По одній грі за раз і без ORM-об'єктів: рейтинг важить кілька МБ і не має осідати в сесії.
+            ranking_json = (
+                db.session.query(ArchivedGame.ranking_json)
+                .filter(ArchivedGame.game_date == game_date)
+                .scalar()
+            )
+            try:
+                ranking = _parse_ranking_json(ranking_json or "")
+            except Exception as e:
+                print(f"[SKIP] {game_date.isoformat()}: {e}")
+                skipped += 1
+                continue
+
+            entry: Dict[str, str] = {}
+            for kind, body in _static_ranking_bodies(game_date, ranking).items():
+                relative_path = _static_ranking_relative_path(kind, body)
+                written += write_variants(export_dir, relative_path, body, args.gzip_level, args.brotli_quality)
+                entry[kind] = relative_path
+            games[game_date.isoformat()] = entry
+            exported += 1
+
+    _write_static_ranking_manifest(export_dir, games)
+    changed = sum(1 for key, entry in games.items() if previous_games.get(key) != entry)
+    print(
+        f"[STATIC] Ігор у маніфесті: {exported} (змінено {changed}), пропущено: {skipped}, "
+        f"нових файлів: {written}, каталог: {export_dir}"
+    )
+
+    if args.prune:
+        referenced = {path for entry in games.values() for path in entry.values()}
+        print(f"[STATIC] Видалено файлів без посилань: {prune_unreferenced(export_dir, referenced)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+# fast_json.py
+"""JSON для відповідей Flask і скриптів імпорту: orjson, якщо встановлено, інакше stdlib json.
+
+Рейтинг — це десятки тисяч записів із float, і саме на них stdlib json
+найповільніший. FastJSONProvider кодує через orjson: UTF-8 без \\u-екранування,
+ключі відсортовано, як у DefaultJSONProvider, без пробілів. Дати, dataclass і
+решту нестандартних типів, як і раніше, обробляє DefaultJSONProvider.default.
+Якщо orjson відмовляє (наприклад, ціле довше за 64 біти), відповідь кодується
+через stdlib.
+"""
+
+from __future__ import annotations
+
+import json
+from typing import Any, Dict, List, Union
+
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson  # type: ignore
+except ImportError:
+    orjson = None
+
+if orjson is not None:
+    _ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+    _ORJSON_RESPONSE_OPTIONS = (
+        _ORJSON_OPTIONS
+        | orjson.OPT_SORT_KEYS
+        | orjson.OPT_PASSTHROUGH_DATETIME
+        | orjson.OPT_PASSTHROUGH_DATACLASS
+    )
+
+
+def loads(data: Union[str, bytes, bytearray]) -> Any:
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def dumps(obj: Any) -> str:
+    """Компактний JSON із порядком ключів як у об'єкті — для ranking_json у БД."""
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj, option=_ORJSON_OPTIONS).decode("utf-8")
+        except TypeError:
+            pass
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":"))
+
+
+def round_similarities(ranking: List[Dict[str, Any]], precision: int) -> List[Dict[str, Any]]:
+    """Округлює similarity на місці до precision знаків; precision <= 0 лишає як є."""
+    if precision <= 0:
+        return ranking
+    for entry in ranking:
+        similarity = entry.get("similarity") if isinstance(entry, dict) else None
+        if isinstance(similarity, float):
+            entry["similarity"] = round(similarity, precision)
+    return ranking
+
+
+class FastJSONProvider(DefaultJSONProvider):
+    """DefaultJSONProvider з orjson; use_orjson = False повертає чистий stdlib."""
+
+    ensure_ascii = False
+    use_orjson = orjson is not None
+
+    @property
+    def name(self) -> str:
+        return "orjson" if self.use_orjson else "json"
+
+    def dumps_bytes(self, obj: Any) -> bytes:
+        if self.use_orjson:
+            try:
+                return orjson.dumps(obj, default=self.default, option=_ORJSON_RESPONSE_OPTIONS)
+            except TypeError:
+                pass
+        return super().dumps(obj).encode("utf-8")
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        if self.use_orjson and not kwargs:
+            return self.dumps_bytes(obj).decode("utf-8")
+        return super().dumps(obj, **kwargs)
+
+    def loads(self, s: Union[str, bytes], **kwargs: Any) -> Any:
+        if self.use_orjson and not kwargs:
+            return orjson.loads(s)
+        return super().loads(s, **kwargs)
+
+    def response(self, *args: Any, **kwargs: Any):
+        # У debug DefaultJSONProvider форматує з відступами — лишаємо це йому.
+        if not self.use_orjson or self.compact is False or (self.compact is None and self._app.debug):
+            return super().response(*args, **kwargs)
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(self.dumps_bytes(obj), mimetype=self.mimetype)
@@ -1,11 +1,11 @@
 # migrate_json_to_db.py
 import os
 import glob
-import json
 import argparse
 from datetime import date
 from typing import Tuple
 
+import fast_json
 from app import app, db, ArchivedGame, DAILY_WORDS, BASE_DATE
 
 def choose_secret_word(day: date) -> str:
@@ -63,8 +63,8 @@ def main():
 
             # читаємо JSON
             try:
-                with open(path, "r", encoding="utf-8") as f:
-                    ranking = json.load(f)
+                with open(path, "rb") as f:
+                    ranking = fast_json.loads(f.read())
             except Exception as e:
                 print(f"[ERR ] Не вдалося прочитати/розпарсити {path}: {e}")
                 errors += 1
@@ -84,7 +84,7 @@ def main():
 
             # запис у БД
             try:
-                payload = json.dumps(ranking, ensure_ascii=False)
+                payload = fast_json.dumps(ranking)
                 if existing:
                     existing.secret_word = secret
                     existing.ranking_json = payload
@@ -0,0 +1,119 @@
+# split_databases.py
+"""Перенесення таблиць архіву й Twitch з основної бази в окремі ARCHIVE_DATABASE_URL / TWITCH_DATABASE_URL.
+
+Основна база — DATABASE_URL (або instance/games.db). Цільові таблиці створює
+app.py при імпорті; рядки копіюються пачками зі збереженням id. Непорожня
+цільова таблиця пропускається, якщо не передано --replace.
+
+Приклад (SQLite):
+    export ARCHIVE_DATABASE_URL=sqlite:////opt/slovozviaz/instance/archive.db
+    export TWITCH_DATABASE_URL=sqlite:////opt/slovozviaz/instance/twitch.db
+    python split_databases.py
+    python split_databases.py --drop-source   # після перевірки: прибрати старі копії з основної бази
+"""
+import argparse
+from typing import Dict, List
+
+from sqlalchemy import func, inspect, select
+
+from app import (
+    app,
+    db,
+    ArchivedGame,
+    TwitchChatEvent,
+    TwitchChatActiveTarget,
+    TwitchConnection,
+    ARCHIVE_BIND_KEY,
+    ARCHIVE_DATABASE_READONLY,
+    TWITCH_BIND_KEY,
+)
+
+GROUPS: Dict[str, List[type]] = {
+    "archive": [ArchivedGame],
+    "twitch": [TwitchChatEvent, TwitchChatActiveTarget, TwitchConnection],
+}
+BIND_KEYS = {"archive": ARCHIVE_BIND_KEY, "twitch": TWITCH_BIND_KEY}
+
+
+def count_rows(engine, table) -> int:
+    with engine.connect() as connection:
+        return connection.execute(select(func.count()).select_from(table)).scalar() or 0
+
+
+def copy_table(source_engine, target_engine, table, batch_size: int, replace: bool, dry_run: bool) -> int:
+    source_rows = count_rows(source_engine, table)
+    target_rows = count_rows(target_engine, table)
+    if target_rows and not replace:
+        print(f"[SKIP] {table.name}: у цільовій базі вже {target_rows} рядків (див. --replace).")
+        return 0
+    if dry_run:
+        print(f"[PLAN] {table.name}: {source_rows} рядків -> {target_engine.url.render_as_string(hide_password=True)}")
+        return 0
+
+    copied = 0
+    # Одна транзакція на таблицю: обірвана міграція не лишає половину даних.
+    with source_engine.connect() as source_connection, target_engine.begin() as target_connection:
+        if target_rows:
+            target_connection.execute(table.delete())
+        result = source_connection.execution_options(stream_results=True).execute(
+            select(table).order_by(table.c.id)
+        )
+        while True:
+            rows = result.fetchmany(batch_size)
+            if not rows:
+                break
+            target_connection.execute(table.insert(), [dict(row._mapping) for row in rows])
+            copied += len(rows)
+            print(f"  {table.name}: {copied}/{source_rows}")
+    return copied
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Перенесення archived_game і Twitch-таблиць в окремі бази.")
+    ap.add_argument("--only", choices=sorted(GROUPS), help="Перенести лише одну групу таблиць")
+    ap.add_argument("--batch-size", type=int, default=500, help="Рядків за один INSERT (default: 500)")
+    ap.add_argument("--replace", action="store_true", help="Очистити непорожні цільові таблиці й скопіювати заново")
+    ap.add_argument("--dry-run", action="store_true", help="Лише показати план")
+    ap.add_argument("--drop-source", action="store_true", help="Видалити таблиці з основної бази, якщо кількість рядків збігається")
+    args = ap.parse_args()
+
+    if ARCHIVE_DATABASE_READONLY and args.only != "twitch":
+        print("ARCHIVE_DATABASE_READONLY увімкнено — запустіть міграцію без нього.")
+        return
+
+    with app.app_context():
+        source_engine = db.engines[None]
+        source_tables = set(inspect(source_engine).get_table_names())
+
+        for group in sorted(GROUPS) if not args.only else [args.only]:
+            bind_key = BIND_KEYS[group]
+            if bind_key is None:
+                print(f"[SKIP] {group}: {group.upper()}_DATABASE_URL не задано.")
+                continue
+            target_engine = db.engines[bind_key]
+            if target_engine.url == source_engine.url:
+                print(f"[SKIP] {group}: цільова база збігається з основною.")
+                continue
+
+            for model in GROUPS[group]:
+                table = model.__table__
+                if table.name not in source_tables:
+                    print(f"[SKIP] {table.name}: в основній базі таблиці немає.")
+                    continue
+
+                copied = copy_table(source_engine, target_engine, table, max(1, args.batch_size), args.replace, args.dry_run)
+                if args.dry_run:
+                    continue
+                print(f"[OK] {table.name}: скопійовано {copied} рядків.")
+
+                if args.drop_source:
+                    source_rows, target_rows = count_rows(source_engine, table), count_rows(target_engine, table)
+                    if source_rows != target_rows:
+                        print(f"[KEEP] {table.name}: {source_rows} рядків в основній базі проти {target_rows} у цільовій.")
+                        continue
+                    table.drop(source_engine)
+                    print(f"[DROP] {table.name}: видалено з основної бази.")
+
+
+if __name__ == "__main__":
+    main()
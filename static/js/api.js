@@ -1,6 +1,16 @@
 // static/js/api.js
+
+// Server-side archive version: a dev save changes it, so cached archive URLs go stale at once.
+const archiveCacheVersion = document.querySelector(".container")?.dataset.archiveCacheVersion || "";
+
+export function withArchiveCacheVersion(url) {
+    if (!archiveCacheVersion) return url;
+    const separator = url.includes("?") ? "&" : "?";
+    return `${url}${separator}v=${encodeURIComponent(archiveCacheVersion)}`;
+}
+
 export async function fetchRankedWords(date = null) {
-    const url = date ? `/ranked?date=${encodeURIComponent(date)}` : "/ranked";
+    const url = withArchiveCacheVersion(date ? `/ranked?date=${encodeURIComponent(date)}` : "/ranked");
     const response = await fetch(url);
     const data = await response.json();
     return data;
@@ -8,14 +18,15 @@ export async function fetchRankedWords(date = null) {
 
 export async function fetchRankedWordsByWord(word) {
     const url = `/api/ranked-by-word?word=${encodeURIComponent(word)}`;
-    const response = await fetch(url, { cache: "no-store" });
+    // Revalidates with the ETag, so an unchanged ranking comes back as a 304.
+    const response = await fetch(url, { cache: "no-cache" });
     const data = await response.json();
     return { ok: response.ok, status: response.status, data };
 }
 
 export async function fetchRankedWordsByGameId(gameId) {
     const url = `/api/ranked-by-game?game=${encodeURIComponent(gameId)}`;
-    const response = await fetch(url, { cache: "no-store" });
+    const response = await fetch(url);
     const data = await response.json();
     return { ok: response.ok, status: response.status, data };
 }
@@ -6,8 +6,9 @@ import {
     fetchTwitchConnectionStatus,
     disconnectTwitchConnection,
     registerTwitchChatTarget,
-    fetchTwitchChatEvents
-} from "./api.js?v=20260427-1";
+    fetchTwitchChatEvents,
+    withArchiveCacheVersion
+} from "./api.js?v=20261019-1";
 import { renderGuesses, createGuessItem } from "./ui.js?v=20260427-1";
 
 const weekdayFmt = new Intl.DateTimeFormat('uk-UA', { weekday: 'short' });
@@ -611,7 +612,7 @@ async function fetchArchiveDates(forceRefresh = false) {
         let lastError = null;
         for (let attempt = 0; attempt < 2; attempt++) {
             try {
-                const response = await fetch("/archive", { cache: "no-store" });
+                const response = await fetch(withArchiveCacheVersion("/archive"));
                 if (!response.ok) throw new Error(`HTTP error! status: ${response.status}`);
                 const dates = await response.json();
                 if (!Array.isArray(dates)) throw new Error("Archive list format incorrect");
@@ -2864,7 +2865,7 @@ document.addEventListener("DOMContentLoaded", async () => {
             let responseError = null;
 
             for (let attempt = 0; attempt < 2; attempt++) {
-                const response = await fetch(`/archive/${game_date}`, { cache: "no-store" });
+                const response = await fetch(withArchiveCacheVersion(`/archive/${game_date}`));
                 if (response.ok) {
                     archiveData = await response.json();
                     break;
@@ -15,30 +15,71 @@ Optional:
   TWITCH_CHAT_ACCEPT_BARE_WORDS=false
   TWITCH_CHAT_ACCEPT_ALL_MESSAGES=false
   TWITCH_BRIDGE_RECONNECT_DELAY_SECONDS=5
+  TWITCH_BRIDGE_PUBLISH_QUEUE_SIZE=2000
+  TWITCH_BRIDGE_PUBLISH_BATCH_SIZE=20
+  TWITCH_BRIDGE_PUBLISH_BATCH_WAIT_MS=50
+  TWITCH_BRIDGE_PUBLISH_RETRY_COUNT=3
+  TWITCH_BRIDGE_PUBLISH_RETRY_DELAY_SECONDS=1
+  TWITCH_BRIDGE_STATS_INTERVAL_SECONDS=60
+  TWITCH_EDGE_* (see twitch_chat_filters.py)
 """
 
 from __future__ import annotations
 
 import json
 import os
+import queue
 import re
 import socket
 import ssl
+import threading
 import time
 import urllib.error
 import urllib.request
 from dotenv import load_dotenv
-from typing import Dict, Optional
+from typing import Any, Dict, List, Optional, Tuple
 from urllib.parse import parse_qs, urlparse
 
+from twitch_chat_filters import GuessEdgeFilter
+
 load_dotenv()
 
 
 IRC_HOST = "irc.chat.twitch.tv"
 IRC_PORT = 6697
-PRIVMSG_RE = re.compile(
-    r"^(?:@(?P<tags>[^ ]+) )?:(?P<prefix>[^ ]+) PRIVMSG #(?P<channel>[^ ]+) :(?P<message>.*)$"
-)
+IRC_LINE_END = b"\r\n"
+PRIVMSG_MARKER = b" PRIVMSG #"
+RETRYABLE_HTTP_STATUSES = {429, 500, 502, 503, 504}
+
+DEFAULT_PUBLISH_QUEUE_SIZE = max(100, int(os.getenv("TWITCH_BRIDGE_PUBLISH_QUEUE_SIZE", "2000")))
+DEFAULT_PUBLISH_BATCH_SIZE = max(1, int(os.getenv("TWITCH_BRIDGE_PUBLISH_BATCH_SIZE", "20")))
+DEFAULT_PUBLISH_BATCH_WAIT_MS = max(0, int(os.getenv("TWITCH_BRIDGE_PUBLISH_BATCH_WAIT_MS", "50")))
+DEFAULT_PUBLISH_RETRY_COUNT = max(1, int(os.getenv("TWITCH_BRIDGE_PUBLISH_RETRY_COUNT", "3")))
+DEFAULT_PUBLISH_RETRY_DELAY_SECONDS = max(1, int(os.getenv("TWITCH_BRIDGE_PUBLISH_RETRY_DELAY_SECONDS", "1")))
+DEFAULT_STATS_INTERVAL_SECONDS = max(10, int(os.getenv("TWITCH_BRIDGE_STATS_INTERVAL_SECONDS", "60")))
+
+
+class PublishStats:
+    """Thread-safe counters shared by the IRC reader and the publisher thread."""
+
+    FIELDS = ("enqueued", "published", "duplicates", "skipped", "retried", "failed", "dropped")
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._counts = {field: 0 for field in self.FIELDS}
+
+    def add(self, field: str, amount: int = 1) -> None:
+        with self._lock:
+            self._counts[field] += amount
+
+    def snapshot(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self._counts)
+
+    def format(self, queue_size: int) -> str:
+        counts = self.snapshot()
+        parts = " ".join(f"{field}={counts[field]}" for field in self.FIELDS)
+        return f"{parts} queued={queue_size}"
 
 
 def env_flag(name: str, default: bool = False) -> bool:
@@ -78,17 +119,105 @@ def derive_game_scope_from_url(game_url: str) -> str:
     return "daily:current"
 
 
-def parse_tags(raw_tags: str) -> Dict[str, str]:
-    parsed: Dict[str, str] = {}
-    if not raw_tags:
-        return parsed
+class IrcLineBuffer:
+    """Incremental CRLF framing over raw socket bytes.
+
+    Complete lines are sliced out of one bytearray with find-from-offset and the
+    consumed prefix is dropped once per chunk, so a burst of N lines costs O(N)
+    instead of re-copying the remaining buffer for every line.
+    """
+
+    def __init__(self) -> None:
+        self._buffer = bytearray()
+        self._scan_from = 0
+
+    def feed(self, chunk: bytes) -> List[bytes]:
+        buffer = self._buffer
+        buffer += chunk
+        lines: List[bytes] = []
+        start = 0
+        search_from = self._scan_from
+        while True:
+            end = buffer.find(IRC_LINE_END, search_from)
+            if end < 0:
+                break
+            if end > start:
+                lines.append(bytes(buffer[start:end]))
+            start = end + 2
+            search_from = start
+
+        if start:
+            del buffer[:start]
+        # A partial "\r" may be waiting for its "\n" in the next chunk.
+        self._scan_from = max(0, len(buffer) - 1)
+        return lines
+
+
+def split_privmsg(line: bytes) -> Optional[Tuple[bytes, bytes, bytes]]:
+    """Returns (raw_tags, prefix, message) for a PRIVMSG line, or None for anything else."""
+    marker = line.find(PRIVMSG_MARKER)
+    if marker < 0:
+        return None
+
+    head = line[:marker]
+    raw_tags = b""
+    if head.startswith(b"@"):
+        tags_end = head.find(b" ")
+        if tags_end < 0:
+            return None
+        raw_tags = head[1:tags_end]
+        head = head[tags_end + 1:]
+
+    # Tag values never contain spaces, so a space here means the marker was
+    # inside another command's trailing text (e.g. USERNOTICE), not a PRIVMSG.
+    if not head.startswith(b":") or b" " in head:
+        return None
+
+    message_start = line.find(b" :", marker + len(PRIVMSG_MARKER))
+    if message_start < 0:
+        return None
+    return raw_tags, head[1:], line[message_start + 2:]
 
-    for item in raw_tags.split(";"):
-        if "=" not in item:
-            continue
-        key, value = item.split("=", 1)
-        parsed[key] = value
-    return parsed
+
+def extract_tag(raw_tags: bytes, key: bytes) -> str:
+    needle = key + b"="
+    if raw_tags.startswith(needle):
+        start = len(needle)
+    else:
+        position = raw_tags.find(b";" + needle)
+        if position < 0:
+            return ""
+        start = position + 1 + len(needle)
+
+    end = raw_tags.find(b";", start)
+    value = raw_tags[start:] if end < 0 else raw_tags[start:end]
+    return value.decode("utf-8", errors="ignore")
+
+
+def ascii_command_prefix(command_prefix: str) -> Optional[bytes]:
+    normalized_prefix = command_prefix.strip().lower()
+    if not normalized_prefix or not normalized_prefix.isascii():
+        return None
+    return normalized_prefix.encode("ascii")
+
+
+def message_may_contain_guess(
+    message: bytes,
+    prefix_bytes: Optional[bytes],
+    accept_bare_words: bool,
+    accept_all_messages: bool,
+) -> bool:
+    """Cheap bytes-level check that never rejects a message extract_guess_word would accept."""
+    if accept_all_messages or prefix_bytes is None:
+        return True
+
+    text = message.strip()
+    if not text or text[0] >= 0x80:
+        # Starts with non-ASCII (e.g. Unicode whitespace or a bare Cyrillic word): decide after decoding.
+        return True
+    if text[:len(prefix_bytes)].lower() == prefix_bytes:
+        return True
+    return accept_bare_words and b" " not in text
 
 
 def extract_guess_word(
@@ -138,16 +267,15 @@ def send_irc_line(sock: ssl.SSLSocket, line: str) -> None:
     sock.sendall(f"{line}\r\n".encode("utf-8"))
 
 
-def publish_guess(
-    target_url: str,
-    secret: str,
+def build_publish_payload(
     channel: str,
     game_scope: str,
     user_login: str,
     user_name: str,
     message: str,
     word: str,
-) -> None:
+    message_id: str,
+) -> Dict[str, Any]:
     payload_dict = {
         "channel": channel,
         "user_login": user_login,
@@ -157,12 +285,16 @@ def publish_guess(
     }
     if game_scope:
         payload_dict["game_scope"] = game_scope
+    if message_id:
+        # Lets the website drop duplicates when a batch is retried.
+        payload_dict["message_id"] = message_id
+    return payload_dict
 
-    payload = json.dumps(payload_dict).encode("utf-8")
 
+def post_json(target_url: str, secret: str, payload: Dict[str, Any]) -> Dict[str, Any]:
     request = urllib.request.Request(
         target_url,
-        data=payload,
+        data=json.dumps(payload).encode("utf-8"),
         method="POST",
         headers={
             "Content-Type": "application/json",
@@ -174,15 +306,227 @@ def publish_guess(
         body = response.read().decode("utf-8")
         if response.status not in {200, 202}:
             raise RuntimeError(f"Unexpected response {response.status}: {body}")
+        return json.loads(body or "{}")
 
-        data = json.loads(body or "{}")
-        if not data.get("accepted", False):
-            reason = data.get("reason", "unknown")
-            print(f"[bridge] skipped word '{word}' ({reason})")
-            return
 
-        resolved_scope = data.get("game_scope") or game_scope or "active-page-scope"
-        print(f"[bridge] published '{word}' from @{user_login} to {resolved_scope}")
+def report_publish_result(payload: Dict[str, Any], data: Dict[str, Any], stats: PublishStats) -> None:
+    word = payload.get("word")
+    if not data.get("accepted", False):
+        stats.add("skipped")
+        reason = data.get("reason", "unknown")
+        print(f"[bridge] skipped word '{word}' ({reason})")
+        return
+
+    if data.get("duplicate"):
+        stats.add("duplicates")
+        return
+
+    stats.add("published")
+    resolved_scope = data.get("game_scope") or payload.get("game_scope") or "active-page-scope"
+    print(f"[bridge] published '{word}' from @{payload.get('user_login')} to {resolved_scope}")
+
+
+def publish_batch(
+    target_url: str,
+    secret: str,
+    batch: List[Dict[str, Any]],
+    stats: PublishStats,
+) -> List[Dict[str, Any]]:
+    """Posts a batch and returns the payloads that hit a transient error and should be retried."""
+    data = post_json(target_url, secret, {"events": batch})
+    results = data.get("results")
+    if not isinstance(results, list) or len(results) != len(batch):
+        raise RuntimeError("Batch response did not contain one result per event")
+
+    retry_payloads: List[Dict[str, Any]] = []
+    for payload, result in zip(batch, results):
+        if not isinstance(result, dict):
+            stats.add("failed")
+            continue
+        status = int(result.get("status") or 200)
+        if status in RETRYABLE_HTTP_STATUSES:
+            retry_payloads.append(payload)
+        elif status >= 400:
+            stats.add("failed")
+            print(f"[bridge] publish of '{payload.get('word')}' failed with HTTP {status}: {result.get('error')}")
+        else:
+            report_publish_result(payload, result, stats)
+    return retry_payloads
+
+
+def publish_in_chunks(
+    target_url: str,
+    secret: str,
+    batch: List[Dict[str, Any]],
+    chunk_size: int,
+    stats: PublishStats,
+) -> Tuple[List[Dict[str, Any]], int]:
+    """Posts the batch in chunks of at most chunk_size, halving it while the server answers HTTP 413.
+
+    Returns the payloads to retry and the chunk size the server accepted. Other errors on the
+    first chunk propagate, so the caller can tell a website without batch support.
+    """
+    retry_payloads: List[Dict[str, Any]] = []
+    start = 0
+    while start < len(batch):
+        chunk = batch[start:start + chunk_size]
+        try:
+            retry_payloads.extend(publish_batch(target_url, secret, chunk, stats))
+        except urllib.error.HTTPError as exc:
+            if exc.code == 413 and len(chunk) > 1:
+                chunk_size = max(1, len(chunk) // 2)
+                print(f"[bridge] batch of {len(chunk)} rejected as too large (HTTP 413); retrying in batches of {chunk_size}")
+                continue
+            if exc.code == 413:
+                stats.add("failed")
+                print(f"[bridge] publish of '{chunk[0].get('word')}' failed with HTTP 413: request too large")
+                start += 1
+                continue
+            if start == 0:
+                raise
+            return retry_payloads + batch[start:], chunk_size
+        except Exception:
+            if start == 0:
+                raise
+            return retry_payloads + batch[start:], chunk_size
+        start += len(chunk)
+    return retry_payloads, chunk_size
+
+
+def publish_single(
+    target_url: str,
+    secret: str,
+    batch: List[Dict[str, Any]],
+    stats: PublishStats,
+) -> List[Dict[str, Any]]:
+    retry_payloads: List[Dict[str, Any]] = []
+    for index, payload in enumerate(batch):
+        try:
+            report_publish_result(payload, post_json(target_url, secret, payload), stats)
+        except urllib.error.HTTPError as exc:
+            if exc.code in RETRYABLE_HTTP_STATUSES:
+                retry_payloads.append(payload)
+                continue
+            body = exc.read().decode("utf-8", errors="ignore")
+            stats.add("failed")
+            print(f"[bridge] publish failed with HTTP {exc.code}: {body}")
+        except urllib.error.URLError:
+            # The website is unreachable; retry this payload and everything after it.
+            retry_payloads.extend(batch[index:])
+            break
+    return retry_payloads
+
+
+def drain_batch(publish_queue: "queue.Queue[dict]", batch_size: int, batch_wait_seconds: float) -> List[Dict[str, Any]]:
+    batch = [publish_queue.get()]
+    deadline = time.monotonic() + batch_wait_seconds
+    while len(batch) < batch_size:
+        remaining = deadline - time.monotonic()
+        try:
+            if remaining > 0:
+                batch.append(publish_queue.get(timeout=remaining))
+            else:
+                batch.append(publish_queue.get_nowait())
+        except queue.Empty:
+            break
+    return batch
+
+
+def publisher_loop(
+    publish_queue: "queue.Queue[dict]",
+    target_url: str,
+    secret: str,
+    stats: PublishStats,
+    batch_size: int,
+    batch_wait_seconds: float,
+    retry_count: int,
+    retry_delay_seconds: int,
+) -> None:
+    use_batches = batch_size > 1
+
+    while True:
+        batch = drain_batch(publish_queue, batch_size if use_batches else 1, batch_wait_seconds)
+        try:
+            pending = batch
+            for attempt in range(1, retry_count + 1):
+                try:
+                    if use_batches:
+                        pending, batch_size = publish_in_chunks(target_url, secret, pending, batch_size, stats)
+                    else:
+                        pending = publish_single(target_url, secret, pending, stats)
+                except urllib.error.HTTPError as exc:
+                    body = exc.read().decode("utf-8", errors="ignore")
+                    if use_batches and exc.code in {400, 404, 405}:
+                        # Older website without batch support: fall back to one request per guess.
+                        print(f"[bridge] batch publish rejected with HTTP {exc.code}; switching to single-event mode")
+                        use_batches = False
+                        pending = publish_single(target_url, secret, pending, stats)
+                    elif exc.code not in RETRYABLE_HTTP_STATUSES:
+                        stats.add("failed", len(pending))
+                        print(f"[bridge] publish failed with HTTP {exc.code}: {body}")
+                        pending = []
+                except Exception as exc:
+                    if attempt >= retry_count:
+                        stats.add("failed", len(pending))
+                        print(f"[bridge] publish failed: {exc}")
+                        pending = []
+                        break
+                    print(f"[bridge] publish retry {attempt}/{retry_count} after error: {exc}")
+
+                if not pending:
+                    break
+                if attempt < retry_count:
+                    stats.add("retried", len(pending))
+                    time.sleep(retry_delay_seconds * attempt)
+
+            if pending:
+                stats.add("failed", len(pending))
+                print(f"[bridge] gave up on {len(pending)} guess(es) after {retry_count} attempts")
+        except Exception as exc:
+            stats.add("failed", len(batch))
+            print(f"[bridge] unexpected publish error: {exc}")
+        finally:
+            for _ in batch:
+                publish_queue.task_done()
+
+
+def stats_loop(
+    publish_queue: "queue.Queue[dict]",
+    stats: PublishStats,
+    edge_filter: Optional[GuessEdgeFilter],
+    interval_seconds: int,
+) -> None:
+    last_line = ""
+    while True:
+        time.sleep(interval_seconds)
+        line = format_stats(publish_queue, stats, edge_filter)
+        if line != last_line:
+            print(f"[bridge] stats: {line}")
+            last_line = line
+
+
+def format_stats(
+    publish_queue: "queue.Queue[dict]",
+    stats: PublishStats,
+    edge_filter: Optional[GuessEdgeFilter],
+) -> str:
+    line = stats.format(publish_queue.qsize())
+    if edge_filter is not None:
+        line += f" | edge {edge_filter.format_stats()}"
+    return line
+
+
+def enqueue_guess(
+    publish_queue: "queue.Queue[dict]",
+    stats: PublishStats,
+    payload: Dict[str, Any],
+) -> None:
+    try:
+        publish_queue.put_nowait(payload)
+        stats.add("enqueued")
+    except queue.Full:
+        stats.add("dropped")
+        print(f"[bridge] publish queue full; dropped {payload.get('word')!r} from @{payload.get('user_login')}")
 
 
 def run_bridge() -> None:
@@ -222,6 +566,34 @@ def run_bridge() -> None:
     print(f"[bridge] target: {target_url}")
     print(f"[bridge] game scope: {game_scope or 'resolved by active Twitch page'}")
 
+    stats = PublishStats()
+    edge_filter = GuessEdgeFilter.from_env(target_url, secret)
+    if edge_filter is not None:
+        edge_filter.start()
+    publish_queue: "queue.Queue[dict]" = queue.Queue(maxsize=DEFAULT_PUBLISH_QUEUE_SIZE)
+    threading.Thread(
+        target=publisher_loop,
+        args=(
+            publish_queue,
+            target_url,
+            secret,
+            stats,
+            DEFAULT_PUBLISH_BATCH_SIZE,
+            DEFAULT_PUBLISH_BATCH_WAIT_MS / 1000.0,
+            DEFAULT_PUBLISH_RETRY_COUNT,
+            DEFAULT_PUBLISH_RETRY_DELAY_SECONDS,
+        ),
+        name="twitch-bridge-publisher",
+        daemon=True,
+    ).start()
+    threading.Thread(
+        target=stats_loop,
+        args=(publish_queue, stats, edge_filter, DEFAULT_STATS_INTERVAL_SECONDS),
+        name="twitch-bridge-stats",
+        daemon=True,
+    ).start()
+
+    prefix_bytes = ascii_command_prefix(command_prefix)
     ssl_context = ssl.create_default_context()
 
     while True:
@@ -235,7 +607,7 @@ def run_bridge() -> None:
                 send_irc_line(sock, f"NICK {username}")
                 send_irc_line(sock, f"JOIN #{channel}")
 
-                buffer = ""
+                line_buffer = IrcLineBuffer()
                 authenticated = False
                 while True:
                     chunk = sock.recv(4096)
@@ -244,12 +616,55 @@ def run_bridge() -> None:
                             raise ConnectionError("Twitch IRC closed the connection before authentication completed.")
                         raise ConnectionError("Twitch IRC connection closed.")
 
-                    buffer += chunk.decode("utf-8", errors="ignore")
-                    while "\r\n" in buffer:
-                        line, buffer = buffer.split("\r\n", 1)
-                        if not line:
+                    for raw_line in line_buffer.feed(chunk):
+                        privmsg = split_privmsg(raw_line)
+                        if privmsg is not None:
+                            raw_tags, prefix, raw_message = privmsg
+                            if not message_may_contain_guess(
+                                raw_message,
+                                prefix_bytes,
+                                accept_bare_words,
+                                accept_all_messages,
+                            ):
+                                continue
+
+                            message = raw_message.decode("utf-8", errors="ignore").strip()
+                            guess_word = extract_guess_word(
+                                message,
+                                command_prefix,
+                                accept_bare_words,
+                                accept_all_messages,
+                            )
+                            if not guess_word:
+                                continue
+
+                            user_login = prefix.split(b"!", 1)[0].decode("utf-8", errors="ignore").strip().lower()
+                            if edge_filter is not None and edge_filter.check(
+                                channel,
+                                game_scope,
+                                user_login,
+                                guess_word,
+                            ):
+                                continue
+
+                            user_name = (extract_tag(raw_tags, b"display-name") or user_login or "chat").strip()
+                            enqueue_guess(
+                                publish_queue,
+                                stats,
+                                build_publish_payload(
+                                    channel=channel,
+                                    game_scope=game_scope,
+                                    user_login=user_login,
+                                    user_name=user_name,
+                                    message=message,
+                                    word=guess_word,
+                                    message_id=extract_tag(raw_tags, b"id").strip(),
+                                ),
+                            )
                             continue
 
+                        # Control lines are rare; only these get decoded to str.
+                        line = raw_line.decode("utf-8", errors="ignore")
                         if " NOTICE * :Login authentication failed" in line:
                             raise ConnectionError(
                                 "Twitch IRC login failed. Regenerate the token with the IRC scope chat:read."
@@ -261,46 +676,10 @@ def run_bridge() -> None:
 
                         if line.startswith("PING "):
                             send_irc_line(sock, line.replace("PING", "PONG", 1))
-                            continue
-
-                        match = PRIVMSG_RE.match(line)
-                        if not match:
-                            continue
-
-                        tags = parse_tags(match.group("tags") or "")
-                        user_login = match.group("prefix").split("!", 1)[0].strip().lower()
-                        user_name = (tags.get("display-name") or user_login or "chat").strip()
-                        message = match.group("message").strip()
-                        guess_word = extract_guess_word(
-                            message,
-                            command_prefix,
-                            accept_bare_words,
-                            accept_all_messages,
-                        )
-                        if not guess_word:
-                            continue
-
-                        try:
-                            publish_guess(
-                                target_url=target_url,
-                                secret=secret,
-                                channel=channel,
-                                game_scope=game_scope,
-                                user_login=user_login,
-                                user_name=user_name,
-                                message=message,
-                                word=guess_word,
-                            )
-                        except urllib.error.HTTPError as exc:
-                            body = exc.read().decode("utf-8", errors="ignore")
-                            print(f"[bridge] publish failed with HTTP {exc.code}: {body}")
-                        except urllib.error.URLError as exc:
-                            print(f"[bridge] publish failed: {exc}")
-                        except Exception as exc:
-                            print(f"[bridge] unexpected publish error: {exc}")
 
         except KeyboardInterrupt:
             print("\n[bridge] stopped by user")
+            print(f"[bridge] stats: {format_stats(publish_queue, stats, edge_filter)}")
             return
         except Exception as exc:
             print(f"[bridge] connection error: {exc}")
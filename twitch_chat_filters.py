@@ -0,0 +1,275 @@
+"""Edge filtering for Twitch chat guesses, shared by the IRC bridge and the EventSub worker.
+
+Drops guesses that the website would reject anyway before they are queued for
+publishing:
+  * words outside the game vocabulary (snapshot downloaded from
+    /api/twitch-worker/vocabulary and revalidated with an ETag),
+  * the same chatter repeating the same word within a TTL,
+  * bursts above a token-bucket rate per channel and per chatter.
+
+Every check fails open: without a vocabulary snapshot every word passes, so a
+website outage never silences chat.
+
+Optional env vars:
+  TWITCH_EDGE_FILTER_ENABLED=true
+  TWITCH_EDGE_VOCABULARY_URL=https://your-site/api/twitch-worker/vocabulary
+  TWITCH_EDGE_VOCABULARY_REFRESH_SECONDS=900
+  TWITCH_EDGE_REPEAT_TTL_SECONDS=120
+  TWITCH_EDGE_CHANNEL_RATE_PER_SECOND=10
+  TWITCH_EDGE_CHANNEL_BURST=30
+  TWITCH_EDGE_CHATTER_RATE_PER_SECOND=0.5
+  TWITCH_EDGE_CHATTER_BURST=3
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+import urllib.error
+import urllib.request
+from typing import Dict, FrozenSet, Optional, Tuple
+
+
+PUBLISH_PATH_SUFFIX = "/api/twitch-chat/publish"
+VOCABULARY_PATH_SUFFIX = "/api/twitch-worker/vocabulary"
+MAX_TRACKED_KEYS = 50000
+
+
+def _env_float(name: str, default: float, minimum: float) -> float:
+    try:
+        return max(minimum, float(os.getenv(name, str(default))))
+    except ValueError:
+        return default
+
+
+def derive_vocabulary_url(target_url: str) -> str:
+    explicit_url = (os.getenv("TWITCH_EDGE_VOCABULARY_URL") or "").strip()
+    if explicit_url:
+        return explicit_url
+
+    normalized_target = target_url.strip().rstrip("/")
+    if normalized_target.endswith(PUBLISH_PATH_SUFFIX):
+        return normalized_target[: -len(PUBLISH_PATH_SUFFIX)] + VOCABULARY_PATH_SUFFIX
+    return ""
+
+
+class VocabularySnapshot:
+    """Set of accepted guess words, refreshed in the background with If-None-Match."""
+
+    def __init__(self, url: str, secret: str, refresh_seconds: float) -> None:
+        self.url = url
+        self.secret = secret
+        self.refresh_seconds = refresh_seconds
+        self._words: Optional[FrozenSet[str]] = None
+        self._etag = ""
+        self._mode = ""
+
+    @property
+    def loaded(self) -> bool:
+        return self._words is not None
+
+    def contains(self, word: str) -> bool:
+        words = self._words
+        return words is None or word in words
+
+    def refresh(self) -> None:
+        headers = {
+            "Accept": "application/json",
+            "X-Twitch-Bridge-Secret": self.secret,
+        }
+        if self._etag:
+            headers["If-None-Match"] = f'"{self._etag}"'
+
+        request = urllib.request.Request(self.url, headers=headers)
+        try:
+            with urllib.request.urlopen(request, timeout=30) as response:
+                payload = json.loads(response.read().decode("utf-8") or "{}")
+        except urllib.error.HTTPError as exc:
+            if exc.code == 304:
+                return
+            raise
+
+        words = payload.get("words")
+        if not isinstance(words, list) or not words:
+            raise RuntimeError("Vocabulary response did not contain words")
+
+        # The snapshot swaps in as one reference; readers never see a half-built set.
+        self._words = frozenset(str(word) for word in words)
+        self._etag = str(payload.get("version") or "")
+        self._mode = str(payload.get("mode") or "")
+        print(f"[edge] vocabulary v{self._etag}: {len(self._words)} words ({self._mode})")
+
+    def refresh_loop(self, stop_event: threading.Event) -> None:
+        while not stop_event.is_set():
+            try:
+                self.refresh()
+                delay = self.refresh_seconds
+            except Exception as exc:
+                print(f"[edge] vocabulary refresh failed ({self.url}): {exc}")
+                delay = min(self.refresh_seconds, 60)
+            stop_event.wait(delay)
+
+
+class TokenBucket:
+    __slots__ = ("tokens", "updated_at")
+
+    def __init__(self, capacity: float, now: float) -> None:
+        self.tokens = capacity
+        self.updated_at = now
+
+    def take(self, rate: float, capacity: float, now: float) -> bool:
+        self.tokens = min(capacity, self.tokens + (now - self.updated_at) * rate)
+        self.updated_at = now
+        if self.tokens < 1.0:
+            return False
+        self.tokens -= 1.0
+        return True
+
+
+class GuessEdgeFilter:
+    """Decides whether a parsed guess is worth publishing; safe to share between threads."""
+
+    REASONS = ("unknown_word", "repeat", "channel_rate", "chatter_rate")
+
+    def __init__(
+        self,
+        vocabulary: Optional[VocabularySnapshot],
+        repeat_ttl_seconds: float,
+        channel_rate: float,
+        channel_burst: float,
+        chatter_rate: float,
+        chatter_burst: float,
+    ) -> None:
+        self.vocabulary = vocabulary
+        self.repeat_ttl_seconds = repeat_ttl_seconds
+        self.channel_rate = channel_rate
+        self.channel_burst = channel_burst
+        self.chatter_rate = chatter_rate
+        self.chatter_burst = chatter_burst
+        self._lock = threading.Lock()
+        self._recent_guesses: Dict[Tuple[str, str, str, str], float] = {}
+        self._channel_buckets: Dict[str, TokenBucket] = {}
+        self._chatter_buckets: Dict[Tuple[str, str], TokenBucket] = {}
+        self._next_cleanup_at = 0.0
+        self._stop_event = threading.Event()
+        self.passed = 0
+        self.dropped = {reason: 0 for reason in self.REASONS}
+
+    @classmethod
+    def from_env(cls, target_url: str, secret: str) -> Optional["GuessEdgeFilter"]:
+        raw_enabled = (os.getenv("TWITCH_EDGE_FILTER_ENABLED") or "true").strip().lower()
+        if raw_enabled not in {"1", "true", "yes", "on"}:
+            return None
+
+        vocabulary = None
+        vocabulary_url = derive_vocabulary_url(target_url)
+        if vocabulary_url:
+            vocabulary = VocabularySnapshot(
+                vocabulary_url,
+                secret,
+                _env_float("TWITCH_EDGE_VOCABULARY_REFRESH_SECONDS", 900, minimum=60),
+            )
+
+        return cls(
+            vocabulary=vocabulary,
+            repeat_ttl_seconds=_env_float("TWITCH_EDGE_REPEAT_TTL_SECONDS", 120, minimum=0),
+            channel_rate=_env_float("TWITCH_EDGE_CHANNEL_RATE_PER_SECOND", 10, minimum=0.1),
+            channel_burst=_env_float("TWITCH_EDGE_CHANNEL_BURST", 30, minimum=1),
+            chatter_rate=_env_float("TWITCH_EDGE_CHATTER_RATE_PER_SECOND", 0.5, minimum=0.01),
+            chatter_burst=_env_float("TWITCH_EDGE_CHATTER_BURST", 3, minimum=1),
+        )
+
+    def start(self) -> None:
+        if self.vocabulary is None:
+            print("[edge] vocabulary URL unknown; dictionary filter disabled")
+            return
+        threading.Thread(
+            target=self.vocabulary.refresh_loop,
+            args=(self._stop_event,),
+            name="twitch-edge-vocabulary",
+            daemon=True,
+        ).start()
+
+    def stop(self) -> None:
+        self._stop_event.set()
+
+    def check(
+        self,
+        channel: str,
+        game_scope: str,
+        user_login: str,
+        word: str,
+        remember: bool = True,
+    ) -> Optional[str]:
+        """Returns the drop reason, or None when the guess should be published.
+
+        With remember=False a passing guess is not recorded as a repeat; call
+        remember_guess() once it has actually been published.
+        """
+        if self.vocabulary is not None and not self.vocabulary.contains(word):
+            return self._drop("unknown_word")
+
+        now = time.monotonic()
+        with self._lock:
+            if now >= self._next_cleanup_at:
+                self._cleanup(now)
+
+            repeat_key = (channel, game_scope, user_login, word)
+            if self.repeat_ttl_seconds > 0:
+                last_seen_at = self._recent_guesses.get(repeat_key)
+                if last_seen_at is not None and now - last_seen_at < self.repeat_ttl_seconds:
+                    return self._drop("repeat")
+
+            chatter_bucket = self._chatter_buckets.get((channel, user_login))
+            if chatter_bucket is None:
+                chatter_bucket = self._chatter_buckets[(channel, user_login)] = TokenBucket(self.chatter_burst, now)
+            if not chatter_bucket.take(self.chatter_rate, self.chatter_burst, now):
+                return self._drop("chatter_rate")
+
+            channel_bucket = self._channel_buckets.get(channel)
+            if channel_bucket is None:
+                channel_bucket = self._channel_buckets[channel] = TokenBucket(self.channel_burst, now)
+            if not channel_bucket.take(self.channel_rate, self.channel_burst, now):
+                return self._drop("channel_rate")
+
+            if remember and self.repeat_ttl_seconds > 0:
+                self._recent_guesses[repeat_key] = now
+            self.passed += 1
+        return None
+
+    def remember_guess(self, channel: str, game_scope: str, user_login: str, word: str) -> None:
+        if self.repeat_ttl_seconds <= 0:
+            return
+        with self._lock:
+            self._recent_guesses[(channel, game_scope, user_login, word)] = time.monotonic()
+
+    def format_stats(self) -> str:
+        dropped = " ".join(f"{reason}={self.dropped[reason]}" for reason in self.REASONS)
+        return f"passed={self.passed} dropped: {dropped}"
+
+    def _drop(self, reason: str) -> str:
+        self.dropped[reason] += 1
+        return reason
+
+    def _cleanup(self, now: float) -> None:
+        self._next_cleanup_at = now + 30
+
+        repeat_cutoff = now - self.repeat_ttl_seconds
+        self._recent_guesses = {
+            key: seen_at
+            for key, seen_at in self._recent_guesses.items()
+            if seen_at > repeat_cutoff
+        }
+        # An idle bucket has refilled to capacity, so dropping it changes nothing.
+        chatter_idle = self.chatter_burst / self.chatter_rate
+        self._chatter_buckets = {
+            key: bucket
+            for key, bucket in self._chatter_buckets.items()
+            if now - bucket.updated_at < chatter_idle
+        }
+
+        if len(self._recent_guesses) > MAX_TRACKED_KEYS:
+            newest = sorted(self._recent_guesses.items(), key=lambda item: item[1])[-MAX_TRACKED_KEYS:]
+            self._recent_guesses = dict(newest)
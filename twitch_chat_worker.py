@@ -19,11 +19,14 @@ Optional:
   TWITCH_CHAT_ACCEPT_BARE_WORDS=false
   TWITCH_CHAT_ACCEPT_ALL_MESSAGES=false
   TWITCH_WORKER_REFRESH_SECONDS=30
+  TWITCH_WORKER_FALLBACK_REFRESH_SECONDS=300
+  TWITCH_WORKER_CHANGES_WAIT_SECONDS=25
   TWITCH_WORKER_RECONNECT_DELAY_SECONDS=5
   TWITCH_WORKER_PUBLISH_QUEUE_SIZE=2000
   TWITCH_WORKER_PUBLISH_RETRY_COUNT=3
   TWITCH_WORKER_PUBLISH_RETRY_DELAY_SECONDS=1
   TWITCH_EVENTSUB_KEEPALIVE_GRACE_SECONDS=15
+  TWITCH_EDGE_* (see twitch_chat_filters.py)
 """
 
 from __future__ import annotations
@@ -34,9 +37,10 @@ import queue
 import threading
 import time
 import urllib.error
+import urllib.parse
 import urllib.request
 from dataclasses import dataclass
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 from dotenv import load_dotenv
 from websocket import (
@@ -45,12 +49,16 @@ from websocket import (
     create_connection,
 )
 
+from twitch_chat_filters import GuessEdgeFilter
+
 load_dotenv()
 
 EVENTSUB_WEBSOCKET_URL = os.getenv("TWITCH_EVENTSUB_WEBSOCKET_URL", "wss://eventsub.wss.twitch.tv/ws").strip()
 EVENTSUB_SUBSCRIPTIONS_URL = "https://api.twitch.tv/helix/eventsub/subscriptions"
 
 DEFAULT_REFRESH_SECONDS = max(10, int(os.getenv("TWITCH_WORKER_REFRESH_SECONDS", "30")))
+DEFAULT_FALLBACK_REFRESH_SECONDS = max(30, int(os.getenv("TWITCH_WORKER_FALLBACK_REFRESH_SECONDS", "300")))
+DEFAULT_CHANGES_WAIT_SECONDS = max(1, int(os.getenv("TWITCH_WORKER_CHANGES_WAIT_SECONDS", "25")))
 DEFAULT_RECONNECT_DELAY_SECONDS = max(1, int(os.getenv("TWITCH_WORKER_RECONNECT_DELAY_SECONDS", "5")))
 DEFAULT_PUBLISH_QUEUE_SIZE = max(100, int(os.getenv("TWITCH_WORKER_PUBLISH_QUEUE_SIZE", "2000")))
 DEFAULT_PUBLISH_RETRY_COUNT = max(1, int(os.getenv("TWITCH_WORKER_PUBLISH_RETRY_COUNT", "3")))
@@ -166,17 +174,37 @@ def http_json_request(
         return json.loads(body or "{}")
 
 
-def load_active_connections_from_source(connections_url: str, secret: str) -> List[WorkerConnection]:
-    req = urllib.request.Request(
-        connections_url,
-        headers={
-            "Accept": "application/json",
-            "X-Twitch-Bridge-Secret": secret,
-        },
-    )
-    with urllib.request.urlopen(req, timeout=20) as response:
-        body = response.read().decode("utf-8")
-        payload = json.loads(body or "{}")
+# connections_url -> (ETag, connections from the last 200 response)
+CONNECTIONS_SOURCE_CACHE: Dict[str, Tuple[str, List[WorkerConnection]]] = {}
+
+
+def load_active_connections_from_source(
+    connections_url: str,
+    secret: str,
+    bypass_cache: bool = False,
+) -> Tuple[List[WorkerConnection], bool]:
+    """Returns (connections, changed); an unchanged source answers 304 and reuses the cached list."""
+    headers = {
+        "Accept": "application/json",
+        "X-Twitch-Bridge-Secret": secret,
+    }
+    if bypass_cache:
+        # The change may have happened in another web process whose memo is still warm.
+        headers["Cache-Control"] = "no-cache"
+    cached = CONNECTIONS_SOURCE_CACHE.get(connections_url)
+    if cached is not None and cached[0]:
+        headers["If-None-Match"] = cached[0]
+
+    req = urllib.request.Request(connections_url, headers=headers)
+    try:
+        with urllib.request.urlopen(req, timeout=20) as response:
+            etag = (response.headers.get("ETag") or "").strip()
+            body = response.read().decode("utf-8")
+            payload = json.loads(body or "{}")
+    except urllib.error.HTTPError as exc:
+        if exc.code == 304 and cached is not None:
+            return cached[1], False
+        raise
 
     skipped = payload.get("skipped")
     if isinstance(skipped, list):
@@ -193,7 +221,8 @@ def load_active_connections_from_source(connections_url: str, secret: str) -> Li
 
     connections = payload.get("connections")
     if not isinstance(connections, list):
-        return []
+        CONNECTIONS_SOURCE_CACHE.pop(connections_url, None)
+        return [], True
 
     parsed: List[WorkerConnection] = []
     for item in connections:
@@ -220,23 +249,36 @@ def load_active_connections_from_source(connections_url: str, secret: str) -> Li
         except Exception:
             continue
 
-    return [
+    connections = [
         item
         for item in parsed
         if item.twitch_user_id and item.twitch_login and item.access_token
     ]
+    CONNECTIONS_SOURCE_CACHE[connections_url] = (etag, connections)
+    return connections, True
 
 
-def load_active_connections(connections_urls: List[str], secret: str) -> List[WorkerConnection]:
+def load_active_connections(
+    connections_urls: List[str],
+    secret: str,
+    bypass_cache: bool = False,
+) -> Tuple[List[WorkerConnection], bool]:
     combined: List[WorkerConnection] = []
     seen_keys: set[str] = set()
+    changed = False
 
     for connections_url in connections_urls:
         try:
-            source_connections = load_active_connections_from_source(connections_url, secret)
+            source_connections, source_changed = load_active_connections_from_source(
+                connections_url,
+                secret,
+                bypass_cache,
+            )
         except Exception as exc:
             print(f"[worker] failed to load connections from {connections_url}: {exc}")
+            changed = True
             continue
+        changed = changed or source_changed
 
         for connection in source_connections:
             dedupe_key = connection.twitch_user_id or f"{connection.source_url}:{connection.connection_id}"
@@ -245,7 +287,72 @@ def load_active_connections(connections_urls: List[str], secret: str) -> List[Wo
             seen_keys.add(dedupe_key)
             combined.append(connection)
 
-    return combined
+    return combined, changed
+
+
+def derive_changes_url(connections_url: str) -> str:
+    normalized_url = connections_url.strip().rstrip("/")
+    if normalized_url.endswith("/api/twitch-worker/connections"):
+        return f"{normalized_url}/changes"
+    return ""
+
+
+class ConnectionChangesListener(threading.Thread):
+    """Long-polls the site's /connections/changes and wakes the main loop when connections change."""
+
+    def __init__(
+        self,
+        changes_url: str,
+        secret: str,
+        wake_event: threading.Event,
+        wait_seconds: int,
+        reconnect_delay_seconds: int,
+    ) -> None:
+        super().__init__(name="twitch-connection-changes", daemon=True)
+        self.changes_url = changes_url
+        self.secret = secret
+        self.wake_event = wake_event
+        self.wait_seconds = wait_seconds
+        self.reconnect_delay_seconds = reconnect_delay_seconds
+        self.healthy = False
+        self.stop_event = threading.Event()
+
+    def stop(self) -> None:
+        self.stop_event.set()
+
+    def run(self) -> None:
+        version = ""
+        while not self.stop_event.is_set():
+            query = urllib.parse.urlencode({"since": version, "timeout": self.wait_seconds})
+            request = urllib.request.Request(
+                f"{self.changes_url}?{query}",
+                headers={
+                    "Accept": "application/json",
+                    "X-Twitch-Bridge-Secret": self.secret,
+                },
+            )
+            try:
+                with urllib.request.urlopen(request, timeout=self.wait_seconds + 15) as response:
+                    payload = json.loads(response.read().decode("utf-8") or "{}")
+            except urllib.error.HTTPError as exc:
+                self.healthy = False
+                if exc.code in {404, 405}:
+                    print(f"[worker] {self.changes_url} is not supported; polling only")
+                    return
+                print(f"[worker] connection change feed failed with HTTP {exc.code}; retrying")
+                self.stop_event.wait(self.reconnect_delay_seconds)
+                continue
+            except Exception as exc:
+                self.healthy = False
+                print(f"[worker] connection change feed failed: {exc}; retrying")
+                self.stop_event.wait(self.reconnect_delay_seconds)
+                continue
+
+            new_version = str(payload.get("version") or "")
+            if version and new_version and new_version != version:
+                self.wake_event.set()
+            version = new_version
+            self.healthy = bool(new_version)
 
 
 def publish_guess(
@@ -299,6 +406,7 @@ def publisher_loop(
     publish_queue: "queue.Queue[dict]",
     retry_count: int,
     retry_delay_seconds: int,
+    edge_filter: Optional[GuessEdgeFilter] = None,
 ) -> None:
     retryable_statuses = {429, 500, 502, 503, 504}
 
@@ -306,12 +414,15 @@ def publisher_loop(
         payload = publish_queue.get()
         try:
             target_urls = payload.pop("target_urls")
+            repeat_key = payload.pop("repeat_key", None)
+            published = False
             for target_url in target_urls:
                 target_payload = dict(payload)
                 target_payload["target_url"] = target_url
                 for attempt in range(1, retry_count + 1):
                     try:
                         publish_guess(**target_payload)
+                        published = True
                         break
                     except urllib.error.HTTPError as exc:
                         body = exc.read().decode("utf-8", errors="ignore")
@@ -344,6 +455,8 @@ def publisher_loop(
                             continue
                         print(f"[worker] unexpected publish error for {target_url}: {exc}")
                         break
+            if published and repeat_key is not None and edge_filter is not None:
+                edge_filter.remember_guess(*repeat_key)
         finally:
             publish_queue.task_done()
 
@@ -417,6 +530,8 @@ def enqueue_notification(
     command_prefix: str,
     accept_bare_words: bool,
     accept_all_messages: bool,
+    edge_filter: Optional[GuessEdgeFilter] = None,
+    game_scope: str = "",
 ) -> None:
     payload = frame.get("payload") or {}
     event = payload.get("event") or {}
@@ -439,6 +554,10 @@ def enqueue_notification(
     )
     if not channel or not user_login or not guess_word:
         return
+    # Repeats are tracked per active game, so a word from the previous game is not dropped;
+    # the repeat is recorded by the publisher only after the website accepted the guess.
+    if edge_filter is not None and edge_filter.check(channel, game_scope, user_login, guess_word, remember=False):
+        return
 
     publish_payload = {
         "target_urls": target_urls,
@@ -449,6 +568,7 @@ def enqueue_notification(
         "message": message,
         "word": guess_word,
         "message_id": message_id,
+        "repeat_key": (channel, game_scope, user_login, guess_word) if edge_filter is not None else None,
     }
     try:
         publish_queue.put_nowait(publish_payload)
@@ -479,6 +599,7 @@ class EventSubConnectionWorker(threading.Thread):
         reconnect_delay_seconds: int,
         keepalive_grace_seconds: int,
         publish_queue: "queue.Queue[dict]",
+        edge_filter: Optional[GuessEdgeFilter] = None,
     ) -> None:
         super().__init__(
             name=f"twitch-eventsub-{connection.twitch_login}",
@@ -494,6 +615,7 @@ class EventSubConnectionWorker(threading.Thread):
         self.reconnect_delay_seconds = reconnect_delay_seconds
         self.keepalive_grace_seconds = keepalive_grace_seconds
         self.publish_queue = publish_queue
+        self.edge_filter = edge_filter
         self.stop_event = threading.Event()
 
     def stop(self) -> None:
@@ -560,6 +682,8 @@ class EventSubConnectionWorker(threading.Thread):
                             self.command_prefix,
                             self.accept_bare_words,
                             self.accept_all_messages,
+                            self.edge_filter,
+                            self.connection.game_scope,
                         )
                         continue
 
@@ -645,10 +769,14 @@ def run_worker() -> None:
     if missing:
         raise SystemExit(f"Missing required environment variables: {', '.join(missing)}")
 
+    # All target URLs serve the same wordlist, so the first one provides the vocabulary.
+    edge_filter = GuessEdgeFilter.from_env(target_urls[0], secret)
+    if edge_filter is not None:
+        edge_filter.start()
     publish_queue: "queue.Queue[dict]" = queue.Queue(maxsize=publish_queue_size)
     publisher = threading.Thread(
         target=publisher_loop,
-        args=(publish_queue, publish_retry_count, publish_retry_delay_seconds),
+        args=(publish_queue, publish_retry_count, publish_retry_delay_seconds, edge_filter),
         name="twitch-eventsub-publisher",
         daemon=True,
     )
@@ -656,10 +784,42 @@ def run_worker() -> None:
     active_workers: Dict[str, EventSubConnectionWorker] = {}
     active_signatures: Dict[str, str] = {}
     reported_no_connections = False
+    wake_event = threading.Event()
+    change_listeners: List[ConnectionChangesListener] = []
+    for connections_source in connections_urls:
+        changes_url = derive_changes_url(connections_source)
+        if not changes_url:
+            continue
+        listener = ConnectionChangesListener(
+            changes_url,
+            secret,
+            wake_event,
+            DEFAULT_CHANGES_WAIT_SECONDS,
+            reconnect_delay_seconds,
+        )
+        listener.start()
+        change_listeners.append(listener)
+
+    def wait_for_next_refresh() -> None:
+        # With every change feed up, polling is only a safety net.
+        feeds_healthy = bool(change_listeners) and len(change_listeners) == len(connections_urls) and all(
+            listener.healthy for listener in change_listeners
+        )
+        wake_event.wait(DEFAULT_FALLBACK_REFRESH_SECONDS if feeds_healthy else refresh_seconds)
 
     try:
         while True:
-            desired_connections = load_active_connections(connections_urls, secret)
+            woken_by_change = wake_event.is_set()
+            wake_event.clear()
+            desired_connections, connections_changed = load_active_connections(
+                connections_urls,
+                secret,
+                bypass_cache=woken_by_change,
+            )
+            if not connections_changed and all(worker.is_alive() for worker in active_workers.values()):
+                wait_for_next_refresh()
+                continue
+
             desired_by_id = {
                 (connection.twitch_user_id or f"{connection.source_url}:{connection.connection_id}"): connection
                 for connection in desired_connections
@@ -686,6 +846,8 @@ def run_worker() -> None:
                 current_signature = active_signatures.get(connection_id)
 
                 if current_worker and current_signature == desired_signature and current_worker.is_alive():
+                    # The session stays up; only the active game scope may have changed.
+                    current_worker.connection = connection
                     continue
 
                 if current_worker:
@@ -704,15 +866,20 @@ def run_worker() -> None:
                     reconnect_delay_seconds=reconnect_delay_seconds,
                     keepalive_grace_seconds=keepalive_grace_seconds,
                     publish_queue=publish_queue,
+                    edge_filter=edge_filter,
                 )
                 active_workers[connection_id] = worker
                 active_signatures[connection_id] = desired_signature
                 worker.start()
 
-            time.sleep(refresh_seconds)
+            wait_for_next_refresh()
     except KeyboardInterrupt:
         print("\n[worker] stopped by user")
+        if edge_filter is not None:
+            print(f"[worker] edge filter: {edge_filter.format_stats()}")
     finally:
+        for listener in change_listeners:
+            listener.stop()
         for worker in active_workers.values():
             worker.stop()
         for worker in active_workers.values():
@@ -0,0 +1,194 @@
+# verify_hybrid_rankings.py
+"""Перевірка, чи хвіст архівного рейтингу можна відновлювати з live-векторів (формат hybrid-v1).
+
+Для кожної гри з повним ranking_json рейтинг ділиться на голову з --head
+записів і хвіст. Хвіст будується заново з поточних векторів так само, як це
+робить app.py для hybrid-v1, і порівнюється зі збереженим: порядок слів,
+ранги та similarity (допуск --max-similarity-diff). З --convert ігри, що
+пройшли перевірку, переписуються в hybrid-v1; решта лишається повною.
+
+hybrid-v1 прив'язаний до версії векторів: після їх заміни app.py не віддає
+такі ігри. Тому перед заміною файлу векторів поверніть їм повний вигляд
+(--expand), а після заміни за потреби знову перевірте й конвертуйте.
+
+Приклад:
+    python verify_hybrid_rankings.py --head 3000
+    python verify_hybrid_rankings.py --head 3000 --convert
+    python verify_hybrid_rankings.py --expand
+"""
+import argparse
+from datetime import date
+from typing import Any, Dict, List, Optional
+
+from app import (
+    app,
+    db,
+    ArchivedGame,
+    ARCHIVE_DATABASE_READONLY,
+    ARCHIVE_RANKING_HEAD_ENTRIES,
+    HYBRID_RANKING_FORMAT,
+    LiveRankingBusyError,
+    _get_live_ranking_with_version,
+    _hybrid_ranking_tail,
+    _invalidate_archive_caches,
+    _parse_ranking_json,
+    _stick_reads_to_primary,
+)
+import fast_json
+
+
+def compare_tails(stored: List[Dict[str, Any]], rebuilt: List[Dict[str, Any]]) -> Dict[str, Any]:
+    rebuilt_by_word = {entry["word"]: entry for entry in rebuilt}
+    missing = 0
+    max_rank_shift = 0
+    max_similarity_diff = 0.0
+    for entry in stored:
+        other = rebuilt_by_word.get(entry.get("word"))
+        if other is None:
+            missing += 1
+            continue
+        max_rank_shift = max(max_rank_shift, abs(int(entry.get("rank", 0)) - other["rank"]))
+        max_similarity_diff = max(max_similarity_diff, abs(float(entry.get("similarity", 0.0)) - other["similarity"]))
+    return {
+        "same_order": [entry.get("word") for entry in stored] == [entry["word"] for entry in rebuilt],
+        "stored": len(stored),
+        "rebuilt": len(rebuilt),
+        "missing": missing,
+        "max_rank_shift": max_rank_shift,
+        "max_similarity_diff": max_similarity_diff,
+    }
+
+
+def verify_game(secret_word: str, ranking: List[Dict[str, Any]], head_size: int, max_similarity_diff: float) -> Optional[Dict[str, Any]]:
+    """Звіт про гру або None, якщо рейтинг не довший за голову."""
+    if len(ranking) <= head_size:
+        return None
+    head, stored_tail = ranking[:head_size], ranking[head_size:]
+    live_ranking, vectors_version = _get_live_ranking_with_version(secret_word)
+    report = compare_tails(stored_tail, _hybrid_ranking_tail(head, live_ranking))
+    report["vectors_version"] = vectors_version
+    report["ok"] = (
+        report["same_order"]
+        and report["stored"] == report["rebuilt"]
+        and report["max_similarity_diff"] <= max_similarity_diff
+    )
+    return report
+
+
+def save_ranking_json(game_date: date, ranking_json: str) -> None:
+    db.session.query(ArchivedGame).filter(ArchivedGame.game_date == game_date).update(
+        {ArchivedGame.ranking_json: ranking_json}, synchronize_session=False
+    )
+    db.session.commit()
+    _invalidate_archive_caches(game_date)
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description="Перевірка й переведення ArchivedGame у формат hybrid-v1 і назад.")
+    ap.add_argument(
+        "--head",
+        type=int,
+        default=ARCHIVE_RANKING_HEAD_ENTRIES or 3000,
+        help="Скільки перших записів зберігати точно (default: ARCHIVE_RANKING_HEAD_ENTRIES або 3000)",
+    )
+    ap.add_argument("--max-similarity-diff", type=float, default=1e-4, help="Допуск similarity у хвості (default: 1e-4)")
+    ap.add_argument("--date", help="Обробити лише одну гру (YYYY-MM-DD)")
+    mode = ap.add_mutually_exclusive_group()
+    mode.add_argument("--convert", action="store_true", help="Переписати ігри, що пройшли перевірку, у hybrid-v1")
+    mode.add_argument("--expand", action="store_true", help="Переписати hybrid-v1 ігри назад у повний рейтинг")
+    args = ap.parse_args()
+
+    if args.head <= 0:
+        print("--head має бути більшим за 0.")
+        return
+    if (args.convert or args.expand) and ARCHIVE_DATABASE_READONLY:
+        print("ARCHIVE_DATABASE_READONLY увімкнено — запустіть без нього.")
+        return
+
+    passed, failed, skipped, rewritten = 0, 0, 0, 0
+    with app.app_context():
+        _stick_reads_to_primary("archive")
+        query = db.session.query(ArchivedGame.game_date).order_by(ArchivedGame.game_date.asc())
+        if args.date:
+            query = query.filter(ArchivedGame.game_date == date.fromisoformat(args.date))
+        game_dates = [game_date for (game_date,) in query.all()]
+
+        for game_date in game_dates:
+            # По одній грі: повний рейтинг важить кілька МБ.
+            secret_word, ranking_json = (
+                db.session.query(ArchivedGame.secret_word, ArchivedGame.ranking_json)
+                .filter(ArchivedGame.game_date == game_date)
+                .one()
+            )
+            try:
+                ranking = fast_json.loads(ranking_json or "")
+            except ValueError as e:
+                print(f"[SKIP] {game_date.isoformat()}: {e}")
+                skipped += 1
+                continue
+            is_hybrid = isinstance(ranking, dict) and ranking.get("format") == HYBRID_RANKING_FORMAT
+
+            if args.expand:
+                if not is_hybrid:
+                    skipped += 1
+                    continue
+                try:
+                    full_ranking = _parse_ranking_json(ranking_json)
+                except (LiveRankingBusyError, FileNotFoundError, ValueError) as e:
+                    print(f"[FAIL] {game_date.isoformat()} '{secret_word}': не вдалося відновити рейтинг: {e}")
+                    failed += 1
+                    continue
+                save_ranking_json(game_date, fast_json.dumps(full_ranking))
+                print(f"[OK] {game_date.isoformat()} '{secret_word}': збережено повний рейтинг ({len(full_ranking)} записів).")
+                passed += 1
+                rewritten += 1
+                continue
+
+            if is_hybrid:
+                skipped += 1
+                continue
+            if not isinstance(ranking, list) or not ranking:
+                print(f"[SKIP] {game_date.isoformat()}: рейтинг не є непорожнім списком.")
+                skipped += 1
+                continue
+
+            try:
+                report = verify_game(secret_word, ranking, args.head, args.max_similarity_diff)
+            except (LiveRankingBusyError, FileNotFoundError, KeyError, ValueError) as e:
+                print(f"[FAIL] {game_date.isoformat()} '{secret_word}': не вдалося побудувати live-рейтинг: {e}")
+                failed += 1
+                continue
+            if report is None:
+                skipped += 1
+                continue
+
+            status = "OK" if report["ok"] else "FAIL"
+            print(
+                f"[{status}] {game_date.isoformat()} '{secret_word}': хвіст {report['stored']} -> "
+                f"{report['rebuilt']}, порядок {'збігається' if report['same_order'] else 'інший'}, "
+                f"відсутніх слів {report['missing']}, зсув рангу до {report['max_rank_shift']}, "
+                f"Δsimilarity до {report['max_similarity_diff']:.2e}"
+            )
+            if not report["ok"]:
+                failed += 1
+                continue
+            passed += 1
+
+            if args.convert:
+                save_ranking_json(game_date, fast_json.dumps({
+                    "format": HYBRID_RANKING_FORMAT,
+                    "secret_word": secret_word,
+                    "vectors_version": report["vectors_version"],
+                    "total": len(ranking),
+                    "head": ranking[: args.head],
+                }))
+                rewritten += 1
+
+    summary = f"[HYBRID] Успішно: {passed}, з помилками: {failed}, пропущено: {skipped}"
+    if args.convert or args.expand:
+        summary += f", переписано: {rewritten}"
+    print(summary)
+
+
+if __name__ == "__main__":
+    main()